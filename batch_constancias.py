@@ -0,0 +1,315 @@
+# batch_constancias.py
+# Constancias por lote: todos los alumnos con CREDITS_GOAL créditos (o un subconjunto).
+# Cada constancia se genera en un proceso hijo (render_job) con el motor nativo
+# de constancia_pdf.py; las que necesitan Word (plantilla PDF ausente o un dato
+# que no cabe) se repiten con el camino DOCX en un pool de UN proceso, porque
+# Word no admite varias conversiones a la vez.
+# El proceso principal junta los resultados, agrega las entradas "CONSTANCIA
+# FINAL OFICIAL" y guarda la base UNA sola vez; al final escribe un reporte CSV.
+# Cada trabajo queda en la cola persistente (job_queue.py): si la ejecución se
+# corta, la siguiente retoma lo pendiente y registra lo que ya estaba generado.
+# El nombre del PDF sale del contenido (constancia_store.py): una constancia
+# idéntica que ya existe se reutiliza sin generarla otra vez.
+# La GUI usa workers.ConstanciaBatch; sin GUI (tareas programadas):
+#   python batch_constancias.py [--carrera X] [--matricula M ...] [--reemitir] [--workers N] [--reanudar]
+# Este módulo no importa Qt.
+import argparse
+import csv
+import os
+import sys
+import time
+from datetime import datetime
+
+import constancia_store
+from config import CONSTANCIA_WORKERS
+from database import CREDITS_GOAL, student_credits
+from job_queue import MAX_ATTEMPTS, JobQueue
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_DOCX = os.path.join(ROOT, "plantilla_constancia.docx")
+OUT_DIR = os.path.join(ROOT, "Constancias_Generadas")
+
+CONSTANCIA_NAME = "CONSTANCIA FINAL OFICIAL"
+REUSED = "reutilizada"  # motor de los resultados que ya existían
+MONTHS = ("ENERO", "FEBRERO", "MARZO", "ABRIL", "MAYO", "JUNIO", "JULIO",
+          "AGOSTO", "SEPTIEMBRE", "OCTUBRE", "NOVIEMBRE", "DICIEMBRE")
+
+
+def has_constancia(s):
+    return any(w.get('name') == CONSTANCIA_NAME for w in s.get('workshops', []))
+
+
+def eligible(students, match=None, reissue=False):
+    """Alumnos con los créditos completos (y match(s)); sin reissue se omiten los que ya tienen constancia"""
+    return [s for s in students
+            if student_credits(s) >= CREDITS_GOAL
+            and (reissue or not has_constancia(s))
+            and (match is None or match(s))]
+
+
+def context_for(s, when=None):
+    """Los mismos datos que llena VerificarDatosDialog"""
+    when = when or datetime.now()
+    name = f"{s.get('nombres','')} {s.get('apellidoPaterno','')} {s.get('apellidoMaterno','')}"
+    return {
+        'NOMBRE_ESTUDIANTE': " ".join(name.split()).upper(),
+        'MATRICULA': str(s.get('matricula', '')).upper(),
+        'CARRERA': str(s.get('career', '')).upper(),
+        'DIA': str(when.day),
+        'MES': MONTHS[when.month - 1],
+        'ANIO': str(when.year),
+    }
+
+
+def make_job(ctx, pdf_template, matricula=None):
+    """Un trabajo de generación; el id (= nombre del archivo, por contenido) lo identifica en la cola.
+    matricula es la del alumno en la base (en el diálogo se puede corregir la impresa)"""
+    fname = constancia_store.file_stem(ctx, TEMPLATE_DOCX)
+    return {
+        "id": fname, "matricula": str(matricula or ctx['MATRICULA']).upper(), "ctx": ctx,
+        "docx_template": TEMPLATE_DOCX, "pdf_template": pdf_template,
+        "pdf": os.path.join(OUT_DIR, f"{fname}.pdf"), "docx": os.path.join(OUT_DIR, f"{fname}.docx"),
+    }
+
+
+def pdf_template(prepare=True):
+    """Plantilla PDF para el motor nativo, o None si solo se puede con Word.
+    Con prepare=False no se abre Word (para no congelar la GUI): la prepara el primer trabajo DOCX"""
+    import constancia_pdf
+    try:
+        return constancia_pdf.template_for(TEMPLATE_DOCX, prepare)
+    except constancia_pdf.TemplateError:
+        return None
+
+
+def plan(students, when=None, prepare=True):
+    """Trabajos para render_job y si hay plantilla PDF (motor nativo) disponible"""
+    when = when or datetime.now()
+    template = pdf_template(prepare)
+    os.makedirs(OUT_DIR, exist_ok=True)
+    return [make_job(context_for(s, when), template) for s in students], template is not None
+
+
+def prepare(queue, students, when=None, prepare_template=True, running=()):
+    """Trabajos a correr: los que quedaron sin terminar en la cola + los nuevos (sin repetir alumnos).
+    running: ids que ya se están generando en este proceso (no se retoman dos veces)"""
+    resumed = [j for j in queue.to_render() if j["id"] not in running]
+    busy = {j["matricula"] for j in queue.to_render()} | {r["matricula"] for r in queue.to_record()}
+    jobs, native = plan([s for s in students if str(s.get('matricula', '')).upper() not in busy],
+                        when, prepare_template)
+    queue.add(jobs)
+    return resumed + jobs, native
+
+
+def _result(job):
+    return {"id": job["id"], "matricula": job["matricula"], "nombre": job["ctx"]["NOMBRE_ESTUDIANTE"],
+            "carrera": job["ctx"]["CARRERA"], "pdf": job["pdf"], "motor": "", "error": ""}
+
+
+def reused(job):
+    """Resultado inmediato si esa misma constancia ya está generada (o None)"""
+    t0 = time.perf_counter()
+    if not constancia_store.is_complete(job["pdf"]): return None
+    result = _result(job)
+    result["motor"] = REUSED
+    result["ms"] = (time.perf_counter() - t0) * 1000
+    return result
+
+
+def render_job(job, engine="nativo"):
+    """Corre en un proceso hijo. engine='nativo' no abre Word: si no se puede, pide 'docx'"""
+    done = reused(job)
+    if done: return done
+    t0 = time.perf_counter()
+    result = _result(job)
+    import constancia_pdf
+    try:
+        if engine == "nativo":
+            if not job["pdf_template"]: raise constancia_pdf.TemplateError("Sin plantilla PDF")
+            constancia_pdf.render(job["pdf_template"], job["ctx"], job["pdf"])
+        elif _render_native_if_ready(job):
+            engine = "nativo"  # otro trabajo DOCX ya preparó la plantilla PDF
+        else:
+            import template_cache
+            doc = template_cache.load(job["docx_template"])
+            doc.render(job["ctx"])
+            doc.save(job["docx"])
+            constancia_pdf.convert_docx(job["docx"], job["pdf"])
+            os.remove(job["docx"])  # solo era el paso intermedio
+            # Word ya está abierto: se aprovecha para dejar lista la plantilla PDF
+            try: constancia_pdf.template_for(job["docx_template"])
+            except constancia_pdf.TemplateError: pass
+        result["motor"] = engine
+    except Exception as e:
+        needs_word = engine == "nativo" and isinstance(e, (constancia_pdf.TemplateError, ImportError))
+        result["motor"] = "docx" if needs_word else engine
+        result["error"] = "" if needs_word else (str(e) or type(e).__name__)
+        result["pendiente"] = needs_word
+    result["ms"] = (time.perf_counter() - t0) * 1000
+    return result
+
+
+def _render_native_if_ready(job):
+    """Camino DOCX: si la plantilla PDF ya existe y el dato cabe, no hace falta Word"""
+    import constancia_pdf
+    try:
+        template = constancia_pdf.template_for(job["docx_template"], prepare=False)
+        constancia_pdf.render(template, job["ctx"], job["pdf"])
+        return True
+    except (constancia_pdf.TemplateError, ImportError):
+        return False
+
+
+def record(student, result, when=None):
+    """Agrega la constancia al historial del alumno (como la generación individual)"""
+    student.setdefault('workshops', []).append({
+        "name": CONSTANCIA_NAME,
+        "category": "Trámite",
+        "value": 0,
+        "status": "Entregado",
+        "pdf_path": result["pdf"],
+        "date": (when or datetime.now()).strftime("%Y-%m-%d"),
+    })
+
+
+def commit(engine, students, results, when=None, queue=None):
+    """Registra las constancias generadas y guarda la base una sola vez.
+    Es seguro repetirlo: si el alumno ya tiene ese PDF en su historial no se agrega otra vez."""
+    by_mat = {str(s.get('matricula', '')).upper(): s for s in students}
+    recorded, done, missing = 0, [], []
+    for r in results:
+        if r["error"] or r.get("pendiente"): continue
+        s = by_mat.get(str(r["matricula"]).upper())
+        if s is None:
+            # Se borró o cambió de matrícula (p. ej. al restaurar un respaldo)
+            missing.append(r["id"]); continue
+        if not any(w.get('pdf_path') == r["pdf"] for w in s.get('workshops', [])):
+            record(s, r, when)
+            recorded += 1
+        done.append(r["id"])
+    if recorded: engine.save()
+    # Se marca después de guardar: si algo falla antes, el trabajo sigue "convertido"
+    if queue is not None and done: queue.mark_many(done, "registrado")
+    # Sin alumno no hay dónde registrarla: error sin intentos libres, así no se vuelve a
+    # generar ni queda "convertido" para siempre en la cola
+    if queue is not None:
+        for job_id in missing:
+            queue.mark(job_id, "error", error="alumno no encontrado", intentos=MAX_ATTEMPTS)
+    return recorded
+
+
+def write_report(results, seconds, when=None):
+    """CSV con una fila por alumno en Constancias_Generadas/; devuelve la ruta"""
+    when = when or datetime.now()
+    os.makedirs(OUT_DIR, exist_ok=True)
+    path = os.path.join(OUT_DIR, f"reporte_lote_{when.strftime('%Y%m%d_%H%M%S')}.csv")
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        w = csv.writer(f)
+        w.writerow(["matricula", "nombre", "carrera", "estado", "motor", "ms", "pdf", "error"])
+        for r in sorted(results, key=lambda r: (r["carrera"], r["nombre"])):
+            w.writerow([r["matricula"], r["nombre"], r["carrera"], "ERROR" if r["error"] else "OK",
+                        r["motor"], f"{r['ms']:.0f}", r["pdf"] if not r["error"] else "", r["error"]])
+        w.writerow([])
+        w.writerow(["total", len(results), "segundos", f"{seconds:.1f}"])
+    return path
+
+
+def summary(results, seconds, queue=None):
+    """Resumen de una línea por tema para la GUI / consola"""
+    ok = [r for r in results if not r["error"]]
+    native = sum(1 for r in ok if r["motor"] == "nativo")
+    same = sum(1 for r in ok if r["motor"] == REUSED)
+    lines = [
+        f"Generadas: {len(ok)} de {len(results)}",
+        f"Motor nativo: {native} | Word/DOCX: {len(ok) - native - same} | ya existían: {same}",
+        f"Tiempo total: {seconds:.1f} s" + (f" ({seconds / len(results) * 1000:.0f} ms por constancia)" if results else ""),
+    ]
+    if queue is not None:
+        import job_queue
+        lines.append(job_queue.describe(queue.metrics([r["id"] for r in results])))
+    failed = [r for r in results if r["error"]]
+    if failed:
+        lines.append(f"Con error: {len(failed)}")
+        lines += [f"  {r['matricula']}: {r['error']}" for r in failed[:10]]
+    return "\n".join(lines)
+
+
+def run(jobs, workers=None, progress=None, queue=None):
+    """Versión bloqueante (CLI): nativo en paralelo y luego DOCX de uno en uno"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    ctx = multiprocessing.get_context("spawn")
+    results, retry = [], []
+
+    def done(r):
+        if queue is not None: queue.finish(r)
+        results.append(r)
+        if progress: progress(len(results), len(jobs), r)
+
+    with ProcessPoolExecutor(max_workers=workers or min(4, os.cpu_count() or 1), mp_context=ctx) as pool:
+        if queue is not None: queue.mark_many([j["id"] for j in jobs], "renderizando")
+        futures = {pool.submit(render_job, job): job for job in jobs}
+        for f in as_completed(futures):
+            r = f.result()
+            if r.get("pendiente"): retry.append(futures[f])
+            else: done(r)
+    if retry:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            for r in pool.map(render_job, retry, ["docx"] * len(retry)):
+                done(r)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera las constancias de todos los alumnos acreditados")
+    parser.add_argument("--carrera", help="solo esta carrera")
+    parser.add_argument("--matricula", action="append", help="solo estas matrículas (se puede repetir)")
+    parser.add_argument("--reemitir", action="store_true", help="incluir alumnos que ya tienen constancia")
+    parser.add_argument("--workers", type=int, default=None, help="procesos en paralelo (config.CONSTANCIA_WORKERS)")
+    parser.add_argument("--solo-listar", action="store_true", help="mostrar a quién se le generaría, sin generar")
+    parser.add_argument("--reanudar", action="store_true", help="solo terminar lo pendiente de la cola")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # DB_PATH es relativo a la carpeta de la app
+    from database import StudentEngine
+    engine = StudentEngine()
+    mats = set(args.matricula or [])
+    carrera = (args.carrera or "").upper()
+
+    def match(s):
+        if carrera and str(s.get('career', '')).upper() != carrera: return False
+        return not mats or str(s.get('matricula')) in mats
+
+    students = eligible(engine.students, match, args.reemitir)
+    if args.solo_listar:
+        for s in students: print(f"{s.get('matricula')}  {context_for(s)['NOMBRE_ESTUDIANTE']}  {s.get('career')}")
+        print(f"{len(students)} alumnos")
+        return 0
+
+    when = datetime.now()
+    queue = JobQueue()
+    # Lo que quedó a medias de otra ejecución (cierre, Word cerrado) se retoma primero
+    recorded = commit(engine, engine.students, queue.to_record(), when, queue)
+    if recorded: print(f"Registradas {recorded} constancias que ya estaban generadas")
+    jobs, native = prepare(queue, students if not args.reanudar else [], when)
+    if not jobs:
+        print("No hay constancias por generar")
+        return 0
+    print(f"{len(jobs)} constancias | motor {'nativo (PyMuPDF)' if native else 'Word/DOCX'}"
+          f" | procesos: {args.workers or CONSTANCIA_WORKERS or 'auto'}")
+
+    def progress(done, total, r):
+        print(f"\r[{done}/{total}] {r['matricula']} {'ERROR' if r['error'] else r['motor']}".ljust(60), end="", flush=True)
+
+    t0 = time.perf_counter()
+    results = run(jobs, args.workers or CONSTANCIA_WORKERS or None, progress, queue)
+    seconds = time.perf_counter() - t0
+    print()
+    commit(engine, engine.students, queue.to_record(), when, queue)
+    print(summary(results, seconds, queue))
+    print(f"Reporte: {write_report(results, seconds, when)}")
+    return 1 if any(r["error"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
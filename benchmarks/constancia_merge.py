@@ -0,0 +1,78 @@
+"""Prueba de memoria: unir miles de constancias en un PDF no debe hacer crecer el proceso.
+
+Crea una constancia de prueba (una página con texto y una imagen) y la une
+--documentos veces con constancia_merge.merge, con nombres y carreras
+distintos. Mide la memoria del proceso al terminar la primera tanda y al final;
+falla si crece más de RSS_BUDGET_MB. Revisa también índice y marcadores.
+Uso: python benchmarks/constancia_merge.py [--documentos 3000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from expediente_memory import rss_mb  # noqa: E402
+
+# Crecimiento tolerado entre la primera tanda y el final
+RSS_BUDGET_MB = 40
+
+CAREERS = ["INGENIERÍA INDUSTRIAL", "CONTADOR PÚBLICO", "INGENIERÍA EN SISTEMAS", "LIC. ADMINISTRACIÓN"]
+NAMES = ["ÁNGEL", "BRUNO", "MARÍA", "ZOE", "JOSÉ", "ANA"]
+
+
+def sample_pdf(path):
+    import fitz
+    doc = fitz.open()
+    page = doc.new_page(width=612, height=792)
+    page.insert_text((72, 120), "CONSTANCIA DE PRUEBA", fontsize=24)
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 200, 200), 0)
+    pix.clear_with(180)
+    page.insert_image(fitz.Rect(72, 200, 272, 400), pixmap=pix)
+    doc.save(path, deflate=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documentos", type=int, default=3000)
+    args = parser.parse_args()
+
+    import fitz
+    import constancia_merge
+    from database import fold
+
+    tmp = tempfile.mkdtemp(prefix="constancia_merge_")
+    src = os.path.join(tmp, "muestra.pdf")
+    sample_pdf(src)
+    random.seed(1)
+    items = [{"nombre": f"{random.choice(NAMES)} ALUMNO {i}", "matricula": str(202100000 + i),
+              "carrera": random.choice(CAREERS), "pdf": src} for i in range(args.documentos)]
+
+    samples = []
+    result = constancia_merge.merge(items, os.path.join(tmp, "impresion.pdf"),
+                                    progress=lambda done, total: samples.append(rss_mb()))
+    print(constancia_merge.describe(result))
+
+    with fitz.open(result["ruta"]) as doc:
+        toc = doc.get_toc()
+        students = [t for t in toc if t[0] == 2]
+        careers = [t[1] for t in toc if t[0] == 1][1:]
+        ok = len(students) == args.documentos and careers == sorted(careers, key=fold) \
+            and doc.page_count == students[0][2] - 1 + args.documentos
+    print(f"Marcadores: {len(careers)} carreras, {len(students)} alumnos | {'OK' if ok else 'INCORRECTOS'}")
+
+    if samples and samples[0] is not None:
+        growth = samples[-1] - samples[0]
+        print(f"Memoria: {samples[0]:.0f} MB tras la primera tanda -> {samples[-1]:.0f} MB al final"
+              f" (+{growth:.1f} MB, presupuesto {RSS_BUDGET_MB} MB)")
+        ok = ok and growth <= RSS_BUDGET_MB
+    else:
+        print("Memoria: no se puede medir en este sistema")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark de plantilla: costo por constancia con y sin template_cache.
+
+"sin caché" = DocxTemplate(plantilla) por constancia (como estaba el código).
+"con caché" = template_cache.load(plantilla): clon del documento ya parseado.
+Mide cargar / render / guardar (a memoria, sin convertir a PDF) y revisa que
+los dos caminos produzcan el mismo XML.
+Uso: python benchmarks/constancia_template.py [--n 50] [--plantilla ruta.docx]
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CTX = {
+    "NOMBRE_ESTUDIANTE": "JUAN PÉREZ LÓPEZ", "MATRICULA": "202100001",
+    "CARRERA": "INGENIERÍA EN SISTEMAS COMPUTACIONALES",
+    "DIA": "19", "MES": "octubre", "ANIO": "2026",
+}
+
+
+def run(load, tpl, n):
+    times = {"cargar": [], "render": [], "guardar": []}
+    for i in range(n):
+        ctx = dict(CTX, MATRICULA=str(202100000 + i))
+        t0 = time.perf_counter()
+        doc = load(tpl)
+        t1 = time.perf_counter()
+        doc.render(ctx)
+        t2 = time.perf_counter()
+        doc.save(io.BytesIO())
+        t3 = time.perf_counter()
+        times["cargar"].append((t1 - t0) * 1000)
+        times["render"].append((t2 - t1) * 1000)
+        times["guardar"].append((t3 - t2) * 1000)
+    return {k: statistics.median(v) for k, v in times.items()}
+
+
+def document_xml(doc):
+    out = io.BytesIO()
+    doc.save(out)
+    with zipfile.ZipFile(out) as z:
+        return z.read("word/document.xml")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=50)
+    parser.add_argument("--plantilla", default=os.path.join(ROOT, "plantilla_constancia.docx"))
+    args = parser.parse_args()
+
+    from docxtpl import DocxTemplate
+    import template_cache
+
+    modes = {"sin caché": DocxTemplate, "con caché": template_cache.load}
+    # Calentamiento (imports, primera lectura del disco)
+    for load in modes.values(): run(load, args.plantilla, 2)
+
+    print(f"Plantilla: {os.path.basename(args.plantilla)} | constancias: {args.n} (mediana, ms)")
+    print(f"{'MODO':<10} {'CARGAR':>8} {'RENDER':>8} {'GUARDAR':>8} {'TOTAL':>8}")
+    totals = {}
+    for name, load in modes.items():
+        med = run(load, args.plantilla, args.n)
+        totals[name] = sum(med.values())
+        print(f"{name:<10} {med['cargar']:>8.2f} {med['render']:>8.2f} {med['guardar']:>8.2f} {totals[name]:>8.2f}")
+    print(f"{'mejora':<10} {totals['sin caché'] / max(totals['con caché'], 1e-6):>35.1f}x")
+
+    plain = DocxTemplate(args.plantilla); plain.render(CTX)
+    cached = template_cache.load(args.plantilla); cached.render(CTX)
+    same = document_xml(plain) == document_xml(cached)
+    print("Salida idéntica:", "sí" if same else "NO")
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Prueba visual: la constancia nativa (PyMuPDF) contra la del camino DOCX -> PDF.
+
+Genera la misma constancia por los dos caminos, rasteriza cada página en gris
+y cuenta los píxeles que difieren. Falla si pasan de --presupuesto (fracción
+de la página). Deja las dos salidas y un PNG con las diferencias en rojo.
+Necesita Word (docx2pdf) o LibreOffice para el camino DOCX y para preparar
+plantilla_constancia.pdf la primera vez.
+Uso: python benchmarks/constancia_visual_diff.py [--dpi 72] [--presupuesto 0.01] [--salida dir]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CASES = [
+    {"NOMBRE_ESTUDIANTE": "JUAN PÉREZ LÓPEZ", "MATRICULA": "202100001", "CARRERA": "ING. INDUSTRIAL",
+     "DIA": "19", "MES": "OCTUBRE", "ANIO": "2026"},
+    {"NOMBRE_ESTUDIANTE": "MARÍA FERNANDA GÓMEZ NÚÑEZ", "MATRICULA": "202300123", "CARRERA": "CONTADOR PÚBLICO",
+     "DIA": "1", "MES": "MAYO", "ANIO": "2026"},
+]
+
+# Diferencia de gris (0-255) a partir de la cual un píxel cuenta como distinto
+PIXEL_TOLERANCE = 64
+
+
+def rasterize(path, dpi):
+    import fitz
+    with fitz.open(path) as doc:
+        return [page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY) for page in doc]
+
+
+def diff_pages(a, b, out_png=None):
+    """Fracción de píxeles distintos entre dos pixmaps en gris (1.0 si cambia el tamaño)"""
+    import fitz
+    if (a.width, a.height) != (b.width, b.height): return 1.0
+    sa, sb = a.samples, b.samples
+    marks = bytearray(a.width * a.height * 3)
+    differ = 0
+    for i in range(len(sa)):
+        if abs(sa[i] - sb[i]) > PIXEL_TOLERANCE:
+            differ += 1
+            marks[i * 3] = 255
+        else:
+            v = sa[i] // 2 + 128  # fondo: la versión DOCX aclarada
+            marks[i * 3:i * 3 + 3] = bytes((v, v, v))
+    if out_png:
+        fitz.Pixmap(fitz.csRGB, a.width, a.height, bytes(marks), False).save(out_png)
+    return differ / len(sa)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plantilla", default=os.path.join(ROOT, "plantilla_constancia.docx"))
+    parser.add_argument("--dpi", type=int, default=72)
+    parser.add_argument("--presupuesto", type=float, default=0.01)
+    parser.add_argument("--salida", default=None)
+    args = parser.parse_args()
+
+    import constancia_pdf
+    import template_cache
+
+    out_dir = args.salida or tempfile.mkdtemp(prefix="constancia_diff_")
+    os.makedirs(out_dir, exist_ok=True)
+    try:
+        template = constancia_pdf.template_for(args.plantilla)
+    except constancia_pdf.TemplateError as e:
+        print(f"No se puede comparar: {e}")
+        sys.exit(2)
+
+    ok = True
+    print(f"Plantilla PDF: {template} | dpi {args.dpi} | presupuesto {args.presupuesto:.2%}")
+    for n, ctx in enumerate(CASES, 1):
+        native = os.path.join(out_dir, f"caso{n}_nativo.pdf")
+        t0 = time.perf_counter()
+        constancia_pdf.render(template, ctx, native)
+        native_ms = (time.perf_counter() - t0) * 1000
+
+        docx = os.path.join(out_dir, f"caso{n}_docx.docx")
+        reference = os.path.join(out_dir, f"caso{n}_docx.pdf")
+        t0 = time.perf_counter()
+        doc = template_cache.load(args.plantilla); doc.render(ctx); doc.save(docx)
+        constancia_pdf.convert_docx(docx, reference)
+        docx_ms = (time.perf_counter() - t0) * 1000
+
+        pages_a, pages_b = rasterize(reference, args.dpi), rasterize(native, args.dpi)
+        if len(pages_a) != len(pages_b):
+            print(f"Caso {n}: páginas distintas ({len(pages_a)} DOCX vs {len(pages_b)} nativo)")
+            ok = False
+            continue
+        worst = max(diff_pages(a, b, os.path.join(out_dir, f"caso{n}_p{i + 1}_diff.png"))
+                    for i, (a, b) in enumerate(zip(pages_a, pages_b)))
+        passed = worst <= args.presupuesto
+        ok = ok and passed
+        print(f"Caso {n}: {worst:.3%} píxeles distintos | nativo {native_ms:.0f} ms vs DOCX {docx_ms:.0f} ms"
+              f" | {'OK' if passed else 'DIFERENTE'}")
+
+    print(f"Salidas en: {out_dir}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
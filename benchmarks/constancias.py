@@ -0,0 +1,269 @@
+"""Benchmark de constancias: a dónde se va el tiempo de ConstanciaPage.process_pdf.
+
+Con alumnos sintéticos (en una carpeta temporal, no toca database.json) mide por
+etapa cada camino que existe:
+  docx_sin_cache  DocxTemplate por constancia: cargar / render / guardar / convertir
+  docx            template_cache.load (clon ya parseado): las mismas etapas
+  nativo          constancia_pdf.render sobre la plantilla PDF (render + guardar)
+  reutilizada     la misma constancia otra vez (constancia_store: sin generar)
+  historial       registrar una constancia y guardar la base (commit)
+y por lote (--lotes) el tiempo total con batch_constancias.run + un solo commit.
+"convertir" y el lote DOCX necesitan Word o LibreOffice; si no hay, quedan como
+no disponibles. Escribe todo en JSON (--salida) y con --comparar muestra la
+diferencia contra una corrida anterior.
+Uso: python benchmarks/constancias.py [--n 30] [--lotes 10,100] [--alumnos 2000]
+     [--plantilla-pdf ruta.pdf] [--salida resultados.json] [--comparar anterior.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+NAMES = ["JUAN", "MARÍA FERNANDA", "JOSÉ ÁNGEL", "ANA", "LUIS", "SOFÍA", "CARLOS", "XIMENA"]
+SURNAMES = ["PÉREZ", "LÓPEZ", "GÓMEZ", "NÚÑEZ", "HERNÁNDEZ", "GARCÍA", "MARTÍNEZ", "RAMÍREZ"]
+WORKSHOPS = ["FÚTBOL", "AJEDREZ", "MÚSICA", "DANZA", "ROBÓTICA", "TEATRO", "PROGRAMACIÓN"]
+
+
+def synthetic_students(n, seed=1):
+    """Alumnos acreditados (5 talleres) con nombres y carreras variados"""
+    from config import CAREERS
+    rnd = random.Random(seed)
+    students = []
+    for i in range(n):
+        students.append({
+            "matricula": str(202100000 + i), "nombres": rnd.choice(NAMES),
+            "apellidoPaterno": rnd.choice(SURNAMES), "apellidoMaterno": rnd.choice(SURNAMES),
+            "genero": rnd.choice("HM"), "telefono": "", "career": rnd.choice(CAREERS),
+            "semestre": str(rnd.randint(1, 9)), "schoolCycle": "2026-1", "photo_path": "",
+            "workshops": [{"name": w, "category": "Cultural", "value": 1.0, "status": "Acreditado",
+                           "pdf_path": "", "date": "2026-01-15"} for w in rnd.sample(WORKSHOPS, 5)],
+        })
+    return students
+
+
+def stats(values):
+    if not values: return None
+    values = sorted(values)
+    return {"mediana": statistics.median(values), "p90": values[int(0.9 * (len(values) - 1))],
+            "min": values[0], "n": len(values)}
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def job_in(out_dir, ctx, pdf_template, matricula=None):
+    """batch_constancias.make_job pero con las salidas en la carpeta temporal"""
+    import batch_constancias
+    job = batch_constancias.make_job(ctx, pdf_template, matricula)
+    job["pdf"] = os.path.join(out_dir, os.path.basename(job["pdf"]))
+    job["docx"] = os.path.join(out_dir, os.path.basename(job["docx"]))
+    return job
+
+
+def bench_single(students, n, tpl_docx, tpl_pdf, out_dir, engine):
+    """Una constancia a la vez, por etapa (mediana en ms)"""
+    import batch_constancias
+    import constancia_pdf
+    import template_cache
+    from docxtpl import DocxTemplate
+
+    results, notes = {}, []
+    when = datetime.now()
+    sample = students[:n]
+    converter = True
+
+    # DocxTemplate no lee la plantilla hasta el primer render: ahí cae su "cargar"
+    for name, load in (("docx_sin_cache", DocxTemplate), ("docx", template_cache.load)):
+        template_cache.clear()
+        times = {"cargar": [], "render": [], "guardar": [], "convertir": []}
+        for s in sample:
+            ctx = batch_constancias.context_for(s, when)
+            base = os.path.join(out_dir, f"{name}_{ctx['MATRICULA']}")
+            doc, ms = timed(load, tpl_docx); times["cargar"].append(ms)
+            _, ms = timed(doc.render, ctx); times["render"].append(ms)
+            _, ms = timed(doc.save, base + ".docx"); times["guardar"].append(ms)
+            if converter:
+                try:
+                    _, ms = timed(constancia_pdf.convert_docx, base + ".docx", base + ".pdf")
+                    times["convertir"].append(ms)
+                except constancia_pdf.TemplateError as e:
+                    converter = False
+                    notes.append(f"convertir: {e}")
+        results[name] = {k: stats(v) for k, v in times.items()}
+
+    if tpl_pdf:
+        times, first = [], None
+        constancia_pdf._templates.clear()
+        for i, s in enumerate(sample):
+            ctx = batch_constancias.context_for(s, when)
+            try:
+                _, ms = timed(constancia_pdf.render, tpl_pdf, ctx, os.path.join(out_dir, f"nativo_{i}.pdf"))
+            except constancia_pdf.TemplateError as e:
+                notes.append(f"nativo: {e}"); continue
+            if first is None: first = ms
+            else: times.append(ms)
+        results["nativo"] = {"primera": first, "render_guardar": stats(times)}
+    else:
+        notes.append("nativo: sin plantilla PDF (usar --plantilla-pdf o preparar con Word)")
+
+    # La misma constancia otra vez: se entrega la que ya existe
+    reuse = []
+    for s in sample:
+        job = job_in(out_dir, batch_constancias.context_for(s, when), tpl_pdf)
+        batch_constancias.render_job(job, "nativo" if tpl_pdf else "docx")
+        if os.path.exists(job["pdf"]):
+            reuse.append(timed(batch_constancias.reused, job)[1])
+    results["reutilizada"] = {"buscar": stats(reuse)}
+
+    # Historial: como process_pdf, un registro y una escritura de la base por constancia
+    times = []
+    for s in sample:
+        job = job_in(out_dir, batch_constancias.context_for(s, when), tpl_pdf)
+        result = batch_constancias.reused(job) or dict(batch_constancias._result(job), ms=0.0)
+        times.append(timed(batch_constancias.commit, engine, engine.students, [result], when)[1])
+    results["historial"] = {"commit": stats(times), "alumnos_en_base": len(engine.students)}
+    return results, notes, converter
+
+
+def bench_batch(students, sizes, tpl_pdf, out_dir, engine, workers, converter):
+    """Lotes completos: batch_constancias.run (pool de procesos) + un solo commit"""
+    import batch_constancias
+    from job_queue import JobQueue
+
+    results, notes = {}, []
+    engines = ([("nativo", tpl_pdf)] if tpl_pdf else []) + ([("docx", None)] if converter else [])
+    if not converter: notes.append("lote docx: sin Word ni LibreOffice")
+    for size in sizes:
+        for motor, template in engines:
+            folder = os.path.join(out_dir, f"lote_{motor}_{size}")
+            os.makedirs(folder, exist_ok=True)
+            when = datetime.now()
+            jobs = [job_in(folder, batch_constancias.context_for(s, when), template) for s in students[:size]]
+            queue = JobQueue(os.path.join(folder, "cola.jsonl"))
+            queue.add(jobs)
+            res, ms = timed(batch_constancias.run, jobs, workers, None, queue)
+            recorded, commit_ms = timed(batch_constancias.commit, engine, engine.students, queue.to_record(), when, queue)
+            ok = [r for r in res if not r["error"]]
+            results[f"{motor}_{size}"] = {
+                "motor": motor, "constancias": size, "total_ms": ms + commit_ms, "render_ms": ms,
+                "commit_ms": commit_ms, "ms_por_constancia": (ms + commit_ms) / size,
+                "por_minuto": size / ((ms + commit_ms) / 60000), "errores": size - len(ok),
+                "motores": {m: sum(1 for r in ok if r["motor"] == m) for m in {r["motor"] for r in ok}},
+            }
+    return results, notes
+
+
+def compare(current, previous):
+    """Diferencias de las medianas / totales contra otra corrida"""
+    def flat(d, prefix=""):
+        out = {}
+        for k, v in d.items():
+            key = f"{prefix}{k}"
+            if isinstance(v, dict):
+                if "mediana" in v: out[key] = v["mediana"]
+                else: out.update(flat(v, key + "."))
+            elif isinstance(v, (int, float)) and (k.endswith("_ms") or k in ("primera", "ms_por_constancia")):
+                out[key] = v
+        return out
+
+    now = flat({"individual": current["individual"], "lote": current["lote"]})
+    before = flat({"individual": previous.get("individual", {}), "lote": previous.get("lote", {})})
+    for key in sorted(now):
+        if key in before and before[key]:
+            change = (now[key] - before[key]) / before[key]
+            print(f"  {key:<42} {before[key]:>9.1f} -> {now[key]:>9.1f} ms  ({change:+.0%})")
+
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=30, help="constancias para las medianas individuales")
+    parser.add_argument("--lotes", default="10,100", help="tamaños de lote separados por coma ('' = ninguno)")
+    parser.add_argument("--alumnos", type=int, default=2000, help="alumnos en la base sintética")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--plantilla", default=os.path.join(ROOT, "plantilla_constancia.docx"))
+    parser.add_argument("--plantilla-pdf", default=None, help="plantilla del motor nativo (por omisión la preparada)")
+    parser.add_argument("--salida", default=None, help="archivo JSON de resultados")
+    parser.add_argument("--comparar", default=None, help="JSON de una corrida anterior")
+    args = parser.parse_args()
+
+    import constancia_pdf
+
+    sizes = [int(x) for x in args.lotes.split(",") if x.strip()]
+    tmp = tempfile.mkdtemp(prefix="bench_constancias_")
+    students = synthetic_students(max([args.alumnos, args.n] + sizes))
+    tpl_pdf = args.plantilla_pdf
+    if tpl_pdf is None:
+        try: tpl_pdf = constancia_pdf.template_for(args.plantilla, prepare=False)
+        except constancia_pdf.TemplateError: tpl_pdf = None
+
+    # La base sintética vive en la carpeta temporal (DB_PATH es relativo)
+    cwd = os.getcwd()
+    os.chdir(tmp)
+    try:
+        with open("database.json", "w", encoding="utf-8") as f:
+            json.dump(students, f, ensure_ascii=False)
+        from database import StudentEngine
+        engine = StudentEngine()
+        out_dir = os.path.join(tmp, "Constancias_Generadas")
+        os.makedirs(out_dir)
+        single, notes, converter = bench_single(engine.students, args.n, args.plantilla, tpl_pdf, out_dir, engine)
+        batch, batch_notes = bench_batch(engine.students, sizes, tpl_pdf, out_dir, engine, args.workers, converter)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    report = {
+        "fecha": datetime.now().isoformat(timespec="seconds"), "revision": git_revision(),
+        "python": platform.python_version(), "sistema": platform.platform(), "cpus": os.cpu_count(),
+        "parametros": {"n": args.n, "lotes": sizes, "alumnos": args.alumnos, "workers": args.workers,
+                       "plantilla_pdf": bool(tpl_pdf), "conversor": converter},
+        "individual": single, "lote": batch, "notas": notes + batch_notes,
+    }
+
+    print(f"Individual (mediana ms, n={args.n}):")
+    for path, stages in single.items():
+        parts = [f"{k} {v['mediana']:.1f}" for k, v in stages.items() if isinstance(v, dict) and v]
+        if path == "nativo" and stages.get("primera") is not None: parts.insert(0, f"primera {stages['primera']:.1f}")
+        print(f"  {path:<15} " + (" | ".join(parts) or "no disponible"))
+    if batch:
+        print("Lote:")
+        for name, r in batch.items():
+            print(f"  {name:<15} {r['total_ms'] / 1000:.2f} s | {r['ms_por_constancia']:.1f} ms por constancia"
+                  f" | {r['por_minuto']:.0f}/min | commit {r['commit_ms']:.0f} ms | errores {r['errores']}")
+    for note in report["notas"]: print(f"Nota: {note}")
+
+    out = args.salida or os.path.join(tempfile.gettempdir(), f"constancias_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Resultados: {out}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            print(f"Contra {args.comparar}:")
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
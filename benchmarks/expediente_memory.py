@@ -0,0 +1,96 @@
+"""Prueba de memoria: abrir 1,000 expedientes no debe hacer crecer la aplicación.
+
+Abre StudentDetailDialog con alumnos distintos (como ExpedientePage.open_dialog,
+pero sin exec) y mide objetos Qt vivos y memoria del proceso después del
+calentamiento. --modo nuevo reproduce el comportamiento anterior (un diálogo
+nuevo por apertura, nunca destruido) para comparar.
+Uso: python benchmarks/expediente_memory.py [--opens 1000] [--modo pool|nuevo]
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Después del calentamiento se toleran estos crecimientos
+OBJECT_BUDGET = 50
+RSS_BUDGET_MB = 30
+
+WARMUP = 100
+
+
+def rss_mb():
+    """Memoria residente del proceso en MB (None si no se puede medir aquí)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--opens", type=int, default=1000)
+    parser.add_argument("--modo", choices=["pool", "nuevo"], default="pool")
+    args = parser.parse_args()
+
+    from PySide6.QtCore import QCoreApplication, QEvent, QObject
+    from PySide6.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+    from styles import apply_styles
+    apply_styles(app)
+    from database import StudentEngine
+    from pages.expediente import ExpedientePage, StudentDetailDialog
+    from workers import FILE_POOL
+
+    engine = StudentEngine()
+    if not engine.students:
+        print("database.json está vacío; no hay expedientes que abrir")
+        sys.exit(1)
+    page = ExpedientePage(engine)
+
+    def open_once(student):
+        if args.modo == "pool":
+            page.dialog_for(student).release()
+        else:
+            d = StudentDetailDialog(engine, page)
+            d.bind(student)
+        FILE_POOL.waitForDone()
+        app.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    def live_objects():
+        return len(page.findChildren(QObject))
+
+    for i in range(WARMUP):
+        open_once(engine.students[i % len(engine.students)])
+    base_objects, base_rss = live_objects(), rss_mb()
+
+    for i in range(args.opens):
+        open_once(engine.students[i % len(engine.students)])
+    objects, rss = live_objects(), rss_mb()
+
+    grown_objects = objects - base_objects
+    print(f"Modo: {args.modo} | aperturas: {args.opens} (después de {WARMUP} de calentamiento)")
+    print(f"Objetos Qt vivos: {base_objects} -> {objects} ({grown_objects:+d}, presupuesto {OBJECT_BUDGET})")
+    ok = grown_objects <= OBJECT_BUDGET
+    if rss is not None and base_rss is not None:
+        print(f"Memoria (MB): {base_rss:.1f} -> {rss:.1f} ({rss - base_rss:+.1f}, presupuesto {RSS_BUDGET_MB})")
+        ok = ok and rss - base_rss <= RSS_BUDGET_MB
+    else:
+        print("Memoria del proceso: no disponible (instala psutil para medirla)")
+
+    print("OK" if ok else "FUGA DE MEMORIA")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
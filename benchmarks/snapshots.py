@@ -0,0 +1,83 @@
+"""Prueba de deduplicación: agregar o editar un alumno solo debe producir bloques nuevos alrededor del cambio.
+
+Arma un database.json de prueba (--alumnos registros, con indent=4 como lo guarda
+StudentEngine), lo corta con snapshots.chunks y repite --pruebas veces: inserta un
+alumno en una posición al azar (o cambia el nombre de uno) y cuenta los bloques que no
+estaban en la versión anterior. Falla si algún cambio produce más de MAX_NEW_BLOCKS
+o si el bloque promedio queda lejos de snapshots.TARGET_CHUNK.
+Uso: python benchmarks/snapshots.py [--alumnos 3000] [--pruebas 40]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Bloques nuevos tolerados por cambio (el del cambio y, si cae cerca de un corte, el vecino)
+MAX_NEW_BLOCKS = 3
+
+NAMES = ["ÁNGEL", "BRUNO", "MARÍA", "ZOE", "JOSÉ", "ANA", "PAULA", "SERGIO"]
+SURNAMES = ["LÓPEZ", "PÉREZ", "GARCÍA", "RAMÍREZ", "SÁNCHEZ", "TORRES"]
+WORKSHOPS = ["FÚTBOL", "AJEDREZ", "MÚSICA", "DANZA", "ROBÓTICA", "TEATRO"]
+
+
+def student(i):
+    return {"matricula": str(202100000 + i), "nombres": random.choice(NAMES),
+            "apellidoPaterno": random.choice(SURNAMES), "apellidoMaterno": random.choice(SURNAMES),
+            "career": "INGENIERÍA EN SISTEMAS", "semestre": str(random.randint(1, 9)), "schoolCycle": "2025-1",
+            "workshops": [{"name": random.choice(WORKSHOPS), "status": "Acreditado", "value": 1.0,
+                           "date": f"2025-0{random.randint(1, 9)}-1{random.randint(0, 9)}",
+                           "pdf_path": f"Evidencias_Creditos/{random.getrandbits(64):016x}.pdf"}
+                          for _ in range(random.randint(1, 5))]}
+
+
+def digests(students):
+    import snapshots
+    data = json.dumps(students, indent=4, ensure_ascii=False).encode('utf-8')
+    return len(data), [hashlib.sha256(b).hexdigest() for b in snapshots.chunks(data)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alumnos", type=int, default=3000)
+    parser.add_argument("--pruebas", type=int, default=40)
+    args = parser.parse_args()
+
+    import snapshots
+    random.seed(1)
+    students = [student(i) for i in range(args.alumnos)]
+    t0 = time.perf_counter()
+    size, base = digests(students)
+    ms = (time.perf_counter() - t0) * 1000
+    avg = size / len(base)
+    print(f"database.json de prueba: {size / 1024 / 1024:.1f} MB | {len(base)} bloques"
+          f" | promedio {avg / 1024:.1f} KB | {ms:.0f} ms")
+
+    new_counts = []
+    for k in range(args.pruebas):
+        changed = list(students)
+        if k % 2 == 0:
+            changed.insert(random.randrange(len(changed) + 1), student(args.alumnos + k))
+        else:
+            i = random.randrange(len(changed))
+            changed[i] = dict(changed[i], nombres=changed[i]["nombres"] + " CAMBIADO")
+        _, after = digests(changed)
+        known = set(base)
+        new_counts.append(sum(1 for d in after if d not in known))
+    inserts, edits = new_counts[0::2], new_counts[1::2]
+    print(f"Bloques nuevos por alta: promedio {sum(inserts) / len(inserts):.1f}, máximo {max(inserts)}")
+    print(f"Bloques nuevos por edición: promedio {sum(edits) / len(edits):.1f}, máximo {max(edits)}")
+
+    ok = max(new_counts) <= MAX_NEW_BLOCKS and snapshots.TARGET_CHUNK / 4 <= avg <= snapshots.TARGET_CHUNK * 2
+    print(f"Presupuesto: {MAX_NEW_BLOCKS} bloques por cambio")
+    print("OK" if ok else "FALLA")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Benchmark de arranque en frío: desde el primer import hasta la ventana visible.
+
+Cada corrida usa un intérprete nuevo para que los imports no estén en caché.
+Uso: python benchmarks/startup.py [--runs 5] [--budget-ms 1500]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Presupuesto de arranque en frío (mediana) en milisegundos
+STARTUP_BUDGET_MS = 1500
+
+# Módulos pesados que NO deberían cargarse antes de mostrar la ventana
+HEAVY_MODULES = ["PySide6.QtPdf", "PySide6.QtPdfWidgets", "docxtpl", "docx2pdf"]
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from PySide6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+import main
+from styles import apply_styles
+apply_styles(app)
+window = main.MainApp()
+window.show()
+app.processEvents()
+elapsed = (time.perf_counter() - t0) * 1000
+print(json.dumps({"ms": elapsed, "loaded": [m for m in sys.argv[1:] if m in sys.modules]}))
+"""
+
+
+def run_once():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, *HEAVY_MODULES],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    times = [r["ms"] for r in results]
+    median = statistics.median(times)
+    loaded = sorted({m for r in results for m in r["loaded"]})
+
+    print(f"Corridas: {args.runs}")
+    print(f"Arranque (ms): mediana {median:.0f} | mín {min(times):.0f} | máx {max(times):.0f}")
+    print(f"Presupuesto: {args.budget_ms:.0f} ms")
+    if loaded:
+        print("Módulos pesados cargados al arrancar: " + ", ".join(loaded))
+
+    ok = median <= args.budget_ms and not loaded
+    print("OK" if ok else "FUERA DE PRESUPUESTO")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark de estilos: costo de crear y pulir widgets con hoja propia vs hoja global.
+
+"antes"  = cada widget llama setStyleSheet con su CSS (como estaba el código).
+"después" = el widget solo declara objectName / propiedades y usa la hoja de styles.py.
+Cada modo corre en un intérprete nuevo para que no comparta caché de estilos.
+Uso: python benchmarks/style_polish.py [--rows 500] [--runs 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QFrame, QLabel
+import styles
+
+mode, case, rows = sys.argv[1], sys.argv[2], int(sys.argv[3])
+app = QApplication(sys.argv[:1])
+app.setStyleSheet(styles.BASE if mode == "antes" else styles.APP_STYLESHEET)
+
+ROW_CSS = "background: #f1f5f9; border: 1px solid #cbd5e1; padding: 5px;"
+DOC_CSS = '''
+    QPushButton { background-color: #f8fafc; border: 1px solid #e2e8f0; text-align: left; padding: 10px; color: #1e293b; }
+    QPushButton:checked { background-color: #eff6ff; border: 1px solid #3b82f6; }
+    QPushButton:hover { background-color: #e2e8f0; }
+'''
+NAV_CSS = '''
+    QPushButton { background: none; color: #94a3b8; text-align: left; padding-left: 20px; border: none;
+                  font-size: 14px; border-left: 3px solid transparent; }
+    QPushButton:hover { background-color: #1e293b; color: white; }
+    QPushButton:checked { background-color: #3b82f6; color: white; font-weight: bold; border-left: 3px solid white; }
+'''
+CARD_LABELS = [
+    ("CardTitle", "color: #64748b; font-size: 13px; font-weight: 600; font-family: 'Segoe UI'; border: none;"),
+    ("CardValue", "color: #0f172a; font-size: 28px; font-weight: 800; font-family: 'Segoe UI'; border: none;"),
+    ("CardSubtitle", "color: #94a3b8; font-size: 11px; font-family: 'Segoe UI'; border: none;"),
+]
+
+
+def button(name, css):
+    b = QPushButton("Ver")
+    if mode == "antes": b.setStyleSheet(css)
+    else: styles.styled(b, name)
+    return b
+
+
+def card():
+    f = QFrame()
+    ly = QVBoxLayout(f)
+    if mode == "antes":
+        f.setObjectName("Card")
+        f.setStyleSheet("QFrame#Card { background-color: white; border-radius: 16px; border: 1px solid #f1f5f9; }")
+    else:
+        styles.styled(f, "Card")
+    for name, css in CARD_LABELS:
+        lbl = QLabel("123")
+        if mode == "antes": lbl.setStyleSheet(css)
+        else: styles.styled(lbl, name)
+        ly.addWidget(lbl)
+    icon = QLabel("*")
+    if mode == "antes":
+        icon.setStyleSheet("background-color: #f3e8ff; color: #7e22ce; border-radius: 10px; font-size: 20px; border: none;")
+    else:
+        styles.styled(icon, "CardIcon", accent="purple")
+    ly.addWidget(icon)
+    return f
+
+
+FACTORIES = {
+    "fila": lambda: button("RowButton", ROW_CSS),
+    "documento": lambda: button("DocButton", DOC_CSS),
+    "menu": lambda: button("NavButton", NAV_CSS),
+    "tarjeta": card,
+}
+
+host = QWidget(); ly = QVBoxLayout(host)
+host.show(); app.processEvents()
+
+t0 = time.perf_counter()
+widgets = [FACTORIES[case]() for _ in range(rows)]
+t1 = time.perf_counter()
+for w in widgets:
+    ly.addWidget(w)
+    w.ensurePolished()
+    for child in w.findChildren(QWidget): child.ensurePolished()
+t2 = time.perf_counter()
+app.processEvents()
+t3 = time.perf_counter()
+print(json.dumps({"crear": (t1 - t0) * 1000, "pulir": (t2 - t1) * 1000, "pintar": (t3 - t2) * 1000}))
+"""
+
+CASES = ["fila", "documento", "menu", "tarjeta"]
+
+
+def run_once(mode, case, rows):
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, mode, case, str(rows)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Widgets por caso: {args.rows} | corridas: {args.runs} (mediana, ms)")
+    print(f"{'CASO':<10} {'MODO':<8} {'CREAR':>8} {'PULIR':>8} {'PINTAR':>8} {'TOTAL':>8}")
+    for case in CASES:
+        totals = {}
+        for mode in ("antes", "después"):
+            results = [run_once(mode, case, args.rows) for _ in range(args.runs)]
+            med = {k: statistics.median(r[k] for r in results) for k in ("crear", "pulir", "pintar")}
+            totals[mode] = sum(med.values())
+            print(f"{case:<10} {mode:<8} {med['crear']:>8.1f} {med['pulir']:>8.1f} {med['pintar']:>8.1f} {totals[mode]:>8.1f}")
+        print(f"{'':<10} {'mejora':<8} {totals['antes'] / max(totals['después'], 1e-6):>35.1f}x")
+
+
+if __name__ == "__main__":
+    main()
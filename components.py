@@ -1,6 +1,20 @@
-from PySide6.QtWidgets import QPushButton, QFrame, QVBoxLayout, QHBoxLayout, QLabel
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QCursor
+from PySide6.QtWidgets import QPushButton, QFrame, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, QWidget
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QCursor, QImage, QPixmap
+from styles import styled
+import pdf_cache
+import thumbnails
+from workers import process_pool
+
+# Filas que se pintan por tanda en las tablas con scroll infinito
+PAGE_SIZE = 50
+
+# Ancho (px) del primer render rápido de cada página en ProgressivePdfView
+PREVIEW_WIDTH = 300
+
+# Procesos del visor: con dos, la primera página de otro archivo no espera a que termine
+# el render en alta de la página que se estaba viendo (ese no se puede interrumpir)
+VIEWER_WORKERS = 2
 
 class AnimButton(QPushButton):
     """Botón del menú con animación de hover"""
@@ -9,34 +23,15 @@ class AnimButton(QPushButton):
         self.setCheckable(True)
         self.setFixedHeight(50)
         self.setCursor(Qt.PointingHandCursor)
-        self.setStyleSheet("""
-            QPushButton { 
-                background: none; 
-                color: #94a3b8; 
-                text-align: left; 
-                padding-left: 20px; 
-                border: none; 
-                font-family: 'Segoe UI', sans-serif;
-                font-size: 14px; 
-                border-left: 3px solid transparent; 
-            }
-            QPushButton:hover { background-color: #1e293b; color: white; }
-            QPushButton:checked { background-color: #3b82f6; color: white; font-weight: bold; border-left: 3px solid white; }
-        """)
+        self.setObjectName("NavButton")
 
 class StatCard(QFrame):
-    """Tarjeta de estadística estilo Dashboard Moderno"""
-    def __init__(self, title, value, subtitle, icon, color_bg, color_text):
+    """Tarjeta de estadística estilo Dashboard Moderno.
+    accent: purple | blue | orange | gray (colores del icono, ver styles.py)"""
+    def __init__(self, title, value, subtitle, icon, accent):
         super().__init__()
         self.setMinimumWidth(220)
         self.setFixedHeight(120)
-        self.setStyleSheet(f"""
-            QFrame#Card {{ 
-                background-color: white; 
-                border-radius: 16px; 
-                border: 1px solid #f1f5f9; 
-            }}
-        """)
         self.setObjectName("Card")
         
         # Layout Principal Horizontal
@@ -47,14 +42,9 @@ class StatCard(QFrame):
         text_layout = QVBoxLayout()
         text_layout.setSpacing(2)
         
-        lbl_title = QLabel(title)
-        lbl_title.setStyleSheet("color: #64748b; font-size: 13px; font-weight: 600; font-family: 'Segoe UI'; border: none;")
-        
-        lbl_value = QLabel(str(value))
-        lbl_value.setStyleSheet("color: #0f172a; font-size: 28px; font-weight: 800; font-family: 'Segoe UI'; border: none;")
-        
-        lbl_sub = QLabel(subtitle)
-        lbl_sub.setStyleSheet("color: #94a3b8; font-size: 11px; font-family: 'Segoe UI'; border: none;")
+        lbl_title = styled(QLabel(title), "CardTitle")
+        lbl_value = styled(QLabel(str(value)), "CardValue")
+        lbl_sub = styled(QLabel(subtitle), "CardSubtitle")
         
         text_layout.addWidget(lbl_title)
         text_layout.addWidget(lbl_value)
@@ -64,21 +54,190 @@ class StatCard(QFrame):
         icon_layout = QVBoxLayout()
         icon_layout.setAlignment(Qt.AlignTop | Qt.AlignRight)
         
-        lbl_icon = QLabel(icon)
+        # Cuadro del icono (fondo suave y texto del color de acento)
+        lbl_icon = styled(QLabel(icon), "CardIcon", accent=accent)
         lbl_icon.setFixedSize(45, 45)
         lbl_icon.setAlignment(Qt.AlignCenter)
-        # Estilo del cuadro del icono (Fondo suave y texto de color)
-        lbl_icon.setStyleSheet(f"""
-            background-color: {color_bg}; 
-            color: {color_text}; 
-            border-radius: 10px; 
-            font-size: 20px;
-            border: none;
-        """)
         
         icon_layout.addWidget(lbl_icon)
         
         # Agregar al layout principal
         main_layout.addLayout(text_layout)
         main_layout.addStretch() # Empuja el icono a la derecha
-        main_layout.addLayout(icon_layout)
\ No newline at end of file
+        main_layout.addLayout(icon_layout)
+
+
+class TablePager:
+    """Pinta un QTableWidget por páginas a medida que se hace scroll y lleva
+    el orden de los encabezados (columna -> llave de StudentEngine.sort_order).
+    fill_row(r, alumno) llena una fila; on_sort() se llama al cambiar el orden."""
+    def __init__(self, table, fill_row, sort_keys, on_sort, page_size=PAGE_SIZE):
+        self.table = table
+        self.fill_row = fill_row
+        self.sort_keys = sort_keys
+        self.on_sort = on_sort
+        self.page_size = page_size
+        self.rows = []
+        self.sort = None
+        self.sort_col = None
+        self.descending = False
+
+        table.verticalScrollBar().valueChanged.connect(self._on_scroll)
+        header = table.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.sectionClicked.connect(self._on_header)
+
+    def reset(self, rows):
+        """Cambia el resultado completo y pinta solo la primera página"""
+        self.rows = rows
+        self.table.setRowCount(0)
+        self.table.scrollToTop()
+        self.fetch_more()
+
+    def fetch_more(self):
+        start = self.table.rowCount()
+        end = min(start + self.page_size, len(self.rows))
+        if start >= end: return
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(end)
+        for r in range(start, end):
+            self.fill_row(r, self.rows[r])
+        self.table.setUpdatesEnabled(True)
+
+    def _on_scroll(self, value):
+        bar = self.table.verticalScrollBar()
+        if value >= bar.maximum() - bar.pageStep() // 2:
+            self.fetch_more()
+
+    def _on_header(self, col):
+        key = self.sort_keys.get(col)
+        if key is not None:
+            # Segundo clic en la misma columna invierte el orden
+            self.descending = (not self.descending) if col == self.sort_col else False
+            self.sort, self.sort_col = key, col
+        # Qt mueve la flecha en cada clic; se deja en la columna que realmente ordena
+        header = self.table.horizontalHeader()
+        header.setSortIndicatorShown(self.sort_col is not None)
+        if self.sort_col is not None:
+            header.setSortIndicator(self.sort_col, Qt.DescendingOrder if self.descending else Qt.AscendingOrder)
+        if key is not None: self.on_sort()
+
+
+class ProgressivePdfView(QScrollArea):
+    """Visor de PDF que no bloquea la GUI: cada página aparece primero en baja
+    resolución (PREVIEW_WIDTH) y después se reemplaza por la de resolución completa.
+    Los renders corren en el pool de procesos "visor" (PyMuPDF, ver thumbnails.py),
+    una página a la vez; load() de otro archivo o clear() cancelan lo pendiente (y lo
+    enviado que todavía no empezó)."""
+    _rendered = Signal(int, int, int, object)  # turno, página, ancho pedido, resultado
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWidgetResizable(True)
+        self.setAlignment(Qt.AlignHCenter)
+        self.pages_w = QWidget()
+        self.pages_ly = QVBoxLayout(self.pages_w)
+        self.pages_ly.setAlignment(Qt.AlignTop | Qt.AlignHCenter)
+        self.pages_ly.setSpacing(10)
+        self.setWidget(self.pages_w)
+
+        self.path = None
+        self._token = 0      # sube en cada load/clear: los resultados viejos se descartan
+        self._queue = []     # (página, ancho) por renderizar
+        self._busy = False
+        self._future = None  # render enviado al pool
+        self._labels = []
+        self._images = {}    # página -> mejor QImage recibida
+        self._rendered.connect(self._on_rendered)
+
+    def load(self, path):
+        self.clear()
+        self.path = path
+        self._queue = [(0, PREVIEW_WIDTH)]  # la primera respuesta dice cuántas páginas hay
+        self._next()
+
+    def clear(self):
+        self._token += 1
+        self._queue = []
+        if self._future is not None: self._future.cancel()  # si ya corre, se descarta al llegar
+        self._future = None
+        self._busy = False
+        self.path = None
+        self._images = {}
+        for lbl in self._labels: lbl.deleteLater()
+        self._labels = []
+
+    def _full_width(self):
+        return max(PREVIEW_WIDTH, int((self.viewport().width() - 20) * self.devicePixelRatioF()))
+
+    def _next(self):
+        if self._busy or not self._queue: return
+        page, width = self._queue.pop(0)
+        token = self._token
+        try:
+            future = process_pool("visor", VIEWER_WORKERS).submit(thumbnails.render_page, self.path, page, width)
+        except RuntimeError:
+            return  # pool apagado (la app está cerrando)
+        self._busy = True
+        self._future = future
+        future.add_done_callback(lambda f: self._emit(token, page, width, f))
+
+    def _emit(self, token, page, width, future):
+        # Corre en el hilo del executor; la señal lleva el resultado al hilo de la GUI
+        if future.cancelled(): return
+        try: result = future.result()
+        except Exception: result = None
+        try: self._rendered.emit(token, page, width, result)
+        except RuntimeError: pass  # el visor ya se destruyó
+
+    def _on_rendered(self, token, page, width, result):
+        if token != self._token: return
+        self._busy = False
+        self._future = None
+        if not result or not result[1]:
+            if not self._labels: self._set_message("No se pudo mostrar el PDF.")
+            self._next(); return
+
+        count, w, h, stride, data = result
+        if not self._labels: self._start_pages(count)
+        img = QImage(data, w, h, stride, QImage.Format_RGB888).copy()
+        if width != PREVIEW_WIDTH: pdf_cache.store_page(self.path, page, width, img)
+        self._show(page, img)
+        self._next()
+
+    def _start_pages(self, count):
+        """Crea un QLabel por página y arma la cola: primero todas en baja, luego en alta"""
+        full = self._full_width()
+        self._labels = [QLabel() for _ in range(count)]
+        for lbl in self._labels:
+            lbl.setAlignment(Qt.AlignCenter)
+            self.pages_ly.addWidget(lbl)
+        low, high = [], []
+        for page in range(count):
+            cached = pdf_cache.cached_page(self.path, page, full)
+            if cached is not None:
+                self._show(page, cached); continue
+            if page > 0: low.append((page, PREVIEW_WIDTH))
+            high.append((page, full))
+        self._queue = low + high
+
+    def _set_message(self, text):
+        lbl = QLabel(text); lbl.setAlignment(Qt.AlignCenter)
+        self._labels = [lbl]; self.pages_ly.addWidget(lbl)
+
+    def _show(self, page, img):
+        best = self._images.get(page)
+        if best is not None and best.width() > img.width(): return
+        self._images[page] = img
+        self._paint(page)
+
+    def _paint(self, page):
+        dpr = self.devicePixelRatioF()
+        width = int((self.viewport().width() - 20) * dpr)
+        pixmap = QPixmap.fromImage(self._images[page].scaledToWidth(max(width, 1), Qt.SmoothTransformation))
+        pixmap.setDevicePixelRatio(dpr)
+        self._labels[page].setPixmap(pixmap)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        for page in self._images: self._paint(page)
@@ -1,6 +1,9 @@
 # config.py
 DB_PATH = 'database.json'
 
+# Procesos en paralelo para generar constancias por lote (0 = automático: los núcleos, hasta 4)
+CONSTANCIA_WORKERS = 0
+
 # NOTA: Estos nombres ahora coinciden con tu JSON (Mayúsculas y Abreviaturas)
 CAREERS = [
     'INGENIERÍA EN SISTEMAS', 
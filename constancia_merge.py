@@ -0,0 +1,204 @@
+# constancia_merge.py
+# Un solo PDF listo para imprimir con constancias ya generadas: ordenadas por carrera
+# y nombre, con un índice al inicio (cada renglón lleva a la página del alumno) y
+# marcadores por carrera / alumno.
+# Las páginas se copian por tandas (CHUNK documentos): al final de cada tanda se
+# guarda de forma incremental y se cierra el documento, así la memoria no crece
+# aunque sean miles de constancias.
+#   python constancia_merge.py [--fecha AAAA-MM-DD] [--carrera X] [--salida archivo.pdf]
+# Este módulo no importa Qt.
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+from database import fold
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(ROOT, "Constancias_Generadas")
+
+# Documentos que se copian antes de guardar y cerrar
+CHUNK = 50
+
+# Índice: márgenes y renglones (puntos)
+MARGIN = 56
+TITLE_SIZE = 16
+LINE_SIZE = 10
+LEADING = 15
+
+
+def sort_key(item):
+    # Sin acentos y en mayúsculas: Á queda junto a A
+    return (fold(item["carrera"]), fold(item["nombre"]), str(item["matricula"]))
+
+
+def items_from_results(results):
+    """Constancias de un lote (resultados de batch_constancias.render_job)"""
+    return [{k: r[k] for k in ("nombre", "matricula", "carrera", "pdf")} for r in results if not r["error"]]
+
+
+def items_from_history(students, date=None, career=None):
+    """La constancia más reciente de cada alumno (de ese día / esa carrera) según el historial"""
+    from batch_constancias import CONSTANCIA_NAME, context_for
+    items = []
+    for s in students:
+        if career and str(s.get('career', '')).upper() != career.upper(): continue
+        found = [w for w in s.get('workshops', [])
+                 if w.get('name') == CONSTANCIA_NAME and w.get('pdf_path')
+                 and (not date or w.get('date') == date)]
+        if not found: continue
+        ctx = context_for(s)
+        items.append({"nombre": ctx['NOMBRE_ESTUDIANTE'], "matricula": ctx['MATRICULA'],
+                      "carrera": ctx['CARRERA'], "pdf": found[-1]['pdf_path']})
+    return items
+
+
+def default_path(when=None):
+    base = os.path.join(OUT_DIR, f"Impresion_{(when or datetime.now()).strftime('%Y%m%d_%H%M%S')}")
+    path, n = base + ".pdf", 1
+    while os.path.exists(path):
+        n += 1; path = f"{base}_{n}.pdf"
+    return path
+
+
+def _index_lines(items, first_page):
+    """Renglones del índice: ('carrera', texto) o ('alumno', texto, matrícula, página 0-based)"""
+    lines, career, page = [], None, first_page
+    for item in items:
+        # Se agrupa como se ordena (sort_key): ADMINISTRACIÓN y ADMINISTRACION van juntas,
+        # con la primera forma escrita que aparece
+        if fold(item["carrera"]) != career:
+            career = fold(item["carrera"])
+            lines.append(("carrera", item["carrera"] or "SIN CARRERA"))
+        lines.append(("alumno", item["nombre"], str(item["matricula"]), page))
+        page += item["paginas"]
+    return lines
+
+
+def _draw_index(doc, lines, per_page, title, size):
+    """Escribe el índice en las primeras páginas; devuelve [(página, rect, destino)] para las ligas"""
+    import fitz
+    width, height = size
+    links = []
+    for n in range(0, len(lines), per_page):
+        page = doc.new_page(pno=n // per_page, width=width, height=height)
+        y = MARGIN + TITLE_SIZE
+        if n == 0:
+            page.insert_text((MARGIN, y), title, fontsize=TITLE_SIZE, fontname="hebo")
+        y += LEADING * 2
+        for line in lines[n:n + per_page]:
+            if line[0] == "carrera":
+                page.insert_text((MARGIN, y + 4), line[1], fontsize=LINE_SIZE, fontname="hebo")
+            else:
+                _, name, mat, target = line
+                label = str(target + 1)
+                page.insert_text((MARGIN + 14, y), name, fontsize=LINE_SIZE, fontname="helv")
+                page.insert_text((width - MARGIN - 150, y), mat, fontsize=LINE_SIZE, fontname="helv")
+                page.insert_text((width - MARGIN - fitz.get_text_length(label, "helv", LINE_SIZE), y),
+                                 label, fontsize=LINE_SIZE, fontname="helv")
+                links.append((n // per_page, fitz.Rect(MARGIN, y - LINE_SIZE, width - MARGIN, y + 3), target))
+            y += LEADING
+    return links
+
+
+def merge(items, out_path=None, title=None, progress=None):
+    """Junta los PDFs de items ({nombre, matricula, carrera, pdf}) en out_path.
+    progress(hechos, total) por cada documento copiado. Los PDFs que faltan o no abren
+    se omiten (quedan en 'omitidos'). Devuelve el resumen con la ruta."""
+    import fitz
+    t0 = time.perf_counter()
+    out_path = out_path or default_path()
+    title = title or f"Constancias ({datetime.now().strftime('%d/%m/%Y')})"
+
+    # 1. Cuántas páginas trae cada uno (abrir solo lee la tabla de objetos)
+    ready, skipped, size = [], [], None
+    for item in sorted(items, key=sort_key):
+        try:
+            with fitz.open(item["pdf"]) as src:
+                if src.page_count == 0: raise ValueError("sin páginas")
+                if size is None: size = (src[0].rect.width, src[0].rect.height)
+                ready.append({**item, "paginas": src.page_count})
+        except Exception as e:
+            skipped.append({**item, "error": str(e) or type(e).__name__})
+    if not ready:
+        return {"ruta": "", "documentos": 0, "paginas": 0, "omitidos": skipped, "segundos": 0.0}
+
+    # 2. Índice (ya se sabe en qué página empieza cada alumno)
+    per_page = max(1, int((size[1] - 2 * MARGIN - TITLE_SIZE - LEADING * 2) // LEADING))
+    probe = _index_lines(ready, 0)
+    cover = (len(probe) + per_page - 1) // per_page
+    lines = _index_lines(ready, cover)
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    tmp = out_path + ".tmp"
+    doc = fitz.open()
+    links = _draw_index(doc, lines, per_page, title, size)
+    doc.save(tmp, garbage=1, deflate=True)
+    doc.close()
+
+    # 3. Constancias por tandas: guardar incremental y cerrar libera lo ya copiado
+    for n in range(0, len(ready), CHUNK):
+        doc = fitz.open(tmp)
+        for item in ready[n:n + CHUNK]:
+            with fitz.open(item["pdf"]) as src:
+                doc.insert_pdf(src)
+        doc.saveIncr()
+        doc.close()
+        if progress: progress(min(n + CHUNK, len(ready)), len(ready))
+
+    # 4. Marcadores y ligas del índice
+    doc = fitz.open(tmp)
+    toc, career = [[1, "Índice", 1]], None
+    for line in lines:
+        if line[0] == "carrera":
+            career = line[1]
+        else:
+            if career is not None:
+                toc.append([1, career, line[3] + 1]); career = None
+            toc.append([2, f"{line[1]} ({line[2]})", line[3] + 1])
+    doc.set_toc(toc)
+    for page_no, rect, target in links:
+        doc[page_no].insert_link({"kind": fitz.LINK_GOTO, "from": rect, "page": target})
+    pages = doc.page_count
+    doc.saveIncr()
+    doc.close()
+    os.replace(tmp, out_path)
+    return {"ruta": out_path, "documentos": len(ready), "paginas": pages, "omitidos": skipped,
+            "segundos": time.perf_counter() - t0}
+
+
+def describe(result):
+    text = (f"{result['documentos']} constancias, {result['paginas']} páginas"
+            f" en {result['segundos']:.1f} s\n{result['ruta']}")
+    if result["omitidos"]:
+        text += f"\nOmitidas (no se pudieron abrir): {len(result['omitidos'])}"
+        text += "".join(f"\n  {o['matricula']}: {o['error']}" for o in result["omitidos"][:10])
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Une constancias generadas en un solo PDF para imprimir")
+    parser.add_argument("--fecha", help="solo las registradas ese día (AAAA-MM-DD; 'hoy' = hoy)")
+    parser.add_argument("--carrera", help="solo esta carrera")
+    parser.add_argument("--salida", help="ruta del PDF (por omisión Constancias_Generadas/Impresion_*.pdf)")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # DB_PATH es relativo a la carpeta de la app
+    from database import StudentEngine
+    date = datetime.now().strftime("%Y-%m-%d") if args.fecha == "hoy" else args.fecha
+    items = items_from_history(StudentEngine().students, date, args.carrera)
+    if not items:
+        print("No hay constancias que unir")
+        return 0
+
+    def progress(done, total):
+        print(f"\r[{done}/{total}]", end="", flush=True)
+
+    result = merge(items, args.salida, progress=progress)
+    print()
+    print(describe(result))
+    return 1 if result["omitidos"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
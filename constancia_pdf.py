@@ -0,0 +1,222 @@
+# constancia_pdf.py
+# Motor nativo de constancias con PyMuPDF (fitz): sin Word ni docx2pdf.
+# Parte de plantilla_constancia.pdf, que es la plantilla DOCX convertida UNA vez
+# con los marcadores {{ NOMBRE_ESTUDIANTE }}, {{ MATRICULA }}, ... tal cual.
+# Por cada alumno se busca cada marcador, se borra (redact, sin tocar imágenes)
+# y se escribe el valor en el mismo renglón con la fuente, tamaño y color del
+# marcador. Si el valor es más ancho que el espacio libre del renglón se reduce
+# la letra (hasta MIN_FONT_SCALE); si aun así no cabe es TemplateError.
+# La posición de los marcadores se calcula una vez por versión de la plantilla.
+# Si falta la plantilla PDF o algún marcador, render() lanza TemplateError y
+# constancias.py usa el camino DOCX -> PDF de siempre.
+# Este módulo no importa Qt: también corre en procesos hijos (generación por lotes).
+import os
+import shutil
+import subprocess
+import sys
+import threading
+
+FIELDS = ("NOMBRE_ESTUDIANTE", "MATRICULA", "CARRERA", "DIA", "MES", "ANIO")
+
+# Nunca se reduce la letra por debajo de esta fracción del tamaño original
+MIN_FONT_SCALE = 0.6
+
+# Fuentes TrueType para igualar a Word; si no se encuentran se usan las Base-14 de PDF
+FONT_DIRS = [
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+    "/usr/share/fonts/truetype/msttcorefonts",
+    "/usr/share/fonts/truetype/crosextra",
+    os.path.expanduser("~/.fonts"),
+]
+FONT_FILES = {  # familia -> (normal, negrita)
+    "arial": ("arial.ttf", "arialbd.ttf"),
+    "calibri": ("calibri.ttf", "calibrib.ttf"),
+    "cambria": ("cambria.ttc", "cambriab.ttf"),
+    "timesnewroman": ("times.ttf", "timesbd.ttf"),
+    "verdana": ("verdana.ttf", "verdanab.ttf"),
+}
+
+_templates = {}  # ruta pdf -> (firma, bytes, marcadores)
+_lock = threading.Lock()
+
+
+class TemplateError(Exception):
+    """La plantilla PDF no existe, está desactualizada o le falta un marcador"""
+
+
+def template_pdf_path(docx_path):
+    return os.path.splitext(docx_path)[0] + ".pdf"
+
+
+def _signature(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def convert_docx(docx_path, pdf_path):
+    """DOCX -> PDF con Word (docx2pdf) o, si no hay Word, con LibreOffice"""
+    error = None
+    try:
+        from docx2pdf import convert
+        convert(docx_path, pdf_path)
+        if os.path.exists(pdf_path): return pdf_path
+    except Exception as e:
+        error = e
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    if not soffice:
+        if error is not None and not isinstance(error, (ImportError, NotImplementedError)): raise error
+        raise TemplateError("No hay Word ni LibreOffice para convertir el DOCX a PDF")
+    out_dir = os.path.dirname(os.path.abspath(pdf_path))
+    subprocess.run([soffice, "--headless", "--convert-to", "pdf", "--outdir", out_dir, docx_path],
+                   check=True, capture_output=True, timeout=120)
+    produced = os.path.join(out_dir, os.path.splitext(os.path.basename(docx_path))[0] + ".pdf")
+    if os.path.abspath(produced) != os.path.abspath(pdf_path): os.replace(produced, pdf_path)
+    return pdf_path
+
+
+def template_for(docx_path, prepare=True):
+    """plantilla_constancia.pdf al día con el DOCX; la genera (una vez) si prepare=True"""
+    pdf_path = template_pdf_path(docx_path)
+    fresh = os.path.exists(pdf_path) and os.path.getmtime(pdf_path) >= os.path.getmtime(docx_path)
+    if fresh: return pdf_path
+    if not prepare: raise TemplateError(f"Falta o está desactualizada: {pdf_path}")
+    try:
+        return convert_docx(docx_path, pdf_path)
+    except TemplateError:
+        raise
+    except Exception as e:
+        raise TemplateError(f"No se pudo preparar {pdf_path}: {e}") from e
+
+
+def _font_file(name, bold):
+    family = name.split("+")[-1].split(",")[0].split("-")[0].replace(" ", "").lower()
+    for key, files in FONT_FILES.items():
+        if not family.startswith(key): continue
+        for folder in FONT_DIRS:
+            path = os.path.join(folder, files[1 if bold else 0])
+            if os.path.exists(path): return path
+    return None
+
+
+def _base14(name, bold):
+    serif = any(k in name.lower() for k in ("times", "cambria", "georgia", "serif"))
+    if serif: return "tibo" if bold else "tiro"
+    return "hebo" if bold else "helv"
+
+
+def _find_fields(doc):
+    """Posición y estilo de cada marcador; TemplateError si falta alguno"""
+    fields = []
+    for field in FIELDS:
+        hits = []
+        for page in doc:
+            for needle in (f"{{{{ {field} }}}}", f"{{{{{field}}}}}"):
+                rects = page.search_for(needle)
+                if rects:
+                    hits += [_describe(page, field, rect) for rect in rects]
+                    break
+        if not hits: raise TemplateError(f"La plantilla PDF no tiene el marcador {{{{ {field} }}}}")
+        fields += hits
+    return fields
+
+
+def _describe(page, field, rect):
+    """Fuente, tamaño, color y renglón base del texto que está en rect"""
+    span = None
+    for block in page.get_text("dict", clip=rect)["blocks"]:
+        for line in block.get("lines", []):
+            for s in line["spans"]:
+                if s["text"].strip(): span = s; break
+            if span: break
+        if span: break
+    span = span or {"font": "Helvetica", "size": rect.height * 0.8, "color": 0, "flags": 0,
+                    "origin": (rect.x0, rect.y1 - rect.height * 0.2)}
+    bold = bool(span["flags"] & 16) or "bold" in span["font"].lower()
+    color = span["color"]
+    return {
+        "field": field, "page": page.number, "rect": tuple(rect), "room": _room(page, rect),
+        "x": rect.x0, "baseline": span["origin"][1], "size": span["size"],
+        "color": ((color >> 16) / 255, ((color >> 8) & 0xFF) / 255, (color & 0xFF) / 255),
+        "fontfile": _font_file(span["font"], bold), "base14": _base14(span["font"], bold),
+    }
+
+
+def _room(page, rect):
+    """Ancho libre desde el marcador hasta la siguiente palabra del renglón (o el margen)"""
+    right = None
+    for x0, y0, x1, y1, *_ in page.get_text("words"):
+        if y1 <= rect.y0 or y0 >= rect.y1: continue
+        if x0 >= rect.x1 - 0.5: right = x0 if right is None else min(right, x0)
+    if right is None:
+        right = max((b[2] for b in page.get_text("blocks") if b[1] <= rect.y0 and b[3] >= rect.y1), default=rect.x1)
+        return max(right, rect.x1) - rect.x0
+    return right - rect.x0 - (rect.y1 - rect.y0) * 0.25  # deja un espacio antes de la palabra
+
+
+def _template(pdf_path):
+    """Bytes y marcadores de la plantilla (se leen de nuevo solo si cambió el archivo)"""
+    import fitz
+    try:
+        sig = _signature(pdf_path)
+    except OSError as e:
+        raise TemplateError(f"No encuentro la plantilla PDF: {pdf_path}") from e
+    with _lock:
+        entry = _templates.get(pdf_path)
+    if entry is not None and entry[0] == sig: return entry[1], entry[2]
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        fields = _find_fields(doc)
+    with _lock:
+        _templates[pdf_path] = (sig, data, fields)
+    return data, fields
+
+
+_fonts = {}  # archivo -> fitz.Font (para medir el texto)
+
+
+def _text_width(text, spec, size):
+    import fitz
+    if spec["fontfile"]:
+        font = _fonts.get(spec["fontfile"])
+        if font is None: font = _fonts[spec["fontfile"]] = fitz.Font(fontfile=spec["fontfile"])
+        return font.text_length(text, fontsize=size)
+    return fitz.get_text_length(text, fontname=spec["base14"], fontsize=size)
+
+
+def render(pdf_template, ctx, out_path):
+    """Llena la plantilla PDF con ctx (mismas llaves que la plantilla DOCX) y guarda out_path"""
+    import fitz
+    data, fields = _template(pdf_template)
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        for spec in fields:
+            doc[spec["page"]].add_redact_annot(fitz.Rect(spec["rect"]), fill=False)
+        for page_no in {spec["page"] for spec in fields}:
+            doc[page_no].apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
+
+        for spec in fields:
+            text = str(ctx.get(spec["field"], ""))
+            if not text: continue
+            size = spec["size"]
+            width = _text_width(text, spec, size)
+            if width > spec["room"]:
+                size *= spec["room"] / width
+                if size < spec["size"] * MIN_FONT_SCALE:
+                    raise TemplateError(f"{spec['field']} no cabe en la plantilla PDF: {text}")
+            kwargs = {"fontname": "F" + spec["field"], "fontfile": spec["fontfile"]} if spec["fontfile"] \
+                else {"fontname": spec["base14"]}
+            doc[spec["page"]].insert_text((spec["x"], spec["baseline"]), text, fontsize=size,
+                                          color=spec["color"], **kwargs)
+
+        tmp = out_path + ".tmp"
+        doc.save(tmp, garbage=3, deflate=True)
+    os.replace(tmp, out_path)
+    return out_path
+
+
+if __name__ == "__main__":
+    # python constancia_pdf.py [plantilla.docx]: genera plantilla_constancia.pdf una vez
+    root = os.path.dirname(os.path.abspath(__file__))
+    docx = sys.argv[1] if len(sys.argv) > 1 else os.path.join(root, "plantilla_constancia.docx")
+    path = template_for(docx)
+    print(f"Plantilla PDF: {path} ({len(_template(path)[1])} marcadores)")
@@ -0,0 +1,183 @@
+# constancia_store.py
+# Constancias generadas, direccionadas por contenido.
+# Cada constancia se identifica por un hash de sus datos (ctx) + la versión de la
+# plantilla (hash del DOCX): pedir otra vez la misma constancia devuelve el PDF
+# que ya existe, sin volver a generarlo y sin otra entrada en el historial.
+#   Constancias_Generadas/Constancia_<matrícula>_<llave 12>.pdf
+# Los DOCX intermedios (camino Word) se borran al terminar la conversión.
+# Para lo generado antes de esto, sweep() junta los PDFs repetidos (mismo texto en
+# las mismas páginas), apunta el historial al que se queda y borra los DOCX sueltos:
+#   python constancia_store.py [--simular]      (con la app cerrada)
+# Este módulo no importa Qt.
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(ROOT, "Constancias_Generadas")
+TEMPLATE_DOCX = os.path.join(ROOT, "plantilla_constancia.docx")
+
+# Caracteres de la llave que van en el nombre del archivo
+KEY_CHARS = 12
+
+_versions = {}  # ruta de la plantilla -> ((mtime, tamaño), hash)
+
+
+def file_hash(path, chunk=1 << 20):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def template_version(path=TEMPLATE_DOCX):
+    """Hash de la plantilla; solo se recalcula si cambia el archivo ("" si no existe)"""
+    try: st = os.stat(path)
+    except OSError: return ""
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _versions.get(path)
+    if cached is None or cached[0] != sig:
+        cached = _versions[path] = (sig, file_hash(path))
+    return cached[1]
+
+
+def content_key(ctx, version):
+    raw = json.dumps({"ctx": {k: str(v) for k, v in ctx.items()}, "plantilla": version},
+                     sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def file_stem(ctx, template=TEMPLATE_DOCX):
+    """Nombre (sin extensión) de la constancia con esos datos y esa plantilla"""
+    return f"Constancia_{ctx['MATRICULA']}_{content_key(ctx, template_version(template))[:KEY_CHARS]}"
+
+
+def is_complete(pdf):
+    """El PDF existe y termina bien (una conversión cortada a la mitad no cuenta)"""
+    try:
+        size = os.path.getsize(pdf)
+        if size == 0: return False
+        with open(pdf, 'rb') as f:
+            f.seek(max(0, size - 1024))
+            return b"%%EOF" in f.read()
+    except OSError:
+        return False
+
+
+# --- LIMPIEZA DE LO YA GENERADO ---
+
+def _norm(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def fingerprint(pdf):
+    """Huella del contenido visible: tamaño y texto de cada página. Dos PDFs de la misma
+    constancia (aunque uno sea de Word y otro nativo, o de otra hora) dan la misma."""
+    try:
+        import fitz
+        h = hashlib.sha1()
+        with fitz.open(pdf) as doc:
+            for page in doc:
+                h.update(repr(tuple(round(v) for v in page.rect)).encode())
+                h.update(" ".join(page.get_text().split()).encode('utf-8'))
+        return "t:" + h.hexdigest()
+    except Exception:
+        return "b:" + file_hash(pdf)  # sin PyMuPDF o PDF dañado: solo copias exactas
+
+
+def sweep(students, constancia_name, out_dir=OUT_DIR, skip=(), dry_run=False):
+    """Quita constancias repetidas y DOCX intermedios de out_dir.
+    De cada grupo de PDFs iguales se queda el que está en el historial (el más reciente);
+    las entradas que apuntaban a los otros pasan a apuntar a ese, y si un alumno queda con
+    dos entradas del mismo PDF se deja una. skip: rutas que la cola todavía usa.
+    Devuelve el resumen; 'historial' indica si hay que guardar la base."""
+    report = {"pdfs": 0, "grupos": 0, "pdfs_borrados": 0, "docx_borrados": 0,
+              "bytes_liberados": 0, "entradas_unidas": 0, "historial": False}
+    if not os.path.isdir(out_dir): return report
+    skip = {_norm(p) for p in skip if p}
+    out_dir = os.path.abspath(out_dir)
+    names = [n for n in os.listdir(out_dir) if n.startswith("Constancia_")]
+    pdfs = [os.path.join(out_dir, n) for n in names if n.lower().endswith(".pdf")]
+    docxs = [os.path.join(out_dir, n) for n in names if n.lower().endswith(".docx")]
+
+    refs = {}  # ruta normalizada -> [entrada del historial]
+    for s in students:
+        for w in s.get('workshops', []):
+            if w.get('name') == constancia_name and w.get('pdf_path'):
+                refs.setdefault(_norm(w['pdf_path']), []).append(w)
+
+    def remove(path, kind):
+        report[kind] += 1
+        report["bytes_liberados"] += os.path.getsize(path)
+        if not dry_run: os.remove(path)
+
+    groups = {}
+    for pdf in pdfs:
+        if _norm(pdf) in skip: continue
+        groups.setdefault(fingerprint(pdf), []).append(pdf)
+    report["pdfs"] = len(pdfs)
+    for paths in groups.values():
+        if len(paths) < 2: continue
+        report["grupos"] += 1
+        keep = max(paths, key=lambda p: (_norm(p) in refs, os.path.getmtime(p)))
+        for pdf in paths:
+            if pdf == keep: continue
+            for w in refs.pop(_norm(pdf), []):
+                w['pdf_path'] = keep
+                refs.setdefault(_norm(keep), []).append(w)
+                report["historial"] = True
+            remove(pdf, "pdfs_borrados")
+
+    # Entradas repetidas del mismo PDF en un alumno: se queda la primera
+    for s in students:
+        seen, kept = set(), []
+        for w in s.get('workshops', []):
+            if w.get('name') == constancia_name and w.get('pdf_path'):
+                key = _norm(w['pdf_path'])
+                if key in seen:
+                    report["entradas_unidas"] += 1
+                    continue
+                seen.add(key)
+            kept.append(w)
+        if len(kept) != len(s.get('workshops', [])):
+            s['workshops'] = kept
+            report["historial"] = True
+
+    # DOCX: solo eran el paso intermedio hacia el PDF
+    for docx in docxs:
+        if _norm(docx) not in skip and _norm(docx) not in refs:
+            remove(docx, "docx_borrados")
+    return report
+
+
+def describe(report):
+    return (f"PDFs revisados: {report['pdfs']} | grupos repetidos: {report['grupos']}"
+            f" | PDFs borrados: {report['pdfs_borrados']} | DOCX borrados: {report['docx_borrados']}"
+            f"\nEntradas del historial unidas: {report['entradas_unidas']}"
+            f" | espacio liberado: {report['bytes_liberados'] / 1024 / 1024:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Junta constancias repetidas y borra los DOCX intermedios")
+    parser.add_argument("--simular", action="store_true", help="solo mostrar lo que se borraría")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # DB_PATH es relativo a la carpeta de la app
+    from batch_constancias import CONSTANCIA_NAME
+    from database import StudentEngine
+    from job_queue import JobQueue
+    engine = StudentEngine()
+    queue = JobQueue()
+    # Lo que la cola todavía va a generar o registrar no se toca
+    skip = [j[k] for j in queue.to_render() for k in ("pdf", "docx")] + [r["pdf"] for r in queue.to_record()]
+    report = sweep(engine.students, CONSTANCIA_NAME, skip=skip, dry_run=args.simular)
+    if report["historial"] and not args.simular: engine.save()
+    print(("(simulación) " if args.simular else "") + describe(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,7 @@ from PySide6.QtCharts import QChart, QChartView, QPieSeries
 from PySide6.QtGui import QImage, QPixmap, QColor
 from PySide6.QtPdf import QPdfDocument
 from PySide6.QtPdfWidgets import QPdfView
+import pdf_cache
 
 
 # --- CONFIGURACIÓN DE DATOS ---
@@ -540,8 +541,6 @@ class TeschApp(QMainWindow):
         
         # Componente de visualización nativo de PySide6
         self.pdf_view = QPdfView()
-        self.pdf_document = QPdfDocument(self)
-        self.pdf_view.setDocument(self.pdf_document)
         self.pdf_view.setZoomMode(QPdfView.ZoomMode.FitToWidth)
         self.pdf_view.setPageMode(QPdfView.PageMode.MultiPage)
         
@@ -608,8 +607,8 @@ class TeschApp(QMainWindow):
             # Extraer solo el nombre del archivo para mostrarlo al usuario
             nombre_archivo = os.path.basename(path)
             
-            # Cargar el documento en el visor nativo
-            self.pdf_document.load(path)
+            # Cargar el documento en el visor nativo (caché compartida, ver pdf_cache.py)
+            pdf_cache.show(self.pdf_view, path)
             
             # Actualizar el expediente con el nombre del archivo seleccionado
             info_actual = self.det_info.text()
@@ -726,8 +725,6 @@ class TeschApp(QMainWindow):
         dp_ly = QVBoxLayout(self.doc_preview_container)
         
         self.doc_pdf_view = QPdfView()
-        self.doc_pdf_document = QPdfDocument(self)
-        self.doc_pdf_view.setDocument(self.doc_pdf_document)
         self.doc_pdf_view.setZoomMode(QPdfView.ZoomMode.FitToWidth)
         
         dp_ly.addWidget(self.doc_pdf_view)
@@ -772,7 +769,7 @@ class TeschApp(QMainWindow):
         """Carga el PDF seleccionado de la lista en el visor nativo"""
         pdf_path = item.data(Qt.UserRole)
         if pdf_path and os.path.exists(pdf_path):
-            self.doc_pdf_document.load(pdf_path)
+            pdf_cache.show(self.doc_pdf_view, pdf_path)
         else:
             QMessageBox.warning(self, "Error", "No se encuentra el archivo físico en la ruta guardada.")
 if __name__ == "__main__":
@@ -1,31 +1,186 @@
 # database.py
+import bisect
 import json
 import os
+import re
+import unicodedata
 from config import DB_PATH
+from profiler import profiler
+
+# Tamaño de bloque al leer database.json (para informar el avance)
+LOAD_CHUNK = 256 * 1024
+
+
+# Créditos necesarios para liberar (constancia final)
+CREDITS_GOAL = 5.0
+
+
+def student_credits(s):
+    """Créditos acumulados (talleres acreditados o entregados; los viejos valen 1.0)"""
+    total = 0.0
+    for w in s.get('workshops', []):
+        if w.get('status') in ['Acreditado', 'Entregado']:
+            try: total += float(w.get('value', 1.0))
+            except: total += 1.0
+    return total
+
+
+def _semester(s):
+    try: return int(s.get('semestre', 0))
+    except (TypeError, ValueError): return 0
+
+
+# --- ÍNDICES DE BÚSQUEDA ---
+_WORD = re.compile(r"[A-Z0-9]+")
+
+
+def fold(text):
+    """Sin acentos y en mayúsculas, para comparar nombres escritos de distintas formas"""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    return "".join(c for c in text if not unicodedata.combining(c)).upper()
+
+
+def fold_words(text):
+    """Palabras y números del texto, sin acentos y en mayúsculas ('José-Ángel 3' -> JOSE, ANGEL, 3)"""
+    return _WORD.findall(fold(text))
+
+
+def name_words(s):
+    """Palabras del nombre completo del alumno (sin acentos, de 2 letras o más)"""
+    full = f"{s.get('nombres', '')} {s.get('apellidoPaterno', '')} {s.get('apellidoMaterno', '')}"
+    return {w for w in fold_words(full) if len(w) > 1}
+
+
+# --- ÓRDENES DE LAS TABLAS ---
+# Llave de ordenamiento por columna. El motor guarda una permutación por llave
+# (índices de self.students) y la reutiliza en cada clic de encabezado.
+SORT_KEYS = {
+    "matricula": lambda s: str(s.get('matricula', '')),
+    "nombre": lambda s: f"{s.get('nombres','')} {s.get('apellidoPaterno','')} {s.get('apellidoMaterno','')}".lower(),
+    "carrera": lambda s: str(s.get('career', '')).upper(),
+    "semestre": _semester,
+    "creditos": student_credits,
+}
+
+# Llaves que cambian al editar talleres; se recalculan después de save()
+VOLATILE_KEYS = ("creditos",)
 
 class StudentEngine:
-    def __init__(self):
-        self.students = self._load()
+    def __init__(self, autoload=True):
+        # autoload=False deja el motor vacío para cargarlo después en segundo plano
+        self.students = self._load() if autoload else []
+        self.loaded = autoload
+        self._orders = {}  # llave -> (valores ordenados, índices)
+        self._indexes = None  # (matrícula -> alumno, palabra del nombre -> [alumnos]); ver indexes()
 
-    def _load(self):
+    def _load(self, progress=None):
         if os.path.exists(DB_PATH):
             try:
-                with open(DB_PATH, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with profiler.span("engine.load", "db"):
+                    return self._read(progress)
             except: return []
         return []
 
+    def _read(self, progress):
+        """Lee el JSON por bloques; progress(bytes_leidos, bytes_totales, registros)"""
+        total = os.path.getsize(DB_PATH)
+        chunks = []; read = 0
+        with open(DB_PATH, 'rb') as f:
+            while True:
+                chunk = f.read(LOAD_CHUNK)
+                if not chunk: break
+                chunks.append(chunk); read += len(chunk)
+                if progress: progress(read, total, 0)
+        text = b''.join(chunks).decode('utf-8')
+        if not progress or not text.lstrip().startswith('['):
+            return json.loads(text)
+
+        # Decodificar registro por registro para poder informar cuántos van
+        decoder = json.JSONDecoder()
+        records = []
+        idx = text.index('[') + 1; n = len(text)
+        while True:
+            while idx < n and text[idx] in ' \t\r\n,': idx += 1
+            if idx >= n or text[idx] == ']': break
+            obj, idx = decoder.raw_decode(text, idx)
+            records.append(obj)
+            if len(records) % 100 == 0: progress(total, total, len(records))
+        progress(total, total, len(records))
+        return records
+
+    def load(self, progress=None):
+        """Lee database.json sin tocar self.students (se puede llamar desde otro hilo)"""
+        return self._load(progress)
+
+    def set_students(self, students):
+        """Instala los registros ya cargados (llamar desde el hilo de la GUI)"""
+        self.students = students
+        self.loaded = True
+        self._orders = {}
+        self._indexes = None
+
     def save(self):
-        with open(DB_PATH, 'w', encoding='utf-8') as f:
+        # Los créditos solo cambian al editar talleres, y eso siempre termina en save()
+        for key in VOLATILE_KEYS: self._orders.pop(key, None)
+        self._indexes = None
+        self._write()
+
+    def _write(self):
+        with profiler.span("engine.save", "db"), open(DB_PATH, 'w', encoding='utf-8') as f:
             json.dump(self.students, f, indent=4, ensure_ascii=False)
 
+    def find(self, matricula):
+        """El registro del alumno en self.students (las listas de Qt guardan copias)"""
+        mat = str(matricula)
+        return next((s for s in self.students if str(s.get('matricula')) == mat), None)
+
+    def indexes(self):
+        """(matrícula -> alumno, palabra del nombre -> [alumnos]); se arma una vez por carga"""
+        if self._indexes is None:
+            with profiler.span("engine.indices", "db"):
+                by_mat, by_word = {}, {}
+                for s in self.students:
+                    by_mat[str(s.get('matricula', '')).strip().upper()] = s
+                    for w in name_words(s): by_word.setdefault(w, []).append(s)
+                self._indexes = (by_mat, by_word)
+        return self._indexes
+
     def add_student(self, data):
         if any(s['matricula'] == data['matricula'] for s in self.students):
             return False
         self.students.append(data)
-        self.save()
+        self._insert_in_orders(len(self.students) - 1)
+        self._indexes = None
+        self._write()
         return True
 
+    # --- ORDEN Y PAGINACIÓN ---
+    def sort_order(self, key):
+        """Permutación de índices ordenada por la llave (se calcula una vez y se guarda)"""
+        if key not in self._orders:
+            with profiler.span(f"engine.ordenar {key}", "db"):
+                fn = SORT_KEYS[key]
+                values = [fn(s) for s in self.students]
+                idx = sorted(range(len(values)), key=values.__getitem__)
+                self._orders[key] = ([values[i] for i in idx], idx)
+        return self._orders[key][1]
+
+    def _insert_in_orders(self, i):
+        """Coloca un alumno nuevo en cada permutación ya calculada (búsqueda binaria)"""
+        s = self.students[i]
+        for key, (values, idx) in self._orders.items():
+            value = SORT_KEYS[key](s)
+            pos = bisect.bisect_right(values, value)
+            values.insert(pos, value); idx.insert(pos, i)
+
+    def query(self, match=None, sort=None, descending=False):
+        """Alumnos que cumplen match(s), en el orden pedido (la vista los pinta por páginas)"""
+        order = self.sort_order(sort) if sort else range(len(self.students))
+        if descending: order = reversed(order)
+        st = self.students
+        if match is None: return [st[i] for i in order]
+        return [st[i] for i in order if match(st[i])]
+
     def get_stats(self):
         stats = {"total": len(self.students), "cursando": 0, "accredited": 0, "ready": 0, "byCareer": {}, "byWorkshop": {}}
         for s in self.students:
@@ -0,0 +1,152 @@
+# evidence_ingest.py
+# Revisión y optimización de evidencias antes de guardarlas (PyMuPDF).
+# ingest() corre en los procesos hijos de workers.process_pool("evidencias"):
+#   1. valida: que abra, que no pida contraseña, que tenga páginas y que el contenido
+#      de cada página se pueda leer (si PyMuPDF tuvo que repararlo se anota)
+#   2. optimiza: baja a TARGET_DPI las imágenes que pasan de MAX_DPI (fotos de
+#      celular) y guarda con garbage + deflate; si no gana nada se queda el original
+#   3. guarda en el almacén por contenido (evidence_store.put)
+#   4. devuelve los metadatos que se anotan en el taller (META_KEYS) y, además del hash de
+#      lo guardado, el del archivo tal como se subió (sha256_original): el mismo escaneo
+#      optimizado con otra versión de PyMuPDF (o guardado antes sin optimizar) da otro
+#      sha256, pero el original sigue siendo el mismo
+# Sin GUI, para muchos archivos a la vez (usa todos los núcleos):
+#   python evidence_ingest.py archivo.pdf [...] [--workers N] [--sin-guardar]
+# Este módulo no importa Qt.
+import argparse
+import os
+import sys
+import time
+import uuid
+
+import evidence_store
+
+# Imágenes por encima de MAX_DPI (en la página) se re-muestrean a TARGET_DPI
+MAX_DPI = 200
+TARGET_DPI = 150
+JPEG_QUALITY = 75
+
+# Si el optimizado no baja al menos esta fracción, se guarda el original tal cual
+MIN_GAIN = 0.05
+
+# Lo que se anota en la entrada del taller
+META_KEYS = ("pages", "size", "original_size", "page_format", "optimized", "repaired")
+
+# Formatos conocidos (mm, vertical) para describir la página
+FORMATS = {"Carta": (215.9, 279.4), "Oficio": (215.9, 340.4), "A4": (210.0, 297.0), "A5": (148.0, 210.0)}
+
+
+def failed(src, error):
+    return {"ok": False, "origen": src, "error": error, "ruta": "", "sha256": "", "sha256_original": "",
+            "nuevo": False, "meta": {}, "ms": 0.0}
+
+
+def page_format(rect):
+    w, h = sorted((rect.width * 25.4 / 72, rect.height * 25.4 / 72))
+    for name, (fw, fh) in FORMATS.items():
+        if abs(w - fw) < 3 and abs(h - fh) < 3: return name
+    return f"{w:.0f}x{h:.0f} mm"
+
+
+def validate(doc):
+    """Mensaje de por qué no se acepta el PDF, o '' si está bien"""
+    if not doc.is_pdf: return "No es un PDF"
+    if doc.needs_pass: return "El PDF está protegido con contraseña"
+    if doc.page_count == 0: return "El PDF no tiene páginas"
+    for i in range(doc.page_count):
+        try:
+            page = doc.load_page(i)
+            for xref in page.get_contents(): doc.xref_stream(xref)
+        except Exception as e:
+            return f"La página {i + 1} está dañada ({e})"
+    return ""
+
+
+def optimize(doc, out_path):
+    """Re-muestrea imágenes grandes y guarda comprimido en out_path"""
+    if hasattr(doc, "rewrite_images"):
+        doc.rewrite_images(dpi_threshold=MAX_DPI, dpi_target=TARGET_DPI, quality=JPEG_QUALITY)
+    # no_new_id: el mismo archivo optimizado dos veces da los mismos bytes (y el mismo hash)
+    doc.save(out_path, garbage=3, deflate=True, deflate_images=True, deflate_fonts=True, no_new_id=True)
+
+
+def ingest(src, store=True):
+    """Valida, optimiza y (con store) guarda src en el almacén. Corre en un proceso hijo."""
+    t0 = time.perf_counter()
+    try:
+        import fitz
+    except ImportError:
+        return failed(src, "Falta PyMuPDF para revisar el PDF")
+    try:
+        original_size = os.path.getsize(src)
+        doc = fitz.open(src)
+    except Exception as e:
+        return failed(src, f"El PDF no se puede abrir ({e})")
+
+    tmp = os.path.join(evidence_store.TMP_DIR, f"{uuid.uuid4().hex}.pdf")
+    try:
+        error = validate(doc)
+        if error: return failed(src, error)
+        meta = {"pages": doc.page_count, "original_size": original_size,
+                "page_format": page_format(doc[0].rect), "repaired": bool(doc.is_repaired)}
+
+        os.makedirs(evidence_store.TMP_DIR, exist_ok=True)
+        optimize(doc, tmp)
+        doc.close()
+        # Se queda el optimizado si de verdad es más chico (o si hubo que repararlo)
+        use = tmp if meta["repaired"] or os.path.getsize(tmp) < original_size * (1 - MIN_GAIN) else src
+        meta["optimized"] = use == tmp
+        meta["size"] = os.path.getsize(use)
+
+        result = {"ok": True, "origen": src, "error": "", "ruta": "", "sha256": "",
+                  "sha256_original": evidence_store.file_sha256(src), "nuevo": False, "meta": meta}
+        if store:
+            stored = evidence_store.put(use)
+            result.update(ruta=stored["ruta"], sha256=stored["sha256"], nuevo=stored["nuevo"])
+        result["ms"] = (time.perf_counter() - t0) * 1000
+        return result
+    except Exception as e:
+        return failed(src, str(e) or type(e).__name__)
+    finally:
+        if not doc.is_closed: doc.close()
+        if os.path.exists(tmp): os.remove(tmp)
+
+
+def describe(meta):
+    """Una línea para el usuario: páginas, formato y cuánto se redujo"""
+    text = f"{meta['pages']} pág. · {meta['page_format']} · {meta['size'] / 1024 / 1024:.1f} MB"
+    if meta.get("optimized"):
+        text += f" (antes {meta['original_size'] / 1024 / 1024:.1f} MB)"
+    if meta.get("repaired"): text += " · reparado"
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Revisa y optimiza evidencias PDF en paralelo")
+    parser.add_argument("archivos", nargs="+")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por omisión, los núcleos)")
+    parser.add_argument("--sin-guardar", action="store_true", help="solo revisar y medir, sin copiar al almacén")
+    args = parser.parse_args()
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    t0 = time.perf_counter()
+    before = after = bad = 0
+    with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count(),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(ingest, os.path.abspath(p), not args.sin_guardar) for p in args.archivos]
+        for f in as_completed(futures):
+            r = f.result()
+            if not r["ok"]:
+                bad += 1
+                print(f"RECHAZADO  {r['origen']}: {r['error']}")
+                continue
+            before += r["meta"]["original_size"]; after += r["meta"]["size"]
+            print(f"OK  {r['origen']}: {describe(r['meta'])}" + (f" -> {r['ruta']}" if r["ruta"] else ""))
+    print(f"{len(args.archivos)} archivos en {time.perf_counter() - t0:.1f} s | rechazados: {bad}"
+          f" | {before / 1024 / 1024:.1f} MB -> {after / 1024 / 1024:.1f} MB")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
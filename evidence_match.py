@@ -0,0 +1,168 @@
+# evidence_match.py
+# Carga masiva de evidencias: a qué alumno pertenece cada PDF de una carpeta.
+#   extract() corre en los procesos hijos (workers.EvidenceScan): junta las palabras
+#             y números del nombre del archivo y del texto de las primeras páginas
+#   match()   corre en la GUI contra los índices del motor (StudentEngine.indexes):
+#             una sola matrícula conocida, o el nombre completo de un solo alumno
+# Solo las coincidencias seguras se proponen marcadas; el resto queda para revisar.
+#   python evidence_match.py <carpeta>     muestra qué alumno se propone para cada PDF
+# Este módulo no importa Qt.
+import argparse
+import os
+import re
+import sys
+
+from database import fold, fold_words, name_words
+
+# Páginas que se leen de cada PDF (la matrícula y el nombre van al principio)
+TEXT_PAGES = 2
+
+# Caracteres del texto normalizado que se devuelven para buscar el nombre completo en orden
+PHRASE_CHARS = 20000
+
+# Subcarpeta a donde se mueven los archivos ya registrados
+DONE_DIR = "Procesados"
+
+_DIGITS = re.compile(r"\d+")
+
+# Resultado de match()
+SURE_MAT = "Matrícula"
+SURE_NAME = "Nombre completo"
+CONFLICT = "La matrícula y el nombre no coinciden"
+MANY_MATS = "Varias matrículas"
+MANY_NAMES = "Nombre de varios alumnos"
+LOOSE_NAME = "Palabras del nombre sueltas"
+NO_MATCH = "Sin coincidencia"
+
+
+def pending_files(folder):
+    """PDFs de la carpeta (sin subcarpetas, así Procesados no se vuelve a leer)"""
+    try: names = sorted(os.listdir(folder))
+    except OSError: return []
+    return [os.path.join(folder, n) for n in names
+            if n.lower().endswith(".pdf") and os.path.isfile(os.path.join(folder, n))]
+
+
+def words(text):
+    """Palabras y números sueltos (también los que vienen pegados a letras: MAT202100081)"""
+    return set(fold_words(text)) | set(_DIGITS.findall(fold(text)))
+
+
+def phrase(text):
+    """Texto en una sola línea de palabras sin acentos ('ELENA LOPEZ PEREZ')"""
+    return " ".join(fold_words(text))
+
+
+def full_name(s):
+    return phrase(f"{s.get('nombres', '')} {s.get('apellidoPaterno', '')} {s.get('apellidoMaterno', '')}")
+
+
+def extract(path):
+    """Palabras del nombre del archivo y del texto del PDF. Corre en un proceso hijo."""
+    text = os.path.splitext(os.path.basename(path))[0]
+    result = {"ruta": path, "palabras": [], "frase": "", "texto": False, "error": ""}
+    try:
+        import fitz
+        with fitz.open(path) as doc:
+            if doc.needs_pass: raise ValueError("protegido con contraseña")
+            body = " ".join(doc[i].get_text() for i in range(min(TEXT_PAGES, doc.page_count)))
+        result["texto"] = bool(body.strip())
+        text += " " + body
+    except Exception as e:
+        result["error"] = f"No se pudo leer el PDF ({e})"
+    result["palabras"] = sorted(words(text))
+    result["frase"] = f" {phrase(text)[:PHRASE_CHARS]} "
+    return result
+
+
+def match(found, indexes):
+    """{alumno, motivo, seguro, candidatos} para las palabras de extract().
+    Un PDF que no se pudo leer nunca se propone como seguro."""
+    result = _match(found, indexes)
+    if found.get("error") and result["seguro"]:
+        result.update(seguro=False, motivo=found["error"])
+    return result
+
+
+def _match(found, indexes):
+    by_mat, by_word = indexes
+    tokens = set(found["palabras"])
+    mats = {id(by_mat[t]): by_mat[t] for t in sorted(tokens) if t in by_mat}
+
+    # Alumnos cuyo nombre completo (al menos nombre y un apellido) aparece en el archivo
+    hits, students = {}, {}
+    for t in tokens:
+        for s in by_word.get(t, ()):
+            hits[id(s)] = hits.get(id(s), 0) + 1; students[id(s)] = s
+    by_name = {}
+    for key, n in hits.items():
+        need = len(name_words(students[key]))
+        if need >= 2 and n >= need: by_name[key] = students[key]
+
+    if len(mats) == 1:
+        (key, s), = mats.items()
+        if by_name and key not in by_name:
+            return {"alumno": s, "motivo": CONFLICT, "seguro": False, "candidatos": [s] + list(by_name.values())}
+        return {"alumno": s, "motivo": SURE_MAT, "seguro": True, "candidatos": [s]}
+    if len(mats) > 1:
+        both = [s for key, s in mats.items() if key in by_name]
+        if len(both) == 1:
+            return {"alumno": both[0], "motivo": SURE_MAT, "seguro": True, "candidatos": both}
+        return {"alumno": None, "motivo": MANY_MATS, "seguro": False, "candidatos": list(mats.values())}
+    if len(by_name) > 1:
+        # Mismas palabras en distinto orden (LOPEZ PEREZ / PEREZ LOPEZ): vale el nombre escrito tal cual
+        exact = [s for s in by_name.values() if f" {full_name(s)} " in found.get("frase", "")]
+        if len(exact) == 1: by_name = {id(exact[0]): exact[0]}
+    if len(by_name) == 1:
+        s, = by_name.values()
+        # Nombre y un apellido sueltos pueden ser de quien firma o imparte: solo se propone
+        # marcado si el nombre completo aparece tal cual o tiene al menos tres palabras
+        if f" {full_name(s)} " in found.get("frase", "") or len(name_words(s)) >= 3:
+            return {"alumno": s, "motivo": SURE_NAME, "seguro": True, "candidatos": [s]}
+        return {"alumno": s, "motivo": LOOSE_NAME, "seguro": False, "candidatos": [s]}
+    if by_name:
+        return {"alumno": None, "motivo": MANY_NAMES, "seguro": False, "candidatos": list(by_name.values())}
+    return {"alumno": None, "motivo": NO_MATCH, "seguro": False, "candidatos": []}
+
+
+def move_done(path):
+    """Mueve un archivo ya registrado a <carpeta>/Procesados (sin pisar otro del mismo nombre)"""
+    folder = os.path.join(os.path.dirname(path), DONE_DIR)
+    os.makedirs(folder, exist_ok=True)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    dest, n = os.path.join(folder, stem + ext), 1
+    while os.path.exists(dest):
+        n += 1; dest = os.path.join(folder, f"{stem}_{n}{ext}")
+    os.replace(path, dest)
+    return dest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Propone el alumno de cada evidencia de una carpeta")
+    parser.add_argument("carpeta")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from database import StudentEngine
+    files = pending_files(os.path.abspath(args.carpeta))
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))  # DB_PATH es relativo a la carpeta de la app
+    engine = StudentEngine()
+    indexes = engine.indexes()
+    sure = 0
+    with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count(),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        for found in pool.map(extract, files, chunksize=4):
+            m = match(found, indexes)
+            sure += m["seguro"]
+            who = f"{m['alumno']['matricula']} {m['alumno'].get('nombres', '')} {m['alumno'].get('apellidoPaterno', '')}" \
+                if m["alumno"] else ", ".join(str(s.get('matricula')) for s in m["candidatos"][:5])
+            print(f"{'OK ' if m['seguro'] else '?? '} {os.path.basename(found['ruta'])}: {m['motivo']} | {who}"
+                  + (f" | {found['error']}" if found["error"] and found["error"] != m["motivo"] else ""))
+    print(f"{len(files)} archivos | seguros: {sure} | por revisar: {len(files) - sure}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
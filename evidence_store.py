@@ -0,0 +1,224 @@
+# evidence_store.py
+# Almacén de evidencias (PDFs de créditos) direccionado por contenido.
+# Cada archivo se guarda una sola vez con el nombre de su SHA-256, repartido en
+# subcarpetas por los primeros caracteres del hash para que ninguna carpeta junte
+# cientos de miles de archivos:
+#   Evidencias_Creditos/3f/a2/3fa2....pdf
+# Subir el mismo escaneo otra vez no ocupa más espacio, y si ya es evidencia de OTRO
+# alumno se avisa (posible fraude). La copia va por bloques (calculando el hash al
+# mismo tiempo) a un temporal; se verifica y luego se renombra: nunca queda un
+# archivo a medias con nombre de hash.
+#   python evidence_store.py --duplicados     evidencias compartidas entre alumnos
+#   python evidence_store.py --migrar         pasa las evidencias viejas (planas) al almacén
+#   python evidence_store.py --verificar      recalcula el hash de todo el almacén
+# Este módulo no importa Qt.
+import argparse
+import hashlib
+import os
+import re
+import sys
+import uuid
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(ROOT, "Evidencias_Creditos")
+TMP_DIR = os.path.join(STORE_DIR, ".tmp")
+
+# Bloque de lectura / escritura
+CHUNK = 1 << 20
+
+# Niveles de subcarpetas y caracteres del hash por nivel (3f/a2/...)
+FANOUT = (2, 2)
+
+_STORED = re.compile(r"^[0-9a-f]{64}$")
+
+
+class EvidenceError(Exception):
+    """La copia no coincide con el original (disco lleno, unidad de red, archivo cambiando)"""
+
+
+def file_sha256(path, progress=None):
+    h = hashlib.sha256()
+    done = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK), b""):
+            h.update(block)
+            done += len(block)
+            if progress: progress(done)
+    return h.hexdigest()
+
+
+def object_path(digest, ext=".pdf"):
+    parts, pos = [], 0
+    for width in FANOUT:
+        parts.append(digest[pos:pos + width]); pos += width
+    return os.path.join(STORE_DIR, *parts, digest + ext)
+
+
+def stored_digest(path):
+    """Hash de un archivo del almacén según su nombre (None si es una ruta de fuera / vieja)"""
+    if not path: return None
+    name = os.path.splitext(os.path.basename(path))[0]
+    if not _STORED.match(name): return None
+    return name if os.path.normcase(os.path.abspath(path)) == os.path.normcase(object_path(name, os.path.splitext(path)[1])) else None
+
+
+def put(src, progress=None):
+    """Copia src al almacén (si no estaba) y devuelve {ruta, sha256, bytes, nuevo}.
+    progress(bytes_copiados, total). Lanza EvidenceError si la copia no se verifica."""
+    total = os.path.getsize(src)
+    ext = os.path.splitext(src)[1].lower() or ".pdf"
+    os.makedirs(TMP_DIR, exist_ok=True)
+    tmp = os.path.join(TMP_DIR, uuid.uuid4().hex + ext)
+    h = hashlib.sha256()
+    done = 0
+    try:
+        with open(src, 'rb') as fin, open(tmp, 'wb') as fout:
+            for block in iter(lambda: fin.read(CHUNK), b""):
+                h.update(block)
+                fout.write(block)
+                done += len(block)
+                if progress: progress(done, total)
+            fout.flush()
+            os.fsync(fout.fileno())
+        digest = h.hexdigest()
+        dest = object_path(digest, ext)
+        if os.path.exists(dest):
+            return {"ruta": dest, "sha256": digest, "bytes": done, "nuevo": False}
+        # Lo que quedó en disco es lo que se leyó
+        if file_sha256(tmp) != digest:
+            raise EvidenceError(f"La copia de {os.path.basename(src)} no coincide con el original")
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        os.replace(tmp, dest)
+        return {"ruta": dest, "sha256": digest, "bytes": done, "nuevo": True}
+    finally:
+        if os.path.exists(tmp): os.remove(tmp)
+
+
+def verify(path):
+    """El archivo del almacén sigue teniendo el hash de su nombre"""
+    digest = stored_digest(path)
+    try:
+        return digest is not None and file_sha256(path) == digest
+    except OSError:
+        return False
+
+
+def entry_digest(entry):
+    return entry.get('sha256') or stored_digest(entry.get('pdf_path'))
+
+
+def entry_digests(entry):
+    """Hashes con que se reconoce una evidencia: el del archivo guardado y el del original
+    que se subió (evidence_ingest guarda la versión optimizada)"""
+    return {d for d in (entry_digest(entry), entry.get('sha256_original')) if d}
+
+
+def usage(students):
+    """hash -> [(alumno, entrada)] de todas las evidencias con hash conocido"""
+    out = {}
+    for s in students:
+        for w in s.get('workshops', []):
+            for digest in entry_digests(w): out.setdefault(digest, []).append((s, w))
+    return out
+
+
+def used_by(students, *digests):
+    """Quién usa ya esa evidencia (por cualquiera de sus hashes): [(alumno, entrada)]"""
+    digests = {d for d in digests if d}
+    return [(s, w) for s in students for w in s.get('workshops', []) if entry_digests(w) & digests]
+
+
+def duplicates(students):
+    """Evidencias usadas por más de un alumno (la misma constancia escaneada para varios)"""
+    report, seen = [], set()
+    for digest, users in usage(students).items():
+        if len({str(s.get('matricula')) for s, _ in users}) < 2: continue
+        # Las que se encuentran por el hash guardado y por el original se informan una vez
+        key = frozenset(id(w) for _, w in users)
+        if key in seen: continue
+        seen.add(key)
+        report.append({"sha256": digest, "ruta": users[0][1].get('pdf_path'), "alumnos": [
+            {"matricula": s.get('matricula'), "nombre": f"{s.get('nombres', '')} {s.get('apellidoPaterno', '')}".strip(),
+             "taller": w.get('name'), "fecha": w.get('date', '')} for s, w in users]})
+    return sorted(report, key=lambda r: -len(r["alumnos"]))
+
+
+def migrate(students, progress=None):
+    """Pasa al almacén las evidencias que aún están fuera (Evidencias_Creditos/<mat>_<fecha>.pdf).
+    Actualiza pdf_path y sha256 de las entradas; borra el archivo viejo solo si estaba en la
+    carpeta de evidencias. Devuelve el resumen ('cambios' = hay que guardar la base)."""
+    report = {"archivos": 0, "repetidos": 0, "faltantes": 0, "bytes_liberados": 0, "cambios": False}
+    pending = [w for s in students for w in s.get('workshops', [])
+               if w.get('pdf_path') and w.get('name') and not stored_digest(w['pdf_path'])
+               and os.path.normcase(os.path.dirname(os.path.abspath(w['pdf_path']))) == os.path.normcase(STORE_DIR)]
+    moved = {}  # ruta vieja -> resultado de put
+    for i, w in enumerate(pending):
+        old = w['pdf_path']
+        if old not in moved:
+            if not os.path.exists(old):
+                report["faltantes"] += 1; continue
+            moved[old] = put(old)
+            report["archivos"] += 1
+            if not moved[old]["nuevo"]:
+                report["repetidos"] += 1
+                report["bytes_liberados"] += moved[old]["bytes"]
+        w['pdf_path'], w['sha256'] = moved[old]["ruta"], moved[old]["sha256"]
+        report["cambios"] = True
+        if progress: progress(i + 1, len(pending))
+    return report, list(moved)
+
+
+def verify_all(progress=None):
+    """Recalcula el hash de cada archivo del almacén; devuelve los que no coinciden"""
+    paths = []
+    for folder, dirs, files in os.walk(STORE_DIR):
+        dirs[:] = [d for d in dirs if d != ".tmp"]
+        paths += [os.path.join(folder, f) for f in files if stored_digest(os.path.join(folder, f))]
+    bad = []
+    for i, path in enumerate(paths):
+        if not verify(path): bad.append(path)
+        if progress: progress(i + 1, len(paths))
+    return paths, bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Almacén de evidencias por contenido")
+    parser.add_argument("--duplicados", action="store_true", help="evidencias usadas por varios alumnos")
+    parser.add_argument("--migrar", action="store_true", help="pasar las evidencias viejas al almacén")
+    parser.add_argument("--verificar", action="store_true", help="recalcular el hash de todo el almacén")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # DB_PATH es relativo a la carpeta de la app
+    from database import StudentEngine
+    engine = StudentEngine()
+    status = 0
+
+    if args.migrar:
+        report, old_files = migrate(engine.students, lambda d, t: print(f"\r[{d}/{t}]", end="", flush=True))
+        print()
+        if report["cambios"]: engine.save()
+        # Los originales se borran después de guardar la base con las rutas nuevas
+        for path in old_files:
+            try: os.remove(path)
+            except OSError: pass
+        print(f"Migradas: {report['archivos']} | repetidas: {report['repetidos']} | faltantes: {report['faltantes']}"
+              f" | liberado: {report['bytes_liberados'] / 1024 / 1024:.1f} MB")
+
+    if args.verificar:
+        paths, bad = verify_all()
+        print(f"Verificadas: {len(paths)} | dañadas: {len(bad)}")
+        for path in bad: print(f"  {path}")
+        status = 1 if bad else status
+
+    if args.duplicados or not (args.migrar or args.verificar):
+        report = duplicates(engine.students)
+        print(f"Evidencias compartidas entre alumnos: {len(report)}")
+        for r in report:
+            print(f"  {r['sha256'][:12]}  {r['ruta']}")
+            for a in r["alumnos"]:
+                print(f"      {a['matricula']}  {a['nombre']}  {a['taller']}  {a['fecha']}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+# file_integrity.py
+# Revisión de los archivos que referencia la base (pdf_path de cada taller y photo_path)
+# e índice para reubicarlos cuando cambian de lugar (rutas como "C:/Users/.../Downloads").
+#   scan()      revisa todas las rutas en paralelo (hilos: el cuello de botella es el disco
+#               o la red) y cataloga los archivos de las carpetas de búsqueda por nombre y
+#               SHA-256; todo queda en INDEX_PATH y la siguiente revisión solo vuelve a leer
+#               lo que cambió de tamaño o fecha
+#   relocate()  una fila por referencia: si está rota, propone la ruta nueva por contenido
+#               (sha256 de la evidencia) o por nombre de archivo (y carpetas del final)
+#   apply()     cambia las rutas en los alumnos (quien llama guarda la base una sola vez)
+# file_status lee el estado guardado para que la GUI no revise el disco en cada vista.
+#   python file_integrity.py [--buscar-en CARPETA ...] [--reubicar] [--informe archivo.csv]
+# Este módulo no importa Qt.
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import evidence_store
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(ROOT, "indice_archivos.json")
+# Solo el estado de las referencias (sin el catálogo): lo lee file_status al cargar la base
+REFS_PATH = os.path.join(ROOT, "indice_referencias.json")
+
+# Carpetas que siempre se catalogan (las de la app); el usuario agrega más (--buscar-en)
+DEFAULT_ROOTS = (ROOT,)
+SKIP_DIRS = {".tmp", ".git", "__pycache__", "avatares", "Miniaturas", "Copias_Seguridad"}
+EXTS = {".pdf", ".jpg", ".jpeg", ".png"}
+
+# Hilos para stat / hash (E/S, no CPU)
+SCAN_THREADS = 16
+
+HASH_CHUNK = 1 << 20
+
+# PyMuPDF no se puede usar desde varios hilos a la vez
+_fitz_lock = threading.Lock()
+
+# Estados de relocate()
+OK = "ok"
+MOVABLE = "reubicable"
+AMBIGUOUS = "ambiguo"
+LOST = "perdido"
+
+REPORT_COLUMNS = ["matricula", "alumno", "tipo", "actividad", "ruta", "estado", "nueva_ruta", "motivo"]
+
+_SEP = re.compile(r"[\\/]+")
+
+
+def _parts(path):
+    """Carpetas y nombre de una ruta con / o \\ (las de Windows también se entienden aquí)"""
+    return [p.lower() for p in _SEP.split(str(path or "")) if p]
+
+
+def references(students):
+    """[(ruta, tipo, alumno, entrada)] de todas las evidencias y fotos con ruta"""
+    out = []
+    for s in students:
+        if s.get('photo_path'): out.append((s['photo_path'], "foto", s, None))
+        for w in s.get('workshops', []):
+            if w.get('pdf_path'): out.append((w['pdf_path'], "evidencia", s, w))
+    return out
+
+
+def load_index():
+    try:
+        with open(INDEX_PATH, encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("version") == 1: return index
+    except (OSError, ValueError):
+        pass
+    return {"version": 1, "roots": [], "refs": {}, "files": {}, "scanned_at": 0}
+
+
+def load_refs():
+    """{ruta: estado} de la última revisión, sin leer el catálogo completo"""
+    try:
+        with open(REFS_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return load_index()["refs"]  # revisión anterior a REFS_PATH
+
+
+def _dump(data, path):
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def save_index(index):
+    _dump(index, INDEX_PATH)
+    _dump(index["refs"], REFS_PATH)
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b""): h.update(block)
+    return h.hexdigest()
+
+
+def _pages(path):
+    if not path.lower().endswith(".pdf"): return None
+    try:
+        import fitz
+        with _fitz_lock, fitz.open(path) as doc: return doc.page_count
+    except Exception:
+        return None
+
+
+def _check_ref(path, old, now):
+    """Estado de una referencia; las páginas se reutilizan si no cambió el archivo"""
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return {"exists": False, "size": 0, "mtime": None, "pages": None, "scanned_at": now}
+    if old and old.get("exists") and old.get("size") == st.st_size and old.get("mtime") == st.st_mtime_ns:
+        return dict(old, scanned_at=now)
+    return {"exists": True, "size": st.st_size, "mtime": st.st_mtime_ns, "pages": _pages(path), "scanned_at": now}
+
+
+def _walk(roots):
+    """(ruta, stat) de los archivos de las carpetas de búsqueda"""
+    seen = set()
+    for root in roots:
+        for folder, dirs, files in os.walk(root):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for name in files:
+                if os.path.splitext(name)[1].lower() not in EXTS: continue
+                path = os.path.abspath(os.path.join(folder, name))
+                if path in seen: continue
+                seen.add(path)
+                try: yield path, os.stat(path)
+                except OSError: continue
+
+
+def _catalog_entry(path, st, old):
+    if old and old.get("size") == st.st_size and old.get("mtime") == st.st_mtime_ns:
+        return old
+    # En el almacén de evidencias el nombre ya es el hash: no hace falta leerlo
+    digest = evidence_store.stored_digest(path) or _sha256(path)
+    return {"size": st.st_size, "mtime": st.st_mtime_ns, "sha256": digest}
+
+
+def scan(paths, roots=(), progress=None, threads=SCAN_THREADS, cancelled=None):
+    """Revisa las rutas y cataloga las carpetas; guarda y devuelve el índice.
+    progress(etapa, hechos, total); cancelled() -> True para parar (devuelve None y no guarda)"""
+    index = load_index()
+    roots = list(dict.fromkeys(index["roots"] + [os.path.abspath(r) for r in roots]))
+    now = time.time()
+    paths = list(dict.fromkeys(paths))
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        old_refs = index["refs"]
+        refs = {}
+        for i, (path, info) in enumerate(zip(paths, pool.map(lambda p: _check_ref(p, old_refs.get(p), now), paths))):
+            refs[path] = info
+            if progress and (i % 50 == 0 or i + 1 == len(paths)): progress("Revisando referencias", i + 1, len(paths))
+            if cancelled and cancelled():
+                pool.shutdown(wait=False, cancel_futures=True); return None
+
+        found = list(_walk([r for r in DEFAULT_ROOTS + tuple(roots) if os.path.isdir(r)]))
+        old_files = index["files"]
+        files = {}
+        entries = pool.map(lambda item: _catalog_entry(item[0], item[1], old_files.get(item[0])), found)
+        for i, ((path, _), entry) in enumerate(zip(found, entries)):
+            files[path] = entry
+            if progress and (i % 50 == 0 or i + 1 == len(found)): progress("Catalogando carpetas", i + 1, len(found))
+            if cancelled and cancelled():
+                pool.shutdown(wait=False, cancel_futures=True); return None
+
+    index.update(roots=roots, refs=refs, files=files, scanned_at=now)
+    save_index(index)
+    return index
+
+
+def relocate(students, index):
+    """Una fila por referencia (ver REPORT_COLUMNS); las rotas traen la ruta propuesta"""
+    by_hash, by_name = {}, {}
+    for path, f in index["files"].items():
+        by_hash.setdefault(f["sha256"], path)
+        by_name.setdefault(_parts(path)[-1], []).append(path)
+
+    rows = []
+    for path, kind, s, entry in references(students):
+        row = {"matricula": str(s.get('matricula', '')),
+               "alumno": f"{s.get('nombres', '')} {s.get('apellidoPaterno', '')} {s.get('apellidoMaterno', '')}".strip(),
+               "tipo": kind, "actividad": entry.get('name', '') if entry else "", "ruta": path,
+               "estado": OK, "nueva_ruta": "", "motivo": "", "_alumno": s, "_entrada": entry, "_por_hash": False}
+        rows.append(row)
+        ref = index["refs"].get(path)
+        # Agregada después de la última revisión: se revisa antes de proponer otra ruta
+        if ref is None: ref = {"exists": os.path.exists(path)}
+        if ref["exists"]: continue
+
+        digests = evidence_store.entry_digests(entry) if entry else set()
+        found = next((by_hash[d] for d in sorted(digests) if d in by_hash), None)
+        if found:
+            row.update(estado=MOVABLE, nueva_ruta=found, motivo="mismo contenido (SHA-256)", _por_hash=True)
+            continue
+        parts = _parts(path)
+        candidates = by_name.get(parts[-1], []) if parts else []
+        if not candidates:
+            row.update(estado=LOST, motivo="no se encontró en las carpetas de búsqueda")
+            continue
+        if digests:
+            # Se sabe qué contenido tenía y ninguno coincide: el nombre no basta
+            row.update(estado=AMBIGUOUS, motivo="mismo nombre, contenido distinto")
+            continue
+        if len({index["files"][c]["sha256"] for c in candidates}) == 1:
+            row.update(estado=MOVABLE, nueva_ruta=candidates[0], motivo="mismo nombre de archivo")
+            continue
+        # Varios con el mismo nombre: gana el que comparte más carpetas del final de la ruta
+        def tail(c):
+            n = 0
+            for a, b in zip(reversed(_parts(c)), reversed(parts)):
+                if a != b: break
+                n += 1
+            return n
+        scores = sorted(((tail(c), c) for c in candidates), reverse=True)
+        if scores[0][0] > scores[1][0]:
+            row.update(estado=MOVABLE, nueva_ruta=scores[0][1], motivo="mismo nombre y carpeta")
+        else:
+            row.update(estado=AMBIGUOUS, motivo=f"{len(candidates)} archivos distintos con ese nombre")
+    return rows
+
+
+def summary(rows):
+    counts = {OK: 0, MOVABLE: 0, AMBIGUOUS: 0, LOST: 0}
+    for r in rows: counts[r["estado"]] += 1
+    return counts
+
+
+def apply(rows, index=None):
+    """Cambia a la ruta nueva las referencias reubicables. Devuelve cuántas cambió;
+    quien llama guarda la base (una sola escritura) y, si pasó el índice, save_index."""
+    changed = 0
+    for row in rows:
+        if row["estado"] != MOVABLE: continue
+        s, entry, new = row["_alumno"], row["_entrada"], row["nueva_ruta"]
+        if entry is None:
+            s['photo_path'] = new
+        else:
+            entry['pdf_path'] = new
+            # Solo se anota el hash si se encontró por contenido (por nombre podría ser otro archivo)
+            if index is not None and row["_por_hash"] and not entry.get('sha256'):
+                entry['sha256'] = index["files"][new]["sha256"]
+        if index is not None:
+            f = index["files"][new]
+            index["refs"][new] = {"exists": True, "size": f["size"], "mtime": f["mtime"],
+                                  "pages": _pages(new), "scanned_at": time.time()}
+        row.update(estado=OK, ruta=new, nueva_ruta="", motivo="reubicado")
+        changed += 1
+    return changed
+
+
+def write_report(rows, path):
+    """Informe CSV (se abre en Excel)"""
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def describe(counts):
+    return (f"Encontrados: {counts[OK]} | reubicables: {counts[MOVABLE]} | "
+            f"ambiguos: {counts[AMBIGUOUS]} | perdidos: {counts[LOST]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Revisa los archivos de la base y reubica los que se movieron")
+    parser.add_argument("--buscar-en", action="append", default=[], metavar="CARPETA",
+                        help="carpeta donde buscar los archivos movidos (se recuerda para la próxima)")
+    parser.add_argument("--reubicar", action="store_true", help="cambiar en la base las rutas reubicables")
+    parser.add_argument("--informe", metavar="CSV", help="guardar el informe completo")
+    args = parser.parse_args()
+
+    roots = [os.path.abspath(r) for r in args.buscar_en]
+    report_path = os.path.abspath(args.informe) if args.informe else None
+    os.chdir(ROOT)  # DB_PATH es relativo a la carpeta de la app
+    from database import StudentEngine
+    engine = StudentEngine()
+
+    t0 = time.perf_counter()
+    index = scan([p for p, *_ in references(engine.students)], roots,
+                 lambda stage, done, total: print(f"\r{stage}: {done}/{total}   ", end="", flush=True))
+    print(f"\nRevisión en {time.perf_counter() - t0:.1f} s | {len(index['files'])} archivos catalogados")
+    rows = relocate(engine.students, index)
+    print(describe(summary(rows)))
+    for r in rows:
+        if r["estado"] != OK:
+            print(f"  [{r['estado']}] {r['matricula']} {r['tipo']} {r['ruta']}" + (f" -> {r['nueva_ruta']}" if r["nueva_ruta"] else ""))
+
+    if args.reubicar:
+        changed = apply(rows, index)
+        if changed:
+            engine.save()
+            save_index(index)
+        print(f"Reubicadas: {changed}")
+    if report_path:
+        write_report(rows, report_path)
+        print(f"Informe: {report_path}")
+    return 0 if summary(rows)[LOST] + summary(rows)[AMBIGUOUS] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
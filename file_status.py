@@ -0,0 +1,116 @@
+# file_status.py
+# Estado de los archivos de evidencia (existe, tamaño, páginas).
+# check() hace el trabajo lento (stat en unidades de red, abrir el PDF) y se
+# llama desde el pool de workers.py; cached() es instantáneo y sirve para
+# pintar algo en la GUI antes de que llegue el resultado.
+# La caché se invalida sola: si cambia el mtime o el tamaño se vuelve a leer.
+# La última revisión completa (file_integrity.py) se carga junto con la base, en el
+# hilo de workers.DatabaseLoader: mientras sea reciente (SCAN_TTL) la GUI no vuelve a ir al disco.
+# content_hash() identifica un archivo por su contenido (miniaturas, duplicados).
+import hashlib
+import os
+import threading
+import time
+
+# Los archivos que no existen no tienen mtime; se vuelven a buscar pasado este tiempo
+MISSING_TTL = 60.0
+
+# Vigencia del estado que dejó la revisión de integridad (segundos)
+SCAN_TTL = 12 * 3600
+
+# Bloque de lectura al calcular hashes
+HASH_CHUNK = 1024 * 1024
+
+_cache = {}  # ruta -> info
+_hashes = {}  # ruta -> (mtime, tamaño, sha1)
+_lock = threading.Lock()
+
+
+def _page_count(path):
+    try:
+        from PySide6.QtPdf import QPdfDocument
+    except ImportError:
+        return None
+    doc = QPdfDocument()
+    try:
+        if doc.load(path) != QPdfDocument.Error.None_: return None
+        return doc.pageCount()
+    finally:
+        doc.close()
+
+
+def load_scan(index=None):
+    """Llena la caché con el resultado de file_integrity.scan (el guardado si no se pasa;
+    lee disco: llamar fuera del hilo de la GUI)"""
+    if index is None:
+        import file_integrity
+        refs = file_integrity.load_refs()
+    else:
+        refs = index.get("refs", {})
+    with _lock:
+        for path, ref in refs.items():
+            old = _cache.get(path)
+            if old is None or old.get("scanned"): _cache[path] = dict(ref, scanned=True)
+
+
+def cached(path):
+    """Último estado conocido (o None) sin tocar el disco"""
+    with _lock:
+        return _cache.get(path)
+
+
+def check(path):
+    """Estado actual del archivo: {'exists', 'size', 'mtime', 'pages'}"""
+    if not path:
+        return {"exists": False, "size": 0, "mtime": None, "pages": None}
+    try:
+        st = os.stat(path)
+    except OSError:
+        info = {"exists": False, "size": 0, "mtime": None, "pages": None, "checked": time.monotonic()}
+        with _lock: _cache[path] = info
+        return info
+
+    with _lock:
+        old = _cache.get(path)
+    if old and old["exists"] and old["mtime"] == st.st_mtime_ns and old["size"] == st.st_size:
+        return old
+
+    info = {"exists": True, "size": st.st_size, "mtime": st.st_mtime_ns, "pages": _page_count(path)}
+    with _lock: _cache[path] = info
+    return info
+
+
+def is_fresh(info):
+    """True si un 'no existe' cacheado todavía es confiable (ver MISSING_TTL)"""
+    if info is not None and info.get("scanned"): return is_scanned(info)
+    return info is not None and (info["exists"] or time.monotonic() - info.get("checked", 0) < MISSING_TTL)
+
+
+def is_scanned(info):
+    """El estado viene de una revisión de integridad reciente: no hace falta revisar el disco"""
+    return info is not None and info.get("scanned", False) and time.time() - info.get("scanned_at", 0) < SCAN_TTL
+
+
+def describe(info):
+    """Texto corto para la GUI: '3 págs · 1.2 MB'"""
+    parts = []
+    if info.get("pages"): parts.append(f"{info['pages']} pág" + ("s" if info["pages"] != 1 else ""))
+    size = info.get("size", 0)
+    parts.append(f"{size / (1024 * 1024):.1f} MB" if size >= 1024 * 1024 else f"{max(size // 1024, 1)} KB")
+    return " · ".join(parts)
+
+
+def content_hash(path):
+    """SHA-1 del contenido (se recalcula solo si cambió el mtime o el tamaño)"""
+    st = os.stat(path)
+    with _lock:
+        old = _hashes.get(path)
+    if old and old[0] == st.st_mtime_ns and old[1] == st.st_size:
+        return old[2]
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            h.update(chunk)
+    digest = h.hexdigest()
+    with _lock: _hashes[path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
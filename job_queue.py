@@ -0,0 +1,163 @@
+# job_queue.py
+# Cola persistente de generación de constancias.
+# Cada trabajo pasa por: pendiente -> renderizando -> convertido -> registrado
+# (o error / cancelado). Cada cambio de estado se agrega como una línea JSON al diario
+# (Constancias_Generadas/cola_constancias.jsonl) y se fuerza a disco, así un
+# cierre inesperado o un Word cerrado a la mitad deja constancia de qué se hizo.
+# Al abrir se vuelve a leer el diario y queda el último estado de cada trabajo:
+#   - pendiente / renderizando / error (con intentos libres) -> se vuelven a generar
+#   - convertido (PDF listo, falta el historial)              -> solo se registran
+# Repetir un trabajo es seguro: el PDF tiene ruta fija (se reemplaza) y registrar
+# revisa que el alumno no tenga ya esa constancia.
+# Solo el proceso principal escribe el diario; los procesos hijos solo generan PDFs.
+#   python job_queue.py            -> estado de la cola y métricas
+import json
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+QUEUE_PATH = os.path.join(ROOT, "Constancias_Generadas", "cola_constancias.jsonl")
+
+PENDING, RENDERING, CONVERTED, RECORDED, ERROR = "pendiente", "renderizando", "convertido", "registrado", "error"
+CANCELLED = "cancelado"  # lo canceló el usuario: no se retoma
+STATES = (PENDING, RENDERING, CONVERTED, RECORDED, ERROR, CANCELLED)
+
+# Intentos por trabajo antes de dejarlo en error definitivo
+MAX_ATTEMPTS = 3
+
+# Los trabajos registrados o cancelados se olvidan al compactar pasado este tiempo
+KEEP_SECONDS = 30 * 24 * 3600
+
+
+class JobQueue:
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        self.jobs = {}  # id -> {"id", "estado", "job", "intentos", "resultado", "t"...}
+        self._lock = threading.Lock()
+        self._lines = 0
+        self._load()
+        if self._lines > 2 * len(self.jobs) + 100: self.compact()
+
+    # --- DIARIO ---
+    def _load(self):
+        if not os.path.exists(self.path): return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try: entry = json.loads(line)
+                except ValueError: continue  # última línea a medias (cierre inesperado)
+                self._apply(entry)
+                self._lines += 1
+
+    def _apply(self, entry):
+        job = self.jobs.setdefault(entry["id"], {"id": entry["id"], "intentos": 0})
+        for key, value in entry.items():
+            if key != "id": job[key] = value
+
+    def _append(self, entries):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self._apply(entry)
+            f.flush()
+            os.fsync(f.fileno())
+            self._lines += len(entries)
+
+    def compact(self):
+        """Reescribe el diario con una línea por trabajo (y sin los registrados viejos)"""
+        cutoff = time.time() - KEEP_SECONDS
+        keep = {k: j for k, j in self.jobs.items()
+                if j.get("estado") not in (RECORDED, CANCELLED) or j.get("t", 0) >= cutoff}
+        tmp = self.path + ".tmp"
+        with self._lock:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                for job in keep.values():
+                    f.write(json.dumps(job, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self.jobs = keep
+            self._lines = len(keep)
+
+    # --- TRABAJOS ---
+    def add(self, jobs):
+        """Encola trabajos (dicts con 'id'); los que ya están en la cola no se duplican"""
+        now = time.time()
+        new = [{"id": j["id"], "estado": PENDING, "job": j, "t": now} for j in jobs if j["id"] not in self.jobs]
+        if new: self._append(new)
+        return [self.jobs[j["id"]]["job"] for j in jobs]
+
+    def _entry(self, job_id, state, now, extra):
+        entry = {"id": job_id, "estado": state, "t": now, **extra}
+        if state == RENDERING:
+            # Cada vez que se manda a generar cuenta como un intento
+            entry["intentos"] = self.jobs.get(job_id, {}).get("intentos", 0) + 1
+            entry["inicio"] = now
+        return entry
+
+    def mark(self, job_id, state, **extra):
+        self._append([self._entry(job_id, state, time.time(), extra)])
+
+    def mark_many(self, job_ids, state):
+        now = time.time()
+        self._append([self._entry(i, state, now, {}) for i in job_ids])
+
+    def finish(self, result):
+        """Guarda el resultado de render_job: convertido o error"""
+        ok = not result["error"] and os.path.exists(result["pdf"])
+        if ok: self.mark(result["id"], CONVERTED, resultado=result, t_convertido=time.time())
+        else: self.mark(result["id"], ERROR, resultado=result)
+
+    def state(self, job_id):
+        job = self.jobs.get(job_id)
+        return job and job.get("estado")
+
+    def to_render(self):
+        """Trabajos que hay que (volver a) generar: pendientes, interrumpidos o con error e intentos libres"""
+        out = []
+        for j in self.jobs.values():
+            st = j.get("estado")
+            if st in (PENDING, RENDERING) or (st == ERROR and j.get("intentos", 0) < MAX_ATTEMPTS):
+                out.append(j["job"])
+        return out
+
+    def to_record(self):
+        """Resultados con el PDF listo que todavía no están en el historial"""
+        return [j["resultado"] for j in self.jobs.values() if j.get("estado") == CONVERTED]
+
+    def unfinished(self):
+        return len(self.to_render()) + len(self.to_record())
+
+    # --- MÉTRICAS ---
+    def metrics(self, ids=None):
+        """Conteo por estado, ritmo (constancias/min), tiempo medio por documento y reintentos"""
+        jobs = [self.jobs[i] for i in ids if i in self.jobs] if ids is not None else list(self.jobs.values())
+        counts = {st: 0 for st in STATES}
+        for j in jobs: counts[j.get("estado", PENDING)] += 1
+        done = [j for j in jobs if j.get("estado") in (CONVERTED, RECORDED) and j.get("resultado")]
+        starts = [j["inicio"] for j in done if "inicio" in j]
+        ends = [j["t_convertido"] for j in done if "t_convertido" in j]
+        span = (max(ends) - min(starts)) if starts and ends else 0.0
+        ms = [j["resultado"].get("ms", 0.0) for j in done]
+        return {
+            "estados": counts,
+            "total": len(jobs),
+            "por_minuto": len(done) / span * 60 if span > 0 else 0.0,
+            "ms_promedio": sum(ms) / len(ms) if ms else 0.0,
+            "reintentos": sum(1 for j in jobs if j.get("intentos", 0) > 1),
+        }
+
+
+def describe(metrics):
+    st = metrics["estados"]
+    return (f"{metrics['total']} trabajos | " + ", ".join(f"{k}: {v}" for k, v in st.items() if v)
+            + f"\nRitmo: {metrics['por_minuto']:.0f} constancias/min | {metrics['ms_promedio']:.0f} ms por documento"
+            + f" | reintentos: {metrics['reintentos']}")
+
+
+if __name__ == "__main__":
+    q = JobQueue(sys.argv[1] if len(sys.argv) > 1 else QUEUE_PATH)
+    print(describe(q.metrics()))
+    print(f"Por generar: {len(q.to_render())} | por registrar: {len(q.to_record())}")
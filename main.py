@@ -1,85 +1,36 @@
 import sys
 import os
+
+# El perfilado se activa antes de cualquier otro import para poder medirlos
+from profiler import profiler
+if "--profile" in sys.argv:
+    sys.argv.remove("--profile")
+    profiler.enable()
+
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, 
-    QFrame, QLabel, QButtonGroup, QStackedWidget, QGraphicsOpacityEffect
+    QFrame, QLabel, QButtonGroup, QStackedWidget, QGraphicsOpacityEffect,
+    QProgressBar
 )
-from PySide6.QtCore import QPropertyAnimation, Qt, QSize
+from PySide6.QtCore import QPropertyAnimation, Qt, QSize, Signal
 from PySide6.QtGui import QPixmap, QIcon
 
 # Importaciones de nuestros módulos
 from database import StudentEngine
 from components import AnimButton
-from pages.dashboard import DashboardPage
-from pages.registro import RegistroPage
-from pages.alumnos import AlumnosPage
-from pages.talleres import TalleresPage
-from pages.constancias import ConstanciaPage
-from pages.expediente import ExpedientePage
-
-# --- ESTILOS GLOBALES (Soluciona filtros y ventanas blancas) ---
-GLOBAL_STYLES = """
-    /* Fondo General */
-    QMainWindow { background-color: #f1f5f9; }
-    
-    /* Fuentes Generales */
-    QWidget { font-family: 'Segoe UI', sans-serif; font-size: 14px; color: #1e293b; }
-
-    /* --- ARREGLO PARA FILTROS (QComboBox) --- */
-    QComboBox {
-        background-color: #ffffff;
-        border: 1px solid #cbd5e1;
-        border-radius: 6px;
-        padding: 5px 10px;
-        color: #1e293b; /* Texto oscuro siempre */
-        min-width: 100px;
-    }
-    QComboBox::drop-down {
-        subcontrol-origin: padding;
-        subcontrol-position: top right;
-        width: 20px;
-        border-left: none;
-    }
-    /* La lista desplegable */
-    QComboBox QAbstractItemView {
-        background-color: #ffffff;
-        color: #1e293b;
-        selection-background-color: #eff6ff;
-        selection-color: #1e40af;
-        border: 1px solid #cbd5e1;
-    }
-
-    /* --- ARREGLO PARA VENTANAS EMERGENTES (QDialog y QMessageBox) --- */
-    QDialog, QMessageBox {
-        background-color: #ffffff; /* Fondo blanco */
-    }
-    QMessageBox QLabel {
-        color: #1e293b; /* Texto oscuro */
-    }
-    
-    /* --- ARREGLO PARA CAMPOS DE TEXTO (QLineEdit) --- */
-    QLineEdit {
-        background-color: #ffffff;
-        border: 1px solid #cbd5e1;
-        border-radius: 6px;
-        padding: 6px;
-        color: #1e293b;
-    }
-    QLineEdit:focus {
-        border: 1px solid #3b82f6;
-    }
-
-    /* --- BOTONES --- */
-    QPushButton {
-        border-radius: 6px;
-        padding: 6px 12px;
-    }
-"""
+from styles import apply_styles, styled
+from workers import DatabaseLoader
+# Las páginas se importan al visitarlas por primera vez (ver pages/__init__.py)
+from pages import PAGE_REGISTRY, create_page
 
 class MainApp(QMainWindow):
+    # Se emite cuando database.json terminó de cargarse en segundo plano
+    data_ready = Signal()
+
     def __init__(self):
         super().__init__()
-        self.engine = StudentEngine()
+        # El motor arranca vacío; la carga real corre en un hilo (start_loading)
+        self.engine = StudentEngine(autoload=False)
         self.setWindowTitle("Sistema de Gestión TESCH - v1.0")
         self.resize(1280, 800)
         
@@ -92,11 +43,11 @@ class MainApp(QMainWindow):
         self.setup_sidebar()
         self.setup_pages()
         self.switch_page(0)
+        self.start_loading()
 
     def setup_sidebar(self):
-        self.sidebar = QFrame()
+        self.sidebar = styled(QFrame(), "Sidebar")
         self.sidebar.setFixedWidth(250)
-        self.sidebar.setStyleSheet("background-color: #0f172a; border: none;")
         ly = QVBoxLayout(self.sidebar)
         ly.setSpacing(10)
         ly.setContentsMargins(0, 0, 0, 20) 
@@ -118,7 +69,7 @@ class MainApp(QMainWindow):
         else:
             # Texto de respaldo si no encuentra la imagen
             logo_lbl.setText("TESCH")
-            logo_lbl.setStyleSheet("color: white; font-weight: bold; font-size: 30px;")
+            styled(logo_lbl, "LogoText")
 
         ly.addWidget(logo_lbl)
         
@@ -126,24 +77,26 @@ class MainApp(QMainWindow):
         self.group = QButtonGroup()
         self.group.setExclusive(True)
         
-        buttons = [
-            ("Dashboard", 0), ("Registro", 1), ("Alumnos", 2), 
-            ("Talleres", 3), ("Constancia", 4), ("Expediente", 5)
-        ]
-        
-        for text, idx in buttons:
+        for idx, (text, *_) in enumerate(PAGE_REGISTRY):
             btn = AnimButton(f" {text}")
             btn.clicked.connect(lambda _, i=idx: self.switch_page(i))
             self.group.addButton(btn)
             ly.addWidget(btn)
             
         ly.addStretch()
+
+        # --- ESTADO DE CARGA ---
+        self.load_lbl = styled(QLabel("Cargando base de datos..."), "LoadLabel")
+        self.load_bar = styled(QProgressBar(), "LoadBar")
+        self.load_bar.setFixedHeight(6); self.load_bar.setTextVisible(False)
+        ly.addWidget(self.load_lbl)
+        ly.addWidget(self.load_bar)
+
         self.layout.addWidget(self.sidebar)
 
     def setup_pages(self):
-        self.stack = QStackedWidget()
-        # Fondo base para evitar fantasmas visuales
-        self.stack.setStyleSheet("background-color: #f1f5f9;")
+        # Fondo base para evitar fantasmas visuales (ver styles.py)
+        self.stack = styled(QStackedWidget(), "PageStack")
         
         self.layout.addWidget(self.stack)
         
@@ -152,35 +105,74 @@ class MainApp(QMainWindow):
         self.anim = QPropertyAnimation(self.opacity_effect, b"opacity")
         self.anim.setDuration(300)
 
-        self.pages = [
-            DashboardPage(self.engine),
-            RegistroPage(self.engine, self),
-            AlumnosPage(self.engine),
-            TalleresPage(self.engine),
-            ConstanciaPage(self.engine),
-            ExpedientePage(self.engine)
-        ]
-        
-        for p in self.pages:
-            self.stack.addWidget(p)
+        # Las páginas se construyen al navegar a ellas; mientras tanto el
+        # stack guarda un widget vacío en su posición.
+        self.pages = [None] * len(PAGE_REGISTRY)
+        for _ in PAGE_REGISTRY:
+            self.stack.addWidget(QWidget())
+
+    def get_page(self, index):
+        """Devuelve la página, construyéndola la primera vez que se visita"""
+        page = self.pages[index]
+        if page is None:
+            with profiler.span(f"construir {PAGE_REGISTRY[index][0]}", "page"):
+                page = create_page(index, self.engine, self)
+            placeholder = self.stack.widget(index)
+            self.stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.stack.insertWidget(index, page)
+            self.pages[index] = page
+            if not self.engine.loaded:
+                self.data_ready.connect(lambda p=page: self.refresh_page(p))
+        return page
 
     def switch_page(self, index):
+        page = self.get_page(index)
+
         self.anim.setStartValue(0)
         self.anim.setEndValue(1)
         self.stack.setCurrentIndex(index)
         self.anim.start()
-        
-        page = self.pages[index]
+        with profiler.span(f"refrescar {PAGE_REGISTRY[index][0]}", "navigation"):
+            self.refresh_page(page)
+
+    def refresh_page(self, page):
         if hasattr(page, 'refresh'): page.refresh()
         elif hasattr(page, 'refresh_table'): page.refresh_table()
         elif hasattr(page, 'refresh_alumni_table'): page.refresh_alumni_table()
+        elif hasattr(page, 'refresh_student_list'): page.refresh_student_list()
+        elif hasattr(page, 'refresh_list'): page.refresh_list()
         elif hasattr(page, 'refresh_t_table_general'): page.refresh_t_table_general()
         elif hasattr(page, 'apply_filter'): page.apply_filter()
 
+    # --- CARGA EN SEGUNDO PLANO ---
+    def start_loading(self):
+        """Lee database.json en un hilo mientras la ventana ya está visible"""
+        # Sin datos no se permite editar (un guardado borraría el archivo)
+        self.stack.setEnabled(False)
+        self.loader = DatabaseLoader(self.engine, self)
+        self.loader.progress.connect(self.on_load_progress)
+        self.loader.loaded.connect(self.on_data_loaded)
+        self.loader.finished.connect(self.loader.deleteLater)
+        self.loader.start()
+
+    def on_load_progress(self, read, total, records):
+        self.load_bar.setMaximum(max(total, 1))
+        self.load_bar.setValue(read)
+        self.load_lbl.setText(f"Cargando... {read / 1024:,.0f} / {total / 1024:,.0f} KB · {records} registros")
+
+    def on_data_loaded(self, students):
+        self.engine.set_students(students)
+        self.load_lbl.setText(f"{len(students)} alumnos cargados")
+        self.load_bar.setVisible(False)
+        self.stack.setEnabled(True)
+        self.data_ready.emit()
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    # APLICAR ESTILOS GLOBALES
-    app.setStyleSheet(GLOBAL_STYLES)
+    # APLICAR ESTILOS GLOBALES (una sola hoja para toda la aplicación)
+    apply_styles(app)
+    app.aboutToQuit.connect(profiler.finish)
     
     window = MainApp()
     window.show()
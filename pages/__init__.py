@@ -0,0 +1,21 @@
+import importlib
+
+# --- REGISTRO DE PÁGINAS ---
+# (texto del menú, módulo, clase, recibe main_app)
+# Los módulos se importan hasta que la página se visita por primera vez,
+# así QtCharts / QtPdf / docxtpl no retrasan el arranque de la ventana.
+PAGE_REGISTRY = [
+    ("Dashboard", "pages.dashboard", "DashboardPage", False),
+    ("Registro", "pages.registro", "RegistroPage", True),
+    ("Alumnos", "pages.alumnos", "AlumnosPage", False),
+    ("Talleres", "pages.talleres", "TalleresPage", False),
+    ("Constancia", "pages.constancias", "ConstanciaPage", False),
+    ("Expediente", "pages.expediente", "ExpedientePage", False),
+]
+
+
+def create_page(index, engine, main_app):
+    """Importa el módulo de la página (solo la primera vez) y la construye"""
+    _, module_name, class_name, needs_app = PAGE_REGISTRY[index]
+    page_cls = getattr(importlib.import_module(module_name), class_name)
+    return page_cls(engine, main_app) if needs_app else page_cls(engine)
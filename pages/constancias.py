@@ -2,6 +2,7 @@ import os
 import sys
 import subprocess # Para abrir PDF sin bloquear Word
 import locale
+import time
 from datetime import datetime
 
 # Configuración regional para fechas en español
@@ -16,17 +17,18 @@ except:
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QListWidget, QListWidgetItem, QFrame, QLineEdit, 
-    QDialog, QFormLayout, QDialogButtonBox, QMessageBox, QWidget
+    QDialog, QFormLayout, QDialogButtonBox, QMessageBox, QWidget, QProgressDialog
 )
 from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QColor, QIcon, QFont, QPixmap
+import constancia_merge
+from config import CONSTANCIA_WORKERS
+from profiler import profiler
+from styles import styled
+from workers import CANCELLED, ConstanciaBatch, ConstanciaMerge, thumbnail_service
 
-# Librerías Word/PDF
-try:
-    from docxtpl import DocxTemplate
-    from docx2pdf import convert
-except ImportError:
-    pass
+# Filas que se conservan en la lista de constancias en proceso
+MAX_JOB_ROWS = 20
 
 # --- DIÁLOGO DE VERIFICACIÓN (DISEÑO LIMPIO) ---
 class VerificarDatosDialog(QDialog):
@@ -35,29 +37,17 @@ class VerificarDatosDialog(QDialog):
         self.setWindowTitle("Confirmar Datos del Documento")
         self.setFixedSize(500, 450)
         
-        # Estilos CSS
-        self.setStyleSheet("""
-            QDialog { background-color: white; }
-            QLabel { color: #1e293b; font-size: 14px; font-family: 'Segoe UI'; }
-            QLineEdit { 
-                background-color: #f8fafc; border: 1px solid #cbd5e1; 
-                border-radius: 6px; padding: 10px; font-size: 14px; 
-                color: #0f172a; font-weight: bold;
-            }
-            QLineEdit:focus { border: 2px solid #3b82f6; background-color: white; }
-            QPushButton { padding: 10px 20px; border-radius: 6px; font-weight: bold; font-size: 14px; }
-        """)
+        # Estilos CSS: ver #VerificarDialog en styles.py
+        self.setObjectName("VerificarDialog")
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(30, 30, 30, 30)
         
         # Título
-        title = QLabel("📝 Revisión Final")
-        title.setStyleSheet("font-size: 20px; font-weight: 800; color: #0f172a;")
+        title = styled(QLabel("📝 Revisión Final"), "DialogTitle")
         layout.addWidget(title)
         
-        sub = QLabel("Estos datos se imprimirán en la constancia oficial.\nVerifícalos antes de continuar.")
-        sub.setStyleSheet("color: #64748b; margin-bottom: 15px;")
+        sub = styled(QLabel("Estos datos se imprimirán en la constancia oficial.\nVerifícalos antes de continuar."), "DialogSubtitle")
         layout.addWidget(sub)
 
         # Formulario
@@ -77,7 +67,7 @@ class VerificarDatosDialog(QDialog):
         form.addRow("🆔 Matrícula:", self.matricula_edit)
         form.addRow("🏫 Carrera:", self.carrera_edit)
         
-        sep = QFrame(); sep.setFrameShape(QFrame.HLine); sep.setStyleSheet("color: #e2e8f0; margin: 10px 0;")
+        sep = styled(QFrame(), "Separator"); sep.setFrameShape(QFrame.HLine)
         form.addRow(sep)
         
         form.addRow("📅 Día:", self.dia_edit)
@@ -89,14 +79,12 @@ class VerificarDatosDialog(QDialog):
 
         # Botones
         btns_ly = QHBoxLayout()
-        btn_cancel = QPushButton("Cancelar")
+        btn_cancel = styled(QPushButton("Cancelar"), "DialogCancel")
         btn_cancel.setCursor(Qt.PointingHandCursor)
-        btn_cancel.setStyleSheet("background: white; border: 1px solid #cbd5e1; color: #64748b;")
         btn_cancel.clicked.connect(self.reject)
         
-        btn_ok = QPushButton("✅ IMPRIMIR CONSTANCIA")
+        btn_ok = styled(QPushButton("✅ IMPRIMIR CONSTANCIA"), "DialogConfirm")
         btn_ok.setCursor(Qt.PointingHandCursor)
-        btn_ok.setStyleSheet("background: #2563eb; color: white; border: none;")
         btn_ok.clicked.connect(self.accept)
         
         btns_ly.addWidget(btn_cancel)
@@ -119,42 +107,20 @@ class ConstanciaPage(QWidget):
         super().__init__()
         self.engine = engine
         self.current_student = None
+        self.queue = None
+        self.batch = None
+        self.runner = None
+        self.merge = None
+        self.job_rows = {}  # id -> (fila de la lista, nombre)
         
-        # Estilos Globales para esta página
-        self.setStyleSheet("""
-            QWidget { background-color: #f1f5f9; font-family: 'Segoe UI'; }
-            
-            /* Paneles */
-            QFrame#Panel { background: white; border-radius: 12px; border: 1px solid #e2e8f0; }
-            
-            /* Lista */
-            QListWidget { border: none; background: transparent; }
-            QListWidget::item { 
-                background: white; 
-                margin-bottom: 8px; 
-                padding: 15px; 
-                border-radius: 8px; 
-                border: 1px solid #e2e8f0; 
-                color: #334155;
-            }
-            QListWidget::item:selected { 
-                background: #eff6ff; 
-                border: 1px solid #3b82f6; 
-                color: #1e40af; 
-            }
-            QListWidget::item:hover { border: 1px solid #94a3b8; }
-            
-            /* Inputs */
-            QLineEdit { background: white; border: 1px solid #cbd5e1; padding: 10px; border-radius: 8px; font-size: 14px; }
-        """)
+        # Estilos de esta página: ver #ConstanciaPage en styles.py
+        self.setObjectName("ConstanciaPage")
         
         self.setup_ui()
-        self.refresh_list()
 
     def create_line(self):
-        line = QFrame()
+        line = styled(QFrame(), "Divider")
         line.setFrameShape(QFrame.HLine)
-        line.setStyleSheet("background-color: #e2e8f0; max-height: 1px; border: none; margin: 10px 0;")
         return line
 
     def setup_ui(self):
@@ -163,13 +129,11 @@ class ConstanciaPage(QWidget):
         
         # HEADER
         header = QHBoxLayout()
-        icon = QLabel("🖨️"); icon.setStyleSheet("font-size: 32px;")
+        icon = styled(QLabel("🖨️"), "ConstanciaIcon")
         
         title_ly = QVBoxLayout()
-        lbl_t = QLabel("Emisión de Constancias")
-        lbl_t.setStyleSheet("font-size: 26px; font-weight: 800; color: #1e293b;")
-        lbl_s = QLabel("Generación de documentos oficiales para alumnos acreditados (5.0 Créditos)")
-        lbl_s.setStyleSheet("color: #64748b; font-size: 14px;")
+        lbl_t = styled(QLabel("Emisión de Constancias"), "PageTitle")
+        lbl_s = styled(QLabel("Generación de documentos oficiales para alumnos acreditados (5.0 Créditos)"), "PageSubtitle")
         title_ly.addWidget(lbl_t); title_ly.addWidget(lbl_s)
         
         header.addWidget(icon); header.addLayout(title_ly); header.addStretch()
@@ -200,11 +164,29 @@ class ConstanciaPage(QWidget):
         lp_ly.addWidget(self.list_widget)
         
         # Mensaje vacío
-        self.lbl_empty = QLabel("🚫 No hay alumnos listos para liberar.\nRevisar módulo Talleres.")
+        self.lbl_empty = styled(QLabel("🚫 No hay alumnos listos para liberar.\nRevisar módulo Talleres."), "ListEmpty")
         self.lbl_empty.setAlignment(Qt.AlignCenter)
-        self.lbl_empty.setStyleSheet("color: #94a3b8; margin-top: 20px; font-weight: bold;")
         self.lbl_empty.setVisible(False)
         lp_ly.addWidget(self.lbl_empty)
+
+        # Lote: todas las de la lista (respeta la búsqueda)
+        self.btn_batch = styled(QPushButton("📦 Generar todas las de la lista"), "BatchButton")
+        self.btn_batch.setCursor(Qt.PointingHandCursor)
+        self.btn_batch.clicked.connect(self.click_batch)
+        lp_ly.addWidget(self.btn_batch)
+
+        # Trabajos que quedaron a medias (cierre inesperado, Word cerrado)
+        self.btn_resume = styled(QPushButton(), "ResumeButton")
+        self.btn_resume.setCursor(Qt.PointingHandCursor)
+        self.btn_resume.clicked.connect(self.click_resume)
+        self.btn_resume.setVisible(False)
+        lp_ly.addWidget(self.btn_resume)
+
+        # Un solo PDF con las de hoy (índice + marcadores) para imprimir de una vez
+        self.btn_print = styled(QPushButton("🖨 Imprimir las de hoy (un solo PDF)"), "PrintButton")
+        self.btn_print.setCursor(Qt.PointingHandCursor)
+        self.btn_print.clicked.connect(self.click_print)
+        lp_ly.addWidget(self.btn_print)
         
         content_ly.addWidget(left_panel)
 
@@ -215,8 +197,7 @@ class ConstanciaPage(QWidget):
         self.rp_ly.setContentsMargins(40, 40, 40, 40)
         
         # Estado Inicial (Nada seleccionado)
-        self.lbl_placeholder = QLabel("👈 Selecciona un alumno de la lista")
-        self.lbl_placeholder.setStyleSheet("font-size: 20px; color: #cbd5e1; font-weight: bold;")
+        self.lbl_placeholder = styled(QLabel("👈 Selecciona un alumno de la lista"), "SelectHint")
         self.rp_ly.addWidget(self.lbl_placeholder)
         
         # Contenedor de Detalles (Oculto al inicio)
@@ -227,42 +208,46 @@ class ConstanciaPage(QWidget):
         dc_ly.setSpacing(15)
         
         # Icono gigante
-        lbl_big_icon = QLabel("🎓"); lbl_big_icon.setStyleSheet("font-size: 80px;")
+        lbl_big_icon = styled(QLabel("🎓"), "BigIcon")
         lbl_big_icon.setAlignment(Qt.AlignCenter)
         dc_ly.addWidget(lbl_big_icon)
         
-        self.lbl_name = QLabel("NOMBRE DEL ALUMNO")
+        self.lbl_name = styled(QLabel("NOMBRE DEL ALUMNO"), "CertName")
         self.lbl_name.setAlignment(Qt.AlignCenter)
-        self.lbl_name.setStyleSheet("font-size: 24px; font-weight: 800; color: #1e293b;")
         self.lbl_name.setWordWrap(True)
         dc_ly.addWidget(self.lbl_name)
         
-        self.lbl_career = QLabel("INGENIERÍA EN SISTEMAS")
+        self.lbl_career = styled(QLabel("INGENIERÍA EN SISTEMAS"), "CertCareer")
         self.lbl_career.setAlignment(Qt.AlignCenter)
-        self.lbl_career.setStyleSheet("font-size: 16px; color: #64748b; font-weight: bold;")
         dc_ly.addWidget(self.lbl_career)
         
-        self.lbl_status = QLabel("✅ 5.0 Créditos Cubiertos")
-        self.lbl_status.setStyleSheet("color: #16a34a; font-weight: bold; background: #dcfce7; padding: 5px 10px; border-radius: 15px;")
+        self.lbl_status = styled(QLabel("✅ 5.0 Créditos Cubiertos"), "CertStatus")
         dc_ly.addWidget(self.lbl_status, alignment=Qt.AlignCenter)
         
         dc_ly.addSpacing(30)
         
         # Botón Gigante
-        self.btn_generate = QPushButton("  GENERAR DOCUMENTO PDF  ")
+        self.btn_generate = styled(QPushButton("  GENERAR DOCUMENTO PDF  "), "GenerateButton")
         self.btn_generate.setCursor(Qt.PointingHandCursor)
-        self.btn_generate.setStyleSheet("""
-            QPushButton { 
-                background-color: #16a34a; color: white; 
-                padding: 20px; border-radius: 12px; 
-                font-size: 16px; font-weight: 900; border: none;
-            }
-            QPushButton:hover { background-color: #15803d; transform: scale(1.05); }
-        """)
         self.btn_generate.clicked.connect(self.click_generate)
         dc_ly.addWidget(self.btn_generate)
         
         self.rp_ly.addWidget(self.details_container)
+
+        # Constancias en proceso: se generan en segundo plano (se pueden encolar varias)
+        self.jobs_panel = QWidget()
+        jp_ly = QVBoxLayout(self.jobs_panel); jp_ly.setContentsMargins(0, 20, 0, 0)
+        jp_ly.addWidget(QLabel("<b>⏳ Constancias en proceso</b>"))
+        self.jobs_list = styled(QListWidget(), "JobsList")
+        self.jobs_list.setMaximumHeight(160)
+        self.jobs_list.itemDoubleClicked.connect(self.open_job)
+        jp_ly.addWidget(self.jobs_list)
+        btn_cancel_job = styled(QPushButton("Cancelar seleccionada"), "JobCancel")
+        btn_cancel_job.setCursor(Qt.PointingHandCursor)
+        btn_cancel_job.clicked.connect(self.cancel_job)
+        jp_ly.addWidget(btn_cancel_job, alignment=Qt.AlignRight)
+        self.jobs_panel.setVisible(False)
+        self.rp_ly.addWidget(self.jobs_panel)
         content_ly.addWidget(right_panel)
 
         main_ly.addLayout(content_ly)
@@ -301,6 +286,8 @@ class ConstanciaPage(QWidget):
             
         self.lbl_empty.setVisible(count == 0)
         self.list_widget.setVisible(count > 0)
+        self.btn_batch.setVisible(count > 0)
+        self.update_resume()
         
         # Resetear panel derecho
         self.lbl_placeholder.setVisible(True)
@@ -344,39 +331,208 @@ class ConstanciaPage(QWidget):
         try:
             out_dir = os.path.join(root, "Constancias_Generadas")
             if not os.path.exists(out_dir): os.makedirs(out_dir)
-            
-            # 2. Generar Word
-            doc = DocxTemplate(tpl)
-            doc.render(ctx)
-            
-            # Timestamp en el nombre para evitar conflictos
-            ts = datetime.now().strftime("%H%M%S")
-            fname = f"Constancia_{ctx['MATRICULA']}_{ts}"
-            docx = os.path.join(out_dir, f"{fname}.docx")
-            pdf = os.path.join(out_dir, f"{fname}.pdf")
-            
-            doc.save(docx)
-            
-            # 3. Convertir a PDF
-            QMessageBox.information(self, "Generando", "Creando PDF... Por favor espera un momento.")
-            convert(docx, pdf)
-            
-            # 4. Guardar Historial
-            self.current_student['workshops'].append({
-                "name": "CONSTANCIA FINAL OFICIAL",
-                "category": "Trámite",
-                "value": 0,
-                "status": "Entregado",
-                "pdf_path": pdf,
-                "date": datetime.now().strftime("%Y-%m-%d")
-            })
-            self.engine.save()
-            
-            # 5. Abrir en Navegador (Seguro)
-            self.force_browser(pdf)
-            
+
+            # 2. Trabajo en la cola persistente (job_queue.py): si algo se corta a la mitad,
+            # la próxima vez se retoma (o solo se registra si el PDF ya estaba)
+            import batch_constancias
+            with profiler.span("constancia.encolar", "pdf"):
+                job = batch_constancias.make_job(ctx, batch_constancias.pdf_template(prepare=False),
+                                                 self.current_student.get('matricula'))
+                if job["id"] in self.running_ids(): return  # esa misma ya se está generando
+                self.job_queue().add([job])
+            self.add_job_row(job)
+
+            # 3. La misma constancia (mismos datos y plantilla) ya existe: se entrega sin generar
+            done = batch_constancias.reused(job)
+            if done:
+                self.on_job_done(1, 1, done); return
+
+            # 4. Se genera en el pool de procesos (nativo o Word): la ventana sigue respondiendo
+            # y se pueden encolar más alumnos mientras tanto. Al terminar: on_job_done
+            self.job_runner().add([job])
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Ocurrió un error:\n{str(e)}\n\nCierra Word si está abierto.")
+            QMessageBox.critical(self, "Error", f"Ocurrió un error:\n{str(e)}")
+
+    # --- EN PROCESO (generación individual en segundo plano) ---
+
+    def job_runner(self):
+        if self.runner is None:
+            self.runner = ConstanciaBatch(self.job_queue(), CONSTANCIA_WORKERS or None, self)
+            self.runner.stage.connect(self.on_job_stage)
+            self.runner.progress.connect(self.on_job_done)
+        return self.runner
+
+    def add_job_row(self, job):
+        old = self.job_rows.pop(job["id"], None)
+        if old is not None: self.jobs_list.takeItem(self.jobs_list.row(old[0]))
+        item = QListWidgetItem(f"⏳ {job['ctx']['NOMBRE_ESTUDIANTE']} — en cola")
+        item.setData(Qt.UserRole, job["id"])
+        self.jobs_list.insertItem(0, item)
+        self.job_rows[job["id"]] = (item, job['ctx']['NOMBRE_ESTUDIANTE'])
+        # Solo se conservan las últimas filas
+        while self.jobs_list.count() > MAX_JOB_ROWS:
+            old = self.jobs_list.takeItem(self.jobs_list.count() - 1)
+            self.job_rows.pop(old.data(Qt.UserRole), None)
+        self.jobs_panel.setVisible(True)
+
+    def set_job_row(self, job_id, text, tooltip=""):
+        row = self.job_rows.get(job_id)
+        if row is None: return
+        row[0].setText(f"{text.split(' ', 1)[0]} {row[1]} — {text.split(' ', 1)[1]}")
+        row[0].setToolTip(tooltip)
+
+    def on_job_stage(self, job_id, stage):
+        self.set_job_row(job_id, "⚙️ generando..." if stage == "generando" else "📝 con Word (en espera de turno)...")
+
+    def on_job_done(self, done, total, result):
+        if result["error"] == CANCELLED:
+            self.set_job_row(result["id"], "🚫 cancelada"); return
+        if result["error"]:
+            self.set_job_row(result["id"], "⚠️ error", result["error"])
+            QMessageBox.critical(self, "Error", f"Ocurrió un error con {result['nombre']}:\n{result['error']}"
+                                                "\n\nCierra Word si está abierto.")
+            return
+        # 5. Guardar Historial (si ya la tenía, no se repite la entrada)
+        import batch_constancias
+        with profiler.span("constancia.guardar_historial", "pdf"):
+            batch_constancias.commit(self.engine, self.engine.students, [result], datetime.now(), self.queue)
+        self.set_job_row(result["id"], "✅ ya existía" if result["motor"] == batch_constancias.REUSED
+                         else f"✅ lista ({result['ms']:.0f} ms)", result["pdf"])
+        row = self.job_rows.get(result["id"])  # la fila pudo salir de la lista (MAX_JOB_ROWS)
+        if row: row[0].setData(Qt.UserRole + 1, result["pdf"])
+        thumbnail_service().request(result["pdf"])
+        # 6. Abrir en Navegador (Seguro)
+        self.force_browser(result["pdf"])
+
+    def cancel_job(self):
+        item = self.jobs_list.currentItem()
+        if item is not None and self.runner is not None: self.runner.cancel(item.data(Qt.UserRole))
+
+    def open_job(self, item):
+        pdf = item.data(Qt.UserRole + 1)
+        if pdf: self.force_browser(pdf)
+
+    def running_ids(self):
+        """Trabajos que este página está generando ahora (no son 'pendientes de reanudar')"""
+        ids = set()
+        for runner in (self.runner, self.batch):
+            if runner is not None: ids |= runner.running_ids()
+        return ids
+
+    # --- LOTE ---
+
+    def job_queue(self):
+        """Cola persistente de generación (se abre la primera vez que se usa)"""
+        if self.queue is None:
+            from job_queue import JobQueue
+            self.queue = JobQueue()
+        return self.queue
+
+    def update_resume(self):
+        """Muestra 'Reanudar' si una ejecución anterior quedó a medias"""
+        from job_queue import QUEUE_PATH
+        n = 0
+        if os.path.exists(QUEUE_PATH):
+            running = self.running_ids()
+            q = self.job_queue()
+            n = sum(1 for j in q.to_render() if j["id"] not in running) + len(q.to_record())
+        self.btn_resume.setText(f"⏯ Reanudar {n} constancias pendientes")
+        self.btn_resume.setVisible(n > 0 and self.batch is None)
+
+    def click_resume(self):
+        self.start_batch([])
+
+    def click_batch(self):
+        """Genera en el pool de procesos las constancias de los alumnos de la lista"""
+        import batch_constancias
+        listed = [self.list_widget.item(i).data(Qt.UserRole) for i in range(self.list_widget.count())]
+        students = batch_constancias.eligible(listed)
+        skipped = len(listed) - len(students)
+        if not students:
+            QMessageBox.information(self, "Lote", "Todos los alumnos de la lista ya tienen constancia.")
+            return
+        msg = f"Se generarán {len(students)} constancias."
+        if skipped: msg += f"\n{skipped} alumnos ya tienen constancia y se omiten."
+        if QMessageBox.question(self, "Generar lote", msg) != QMessageBox.Yes: return
+        self.start_batch(students)
+
+    def start_batch(self, students):
+        """Retoma lo pendiente de la cola y agrega los trabajos de students"""
+        import batch_constancias
+        queue = self.job_queue()
+        self.batch_when = datetime.now()
+        # Lo que ya estaba generado solo falta registrarlo
+        batch_constancias.commit(self.engine, self.engine.students, queue.to_record(), self.batch_when, queue)
+        jobs, _ = batch_constancias.prepare(queue, students, self.batch_when, False, self.running_ids())
+        if not jobs:
+            self.refresh_list(); return
+
+        self.batch_t0 = time.perf_counter()
+        self.batch_dialog = QProgressDialog("Generando constancias...", "Cancelar", 0, len(jobs), self)
+        self.batch_dialog.setWindowTitle("Constancias por lote")
+        self.batch_dialog.setWindowModality(Qt.WindowModal)
+        self.batch_dialog.setMinimumDuration(0)
+        self.batch_dialog.setAutoClose(False)
+        self.batch = ConstanciaBatch(queue, CONSTANCIA_WORKERS or None, self)
+        self.batch.progress.connect(self.on_batch_progress)
+        self.batch.finished.connect(self.on_batch_finished)
+        self.batch_dialog.canceled.connect(self.batch.cancel)
+        self.btn_resume.setVisible(False)
+        self.batch.add(jobs)
+
+    def on_batch_progress(self, done, total, result):
+        self.batch_dialog.setValue(done)
+        state = "⚠️" if result["error"] else "✅"
+        self.batch_dialog.setLabelText(f"{done} / {total}  {state} {result['nombre']}")
+
+    def on_batch_finished(self, results):
+        import batch_constancias
+        seconds = time.perf_counter() - self.batch_t0
+        self.batch_dialog.close()
+        self.batch.deleteLater(); self.batch = None
+        # Una sola escritura de database.json para todo el lote
+        with profiler.span("constancia.lote_historial", "pdf"):
+            batch_constancias.commit(self.engine, self.engine.students, self.queue.to_record(),
+                                     self.batch_when, self.queue)
+        report = batch_constancias.write_report(results, seconds, self.batch_when)
+        for r in results:
+            if not r["error"]: thumbnail_service().request(r["pdf"])
+        self.refresh_list()
+        text = f"{batch_constancias.summary(results, seconds, self.queue)}\n\nReporte: {report}"
+        items = constancia_merge.items_from_results(results)
+        if not items:
+            QMessageBox.information(self, "Lote terminado", text); return
+        ask = QMessageBox.question(self, "Lote terminado", f"{text}\n\n¿Unirlas en un solo PDF para imprimir?",
+                                   QMessageBox.Yes | QMessageBox.No)
+        if ask == QMessageBox.Yes: self.start_merge(items)
+
+    # --- IMPRESIÓN (un solo PDF) ---
+
+    def click_print(self):
+        today = datetime.now().strftime("%Y-%m-%d")
+        items = constancia_merge.items_from_history(self.engine.students, today)
+        if not items:
+            QMessageBox.information(self, "Imprimir", "Hoy no se ha registrado ninguna constancia."); return
+        self.start_merge(items)
+
+    def start_merge(self, items):
+        if self.merge is not None: return
+        self.merge = ConstanciaMerge(self)
+        self.merge.done.connect(self.on_merge_done)
+        self.btn_print.setEnabled(False)
+        self.btn_print.setText(f"⏳ Uniendo {len(items)} constancias...")
+        self.merge.start(items)
+
+    def on_merge_done(self, result):
+        self.merge.deleteLater(); self.merge = None
+        self.btn_print.setEnabled(True)
+        self.btn_print.setText("🖨 Imprimir las de hoy (un solo PDF)")
+        if result.get("error") or not result["ruta"]:
+            QMessageBox.critical(self, "Error", f"No se pudo unir las constancias:\n"
+                                                f"{result.get('error') or constancia_merge.describe(result)}")
+            return
+        if result["omitidos"]: QMessageBox.warning(self, "Imprimir", constancia_merge.describe(result))
+        self.force_browser(result["ruta"])
 
     def force_browser(self, path):
         """Intenta forzar la apertura en Chrome o Edge"""
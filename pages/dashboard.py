@@ -3,11 +3,13 @@ from PySide6.QtCharts import QChart, QChartView, QPieSeries
 from PySide6.QtGui import QPainter, QCursor, QFont
 from PySide6.QtCore import Qt
 from components import StatCard
+from styles import styled
 
 class DashboardPage(QWidget):
     def __init__(self, engine):
         super().__init__()
         self.engine = engine
+        self.setObjectName("DashboardPage")
         self.setup_ui()
 
     def setup_ui(self):
@@ -16,8 +18,7 @@ class DashboardPage(QWidget):
         ly.setSpacing(20)
         
         # 1. TÍTULO
-        title = QLabel("Dashboard")
-        title.setStyleSheet("font-size: 24px; font-weight: bold; color: #0f172a; font-family: 'Segoe UI';")
+        title = styled(QLabel("Dashboard"), "PageTitle")
         ly.addWidget(title)
         
         # 2. TARJETAS SUPERIORES (Stats)
@@ -30,12 +31,10 @@ class DashboardPage(QWidget):
         charts_ly.setSpacing(20)
         
         # --- Gráfica 1: Distribución por Carrera ---
-        self.c1_view = QChartView()
+        self.c1_view = styled(QChartView(), "ChartView")
         self.c1_view.setRenderHint(QPainter.Antialiasing)
-        self.c1_view.setStyleSheet("background: transparent;")
         
-        c1_card = QFrame()
-        c1_card.setStyleSheet("background: white; border-radius: 16px; border: 1px solid #f1f5f9;")
+        c1_card = styled(QFrame(), "ChartCard")
         c1_v = QVBoxLayout(c1_card)
         c1_v.setContentsMargins(20, 20, 20, 20)
         c1_v.addWidget(QLabel("<b style='color:#0f172a; font-size:14px;'>Distribución por Carrera</b>"))
@@ -43,12 +42,10 @@ class DashboardPage(QWidget):
         charts_ly.addWidget(c1_card)
 
         # --- Gráfica 2: Talleres Populares ---
-        self.c2_view = QChartView()
+        self.c2_view = styled(QChartView(), "ChartView")
         self.c2_view.setRenderHint(QPainter.Antialiasing)
-        self.c2_view.setStyleSheet("background: transparent;")
         
-        c2_card = QFrame()
-        c2_card.setStyleSheet("background: white; border-radius: 16px; border: 1px solid #f1f5f9;")
+        c2_card = styled(QFrame(), "ChartCard")
         c2_v = QVBoxLayout(c2_card)
         c2_v.setContentsMargins(20, 20, 20, 20)
         c2_v.addWidget(QLabel("<b style='color:#0f172a; font-size:14px;'>Talleres Populares</b>"))
@@ -65,30 +62,26 @@ class DashboardPage(QWidget):
         for i in reversed(range(self.stats_ly.count())): 
             self.stats_ly.itemAt(i).widget().setParent(None)
         
-        # --- CREAR TARJETAS (NUEVO FORMATO DE 6 ARGUMENTOS) ---
+        # --- CREAR TARJETAS (título, valor, subtítulo, icono, acento) ---
         
         # 1. Total Alumnos (Morado)
         self.stats_ly.addWidget(StatCard(
-            "Total Alumnos", stats['total'], "Registrados", "👥", 
-            "#f3e8ff", "#7e22ce" 
+            "Total Alumnos", stats['total'], "Registrados", "👥", "purple"
         ))
         
         # 2. Talleres Cursando (Azul)
         self.stats_ly.addWidget(StatCard(
-            "Talleres Cursando", stats['cursando'], "En proceso", "📖", 
-            "#dbeafe", "#2563eb" 
+            "Talleres Cursando", stats['cursando'], "En proceso", "📖", "blue"
         ))
         
         # 3. Talleres Acreditados (Naranja)
         self.stats_ly.addWidget(StatCard(
-            "Talleres Acreditados", stats['accredited'], "Completados", "🏅", 
-            "#ffedd5", "#c2410c" 
+            "Talleres Acreditados", stats['accredited'], "Completados", "🏅", "orange"
         ))
 
         # 4. Listos p/ Constancia (Gris)
         self.stats_ly.addWidget(StatCard(
-            "Listos p/ Constancia", stats['ready'], "Con 2+ créditos", "📄", 
-            "#f1f5f9", "#64748b" 
+            "Listos p/ Constancia", stats['ready'], "Con 2+ créditos", "📄", "gray"
         ))
 
         # --- ACTUALIZAR GRÁFICAS ---
@@ -4,10 +4,18 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QHBoxLayout, QComboBox, QPushButton, 
     QTableWidget, QHeaderView, QTableWidgetItem, QFrame, QAbstractItemView, 
     QStackedWidget, QDialog, QFileDialog, QScrollArea, QGridLayout, QMessageBox,
-    QSizePolicy, QLineEdit
+    QSizePolicy, QLineEdit, QProgressBar
 )
-from PySide6.QtCore import Qt, QSize, QUrl, QRect
+from PySide6.QtCore import Qt, QSize, QUrl, QRect, QTimer
 from PySide6.QtGui import QColor, QBrush, QPixmap, QIcon, QPainter, QPainterPath, QImage
+from styles import styled, set_style_prop
+from components import TablePager
+import photo_store
+import file_integrity
+import file_status
+import pdf_cache
+import text_index
+from workers import FILE_POOL, FileStatusTask, IntegrityScanner, TextIndexer, thumbnail_service
 
 # --- MÓDULOS DE PDF ---
 try:
@@ -22,19 +30,32 @@ except ImportError:
         def setPageMode(self, m): pass
         def setZoomMode(self, m): pass
 
+# Tamaño en pantalla de las miniaturas de documentos (proporción carta)
+THUMB_SIZE = QSize(40, 52)
+
+# Espera tras la última tecla antes de buscar dentro de los documentos (ms)
+TEXT_SEARCH_DELAY = 300
+
 # --- DIÁLOGO EXPEDIENTE (Igual que antes, con el visor y fotos redondas) ---
+# Se construye UNA vez por página y se reutiliza: bind(alumno) lo llena y
+# release() suelta todo lo del alumno anterior (botones, PDF, revisiones).
 class StudentDetailDialog(QDialog):
-    def __init__(self, student, engine, parent=None):
+    def __init__(self, engine, parent=None):
         super().__init__(parent)
-        self.student = student
+        self.student = None
         self.engine = engine
-        self.setWindowTitle(f"Expediente: {student.get('nombres', 'Alumno')}")
         self.setFixedSize(1150, 750)
         
-        # Confiamos en los estilos globales de main.py, pero forzamos base blanca
-        self.setStyleSheet("QDialog { background-color: #ffffff; }")
+        # Confiamos en los estilos globales (styles.py), con base blanca
+        self.setObjectName("StudentDetailDialog")
         
+        self.doc_rows = []
+        self._tasks = []
+        # Miniaturas de la primera página (pool de procesos, ver thumbnails.py)
+        self.thumbs = thumbnail_service()
+        self.thumbs.ready.connect(self.on_thumbnail)
         self.setup_ui()
+        self.finished.connect(self.release)
 
     def setup_ui(self):
         main_layout = QHBoxLayout(self)
@@ -42,9 +63,8 @@ class StudentDetailDialog(QDialog):
         main_layout.setSpacing(0)
 
         # 1. PANEL IZQUIERDO
-        left_panel = QWidget()
+        left_panel = styled(QWidget(), "DetailLeft")
         left_panel.setFixedWidth(380)
-        left_panel.setStyleSheet("background-color: white; border-right: 1px solid #e2e8f0;")
         
         left_ly = QVBoxLayout(left_panel)
         left_ly.setContentsMargins(20, 20, 20, 20)
@@ -52,194 +72,377 @@ class StudentDetailDialog(QDialog):
 
         # Foto y Datos
         profile_ly = QHBoxLayout()
-        self.photo_lbl = QLabel()
+        self.photo_lbl = styled(QLabel(), "Avatar")
         self.photo_lbl.setFixedSize(90, 90)
-        self.load_photo()
         
         info_ly = QVBoxLayout()
-        full_name = f"{self.student.get('nombres','')} {self.student.get('apellidoPaterno','')}"
-        lbl_name = QLabel(full_name.upper())
-        lbl_name.setStyleSheet("font-weight: bold; font-size: 14px; border: none;")
-        lbl_name.setWordWrap(True)
+        self.lbl_name = styled(QLabel(), "DetailName")
+        self.lbl_name.setWordWrap(True)
         
-        lbl_mat = QLabel(f"Mat: {self.student.get('matricula')}\n{self.student.get('career')}")
-        lbl_mat.setStyleSheet("color: #64748b; font-size: 12px; border: none;")
+        self.lbl_mat = styled(QLabel(), "DetailMeta")
         
-        info_ly.addWidget(lbl_name); info_ly.addWidget(lbl_mat)
+        info_ly.addWidget(self.lbl_name); info_ly.addWidget(self.lbl_mat)
         profile_ly.addWidget(self.photo_lbl); profile_ly.addLayout(info_ly)
         left_ly.addLayout(profile_ly)
         
-        btn_upload = QPushButton("📷 Cambiar Foto")
+        btn_upload = styled(QPushButton("📷 Cambiar Foto"), "PhotoButton")
         btn_upload.setCursor(Qt.PointingHandCursor)
-        btn_upload.setStyleSheet("background: #f1f5f9; color: #334155; border: 1px solid #cbd5e1;")
         btn_upload.clicked.connect(self.upload_photo)
         left_ly.addWidget(btn_upload)
 
-        line = QFrame(); line.setFrameShape(QFrame.HLine); line.setStyleSheet("color: #e2e8f0;")
+        line = styled(QFrame(), "Separator"); line.setFrameShape(QFrame.HLine)
         left_ly.addWidget(line)
 
-        # Documentos
+        # Documentos (los botones los crea bind)
         left_ly.addWidget(QLabel("<b>📄 Documentos Disponibles</b>"))
         
-        scroll = QScrollArea()
+        scroll = styled(QScrollArea(), "DocsScroll")
         scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("border: none; background: transparent;")
-        content_w = QWidget(); content_w.setStyleSheet("background: white;")
+        content_w = styled(QWidget(), "DocsContent")
         self.docs_ly = QVBoxLayout(content_w)
         self.docs_ly.setSpacing(8)
         self.docs_ly.setContentsMargins(0,0,5,0)
-        
-        workshops = self.student.get('workshops', [])
-        has_files = False
-        
-        for w in workshops:
-            pdf_path = w.get('pdf_path')
-            btn_doc = QPushButton()
-            btn_doc.setCheckable(True)
-            btn_doc.setCursor(Qt.PointingHandCursor)
-            
-            btn_doc.setStyleSheet("""
-                QPushButton { background-color: #f8fafc; border: 1px solid #e2e8f0; text-align: left; padding: 10px; color: #1e293b; }
-                QPushButton:checked { background-color: #eff6ff; border: 1px solid #3b82f6; }
-                QPushButton:hover { background-color: #e2e8f0; }
-            """)
-            
-            row = QHBoxLayout(btn_doc)
-            st = w.get('status', '-')
-            col = "#10b981" if st in ['Acreditado', 'Entregado'] else "#f59e0b"
-            
-            txt_ly = QVBoxLayout()
-            t1 = QLabel(w.get('name', 'Actividad'))
-            t1.setStyleSheet("font-weight: bold; border:none; background:transparent;")
-            t2 = QLabel(st)
-            t2.setStyleSheet(f"font-size: 11px; color: {col}; border:none; background:transparent;")
-            txt_ly.addWidget(t1); txt_ly.addWidget(t2)
-            
-            row.addLayout(txt_ly); row.addStretch()
-            
-            if pdf_path and os.path.exists(pdf_path):
-                row.addWidget(QLabel("👁️"))
-                btn_doc.clicked.connect(lambda checked=False, b=btn_doc, p=pdf_path: self.preview_pdf(b, p))
-                self.docs_ly.addWidget(btn_doc)
-                has_files = True
-            else:
-                btn_doc.setEnabled(False)
-                t2.setText("Sin archivo"); self.docs_ly.addWidget(btn_doc)
-
-        if not has_files: self.docs_ly.addWidget(QLabel("No hay documentos."))
+        self.lbl_no_docs = QLabel("No hay documentos.")
+        self.docs_ly.addWidget(self.lbl_no_docs)
         self.docs_ly.addStretch(); scroll.setWidget(content_w); left_ly.addWidget(scroll)
 
-        btn_close = QPushButton("Cerrar")
+        btn_close = styled(QPushButton("Cerrar"), "CloseButton")
         btn_close.clicked.connect(self.accept)
-        btn_close.setStyleSheet("background: #cbd5e1; color: #334155;")
         left_ly.addWidget(btn_close)
 
         # 2. PANEL DERECHO
-        right_panel = QWidget()
-        right_panel.setStyleSheet("background-color: #475569;")
+        right_panel = styled(QWidget(), "DetailRight")
         right_ly = QVBoxLayout(right_panel); right_ly.setContentsMargins(10, 10, 10, 10)
         
-        self.pdf_document = QPdfDocument(self)
-        self.pdf_viewer = QPdfView(self)
-        self.pdf_viewer.setDocument(self.pdf_document)
+        # El documento lo pone pdf_cache.show al elegir un archivo
+        self.pdf_viewer = styled(QPdfView(self), "DetailViewer")
         self.pdf_viewer.setPageMode(QPdfView.PageMode.MultiPage)
         self.pdf_viewer.setZoomMode(QPdfView.ZoomMode.FitToWidth)
-        self.pdf_viewer.setStyleSheet("border: none;")
         
         self.right_stack = QStackedWidget()
-        self.lbl_msg = QLabel("Selecciona un documento de la lista\npara visualizarlo aquí.")
+        self.lbl_msg = styled(QLabel("Selecciona un documento de la lista\npara visualizarlo aquí."), "ViewerHint")
         self.lbl_msg.setAlignment(Qt.AlignCenter)
-        self.lbl_msg.setStyleSheet("color: white; font-size: 16px; font-weight: bold;")
         
         self.right_stack.addWidget(self.lbl_msg); self.right_stack.addWidget(self.pdf_viewer)
         right_ly.addWidget(self.right_stack)
         
         main_layout.addWidget(left_panel); main_layout.addWidget(right_panel)
 
-    def set_rounded_image(self, path):
-        if not os.path.exists(path): return
-        src_img = QImage(path)
-        if src_img.isNull(): return
-        size = 90; target_size = QSize(size, size)
-        scaled_img = src_img.scaled(target_size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-        x = (scaled_img.width() - size) // 2; y = (scaled_img.height() - size) // 2
-        cropped_img = scaled_img.copy(x, y, size, size)
-        final_pixmap = QPixmap(target_size); final_pixmap.fill(Qt.transparent)
-        painter = QPainter(final_pixmap); painter.setRenderHint(QPainter.Antialiasing)
-        path = QPainterPath(); path.addEllipse(0, 0, size, size); painter.setClipPath(path)
-        painter.drawPixmap(0, 0, QPixmap.fromImage(cropped_img)); painter.end()
-        self.photo_lbl.setPixmap(final_pixmap)
-        self.photo_lbl.setStyleSheet("border: none; background: transparent;")
+    def bind(self, student):
+        """Llena el diálogo con otro alumno (suelta primero lo del anterior)"""
+        self.release()
+        self.student = student
+        self.setWindowTitle(f"Expediente: {student.get('nombres', 'Alumno')}")
+        self.lbl_name.setText(f"{student.get('nombres','')} {student.get('apellidoPaterno','')}".upper())
+        self.lbl_mat.setText(f"Mat: {student.get('matricula')}\n{student.get('career')}")
+        self.load_photo()
+        self.right_stack.setCurrentIndex(0)
+
+        # Los botones aparecen de inmediato como "Verificando..." y el estado real
+        # (existe, páginas, tamaño) llega desde FILE_POOL sin congelar el diálogo
+        for i, w in enumerate(student.get('workshops', [])):
+            pdf_path = w.get('pdf_path')
+            btn_doc = styled(QPushButton(), "DocButton")
+            btn_doc.setCheckable(True)
+            btn_doc.setCursor(Qt.PointingHandCursor)
+            btn_doc.setEnabled(False)
+            btn_doc.setMinimumHeight(THUMB_SIZE.height() + 20)  # el layout interno no cuenta en el sizeHint del botón
+            
+            row = QHBoxLayout(btn_doc)
+            st = w.get('status', '-')
+            state = "ok" if st in ['Acreditado', 'Entregado'] else "pending"
+            
+            txt_ly = QVBoxLayout()
+            t1 = styled(QLabel(w.get('name', 'Actividad')), "DocTitle")
+            t2 = styled(QLabel(f"{st} · Verificando..." if pdf_path else "Sin archivo"), "DocStatus", state=state)
+            txt_ly.addWidget(t1); txt_ly.addWidget(t2)
+            
+            thumb = styled(QLabel("📄"), "DocThumb"); thumb.setFixedSize(THUMB_SIZE); thumb.setAlignment(Qt.AlignCenter)
+            eye = QLabel("👁️"); eye.setVisible(False)
+            row.addWidget(thumb); row.addLayout(txt_ly); row.addStretch(); row.addWidget(eye)
+            btn_doc.clicked.connect(lambda checked=False, b=btn_doc, p=pdf_path: self.preview_pdf(b, p))
+            self.docs_ly.insertWidget(i, btn_doc)
+            self.doc_rows.append({"path": pdf_path, "status": st, "button": btn_doc, "label": t2, "eye": eye, "thumb": thumb, "done": not pdf_path})
+            if not pdf_path: continue
+
+            info = file_status.cached(pdf_path)
+            if info is not None: self.on_file_status(i, pdf_path, info)
+            # Con una revisión de integridad reciente no se va al disco
+            if file_status.is_scanned(info) or (file_status.is_fresh(info) and not info["exists"]): continue
+            task = FileStatusTask(i, pdf_path)
+            task.signals.done.connect(self.on_file_status)
+            self._tasks.append(task)
+            FILE_POOL.start(task)
+
+        self.update_no_docs()
+
+    def release(self):
+        """Suelta todo lo del alumno actual: revisiones pendientes, botones y el PDF abierto"""
+        # Las revisiones pendientes siguen (llenan la caché) pero ya no avisan aquí
+        for task in self._tasks:
+            try: task.signals.done.disconnect(self.on_file_status)
+            except (RuntimeError, TypeError): pass
+        self._tasks = []
+        for row in self.doc_rows:
+            self.docs_ly.removeWidget(row["button"])
+            row["button"].deleteLater()
+        self.doc_rows = []
+        pdf_cache.show(self.pdf_viewer, None)
+        self.student = None
 
     def load_photo(self):
-        path = self.student.get('photo_path')
-        if path and os.path.exists(path): self.set_rounded_image(path)
+        # Avatar circular ya escalado del almacén de fotos (ver photo_store.py)
+        pixmap = photo_store.avatar(self.student.get('photo_path'), 90)
+        if pixmap is not None:
+            self.photo_lbl.setPixmap(pixmap)
+            set_style_prop(self.photo_lbl, "empty", False)
         else:
             self.photo_lbl.setText("👤")
-            self.photo_lbl.setStyleSheet("background-color: #f1f5f9; border-radius: 45px; border: 2px solid #e2e8f0; font-size: 40px; color: #cbd5e1;")
+            set_style_prop(self.photo_lbl, "empty", True)
             self.photo_lbl.setAlignment(Qt.AlignCenter)
 
     def upload_photo(self):
         path, _ = QFileDialog.getOpenFileName(self, "Seleccionar Foto", "", "Imágenes (*.png *.jpg *.jpeg)")
-        if path: self.student['photo_path'] = path; self.engine.save(); self.load_photo()
+        if not path: return
+        try: stored = photo_store.ingest(self.student.get('matricula', 'alumno'), path)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"No se pudo guardar la foto.\n{e}"); return
+        self.student['photo_path'] = stored; self.engine.save(); self.load_photo()
+
+    def on_file_status(self, i, path, info):
+        """Llega desde FILE_POOL: habilita el documento o lo marca sin archivo"""
+        if i >= len(self.doc_rows) or self.doc_rows[i]["path"] != path: return  # de otro alumno
+        row = self.doc_rows[i]
+        row["done"] = True
+        if info["exists"]:
+            row["label"].setText(f"{row['status']} · {file_status.describe(info)}")
+            row["button"].setEnabled(True); row["eye"].setVisible(True)
+            png = self.thumbs.cached(path)
+            if png: self.on_thumbnail(path, png)
+            else: self.thumbs.request(path)
+        else:
+            row["label"].setText("Sin archivo")
+            row["button"].setEnabled(False); row["eye"].setVisible(False)
+        self.update_no_docs()
+
+    def on_thumbnail(self, path, png):
+        pixmap = None
+        for row in self.doc_rows:
+            if row["path"] != path: continue
+            if pixmap is None:
+                pixmap = QPixmap(png).scaled(THUMB_SIZE * row["thumb"].devicePixelRatioF(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                pixmap.setDevicePixelRatio(row["thumb"].devicePixelRatioF())
+            row["thumb"].setPixmap(pixmap)
+
+    def update_no_docs(self):
+        # El aviso solo se muestra cuando ya se revisaron todos y ninguno existe
+        all_done = all(r["done"] for r in self.doc_rows)
+        self.lbl_no_docs.setVisible(all_done and not any(r["button"].isEnabled() for r in self.doc_rows))
 
     def preview_pdf(self, btn_sender, path):
         for i in range(self.docs_ly.count()):
             w = self.docs_ly.itemAt(i).widget()
             if isinstance(w, QPushButton): w.setChecked(False)
         btn_sender.setChecked(True)
-        try: self.pdf_document.load(path); self.right_stack.setCurrentIndex(1)
-        except Exception as e: QMessageBox.warning(self, "Error", f"No se pudo cargar el PDF.\n{e}")
+        # Los documentos recientes salen de la caché compartida sin volver a leerlos
+        if pdf_cache.show(self.pdf_viewer, path) is not None: self.right_stack.setCurrentIndex(1)
+        else: QMessageBox.warning(self, "Error", f"No se pudo cargar el PDF.\n{path}")
+
+# --- REVISIÓN DE ARCHIVOS (integridad y reubicación, ver file_integrity.py) ---
+class IntegrityDialog(QDialog):
+    def __init__(self, engine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.rows = []
+        self.index = None
+        self.scanner = None
+        self.setWindowTitle("Revisión de archivos")
+        self.setObjectName("IntegrityDialog")
+        self.resize(1000, 620)
+
+        ly = QVBoxLayout(self); ly.setContentsMargins(25, 25, 25, 25); ly.setSpacing(10)
+        ly.addWidget(styled(QLabel("🩺 Revisión de archivos"), "DialogTitle"))
+        ly.addWidget(styled(QLabel("Revisa las evidencias y fotos de todos los alumnos y busca las que cambiaron de carpeta\n"
+                                   "(por contenido o por nombre). Agrega la carpeta nueva si los archivos se movieron."), "DialogSubtitle"))
+
+        row = QHBoxLayout()
+        self.lbl_roots = QLabel()
+        btn_root = styled(QPushButton("➕ Carpeta de búsqueda"), "DialogCancel"); btn_root.clicked.connect(self.add_root)
+        row.addWidget(self.lbl_roots, stretch=1); row.addWidget(btn_root)
+        ly.addLayout(row)
+        self.extra_roots = []
+
+        self.progress = QProgressBar(); self.progress.setVisible(False)
+        ly.addWidget(self.progress)
+        self.lbl_summary = styled(QLabel(""), "IntegritySummary")
+        ly.addWidget(self.lbl_summary)
+
+        self.table = styled(QTableWidget(0, 5), "IntegrityTable")
+        self.table.setHorizontalHeaderLabels(["Matrícula", "Alumno", "Archivo", "Estado", "Nueva ubicación"])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        ly.addWidget(self.table)
+
+        btns = QHBoxLayout()
+        self.btn_scan = styled(QPushButton("🔎 Revisar"), "DialogCancel"); self.btn_scan.clicked.connect(self.start_scan)
+        self.btn_report = styled(QPushButton("💾 Guardar informe"), "DialogCancel"); self.btn_report.clicked.connect(self.save_report)
+        self.btn_apply = styled(QPushButton("🔁 Reubicar"), "DialogConfirm"); self.btn_apply.clicked.connect(self.apply_moves)
+        btn_close = styled(QPushButton("Cerrar"), "DialogCancel"); btn_close.clicked.connect(self.reject)
+        btns.addWidget(self.btn_scan); btns.addWidget(self.btn_report); btns.addStretch()
+        btns.addWidget(btn_close); btns.addWidget(self.btn_apply)
+        ly.addLayout(btns)
+
+        # Se muestra la última revisión guardada sin ir al disco
+        index = file_integrity.load_index()
+        if index["scanned_at"]: self.show_index(index)
+        else: self.update_buttons()
+        self.update_roots(index["roots"])
+
+    def update_roots(self, roots):
+        roots = list(dict.fromkeys(list(roots) + self.extra_roots))
+        self.lbl_roots.setText("Buscar también en: " + (", ".join(roots) if roots else "solo la carpeta del sistema"))
+
+    def add_root(self):
+        folder = QFileDialog.getExistingDirectory(self, "Carpeta donde buscar los archivos")
+        if not folder: return
+        self.extra_roots.append(folder)
+        self.update_roots(file_integrity.load_index()["roots"])
+        self.start_scan()
+
+    def start_scan(self):
+        if self.scanner is not None: return
+        paths = [p for p, *_ in file_integrity.references(self.engine.students)]
+        self.scanner = IntegrityScanner(paths, self.extra_roots, self)
+        self.scanner.progress.connect(self.on_progress)
+        self.scanner.done.connect(self.on_scanned)
+        self.progress.setVisible(True); self.progress.setRange(0, 0)
+        self.btn_scan.setEnabled(False); self.btn_apply.setEnabled(False)
+        self.scanner.start()
+
+    def on_progress(self, stage, done, total):
+        self.progress.setRange(0, max(total, 1)); self.progress.setValue(done)
+        self.lbl_summary.setText(f"{stage}... {done}/{total}")
+
+    def on_scanned(self, index):
+        self.scanner.wait(); self.scanner = None
+        self.progress.setVisible(False); self.btn_scan.setEnabled(True)
+        if "error" in index:
+            QMessageBox.critical(self, "Error", f"No se pudo revisar: {index['error']}")
+            self.update_buttons(); return
+        self.extra_roots = []
+        self.update_roots(index["roots"])
+        file_status.load_scan(index)
+        self.show_index(index)
+
+    def show_index(self, index):
+        self.index = index
+        self.rows = file_integrity.relocate(self.engine.students, index)
+        counts = file_integrity.summary(self.rows)
+        self.lbl_summary.setText(file_integrity.describe(counts))
+        problems = [r for r in self.rows if r["estado"] != file_integrity.OK]
+        self.table.setRowCount(len(problems))
+        colors = {file_integrity.MOVABLE: "#2563eb", file_integrity.AMBIGUOUS: "#d97706", file_integrity.LOST: "#dc2626"}
+        for i, r in enumerate(problems):
+            values = [r["matricula"], r["alumno"], os.path.basename(r["ruta"].replace("\\", "/")),
+                      f"{r['estado']} · {r['motivo']}", r["nueva_ruta"]]
+            for c, value in enumerate(values):
+                item = QTableWidgetItem(value); item.setToolTip(r["ruta"] if c == 2 else value)
+                if c == 3: item.setForeground(QBrush(QColor(colors[r["estado"]])))
+                self.table.setItem(i, c, item)
+        self.update_buttons()
+
+    def update_buttons(self):
+        movable = sum(1 for r in self.rows if r["estado"] == file_integrity.MOVABLE)
+        self.btn_apply.setText(f"🔁 Reubicar ({movable})")
+        self.btn_apply.setEnabled(movable > 0 and self.scanner is None)
+        self.btn_report.setEnabled(bool(self.rows))
+
+    def apply_moves(self):
+        changed = file_integrity.apply(self.rows, self.index)
+        if not changed: return
+        try:
+            self.engine.save()
+            file_integrity.save_index(self.index)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error al guardar: {e}"); return
+        file_status.load_scan(self.index)
+        self.show_index(self.index)
+        QMessageBox.information(self, "Reubicación", f"Se actualizaron {changed} rutas.")
+
+    def save_report(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Guardar informe", "informe_archivos.csv", "CSV (*.csv)")
+        if not path: return
+        try: file_integrity.write_report(self.rows, path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar el informe.\n{e}")
+
+    def reject(self):
+        # Cerrar a media revisión la cancela: no queda un hilo escribiendo el índice
+        if self.scanner is not None:
+            self.scanner.done.disconnect(self.on_scanned)
+            self.scanner.requestInterruption(); self.scanner.wait(); self.scanner = None
+        super().reject()
+
 
 # --- PÁGINA EXPEDIENTE (AQUÍ ESTÁ LA NUEVA LÓGICA DE FILTROS) ---
 class ExpedientePage(QWidget):
     def __init__(self, engine):
         super().__init__()
         self.engine = engine
-        self.setStyleSheet("background-color: #f1f5f9;") 
+        self.detail_dialog = None
+        self.indexer = None     # TextIndexer en curso
+        self.text_conn = None   # conexión de solo lectura al índice de texto
+        self.setObjectName("ExpedientePage")
         self.setup_ui()
-        self.apply_filter()
 
     def create_line(self):
-        line = QFrame(); line.setFrameShape(QFrame.HLine); line.setStyleSheet("background-color: #e2e8f0; max-height: 1px; border: none; margin: 10px 0;")
+        line = styled(QFrame(), "Divider"); line.setFrameShape(QFrame.HLine)
         return line
 
     def setup_ui(self):
         ly = QVBoxLayout(self); ly.setContentsMargins(30, 30, 30, 30); ly.setSpacing(15)
 
         h_ly = QHBoxLayout()
-        icon_h = QLabel("📂"); icon_h.setFixedSize(45, 45); icon_h.setAlignment(Qt.AlignCenter); icon_h.setStyleSheet("background-color: white; border: 1px solid #e2e8f0; border-radius: 8px; font-size: 20px;")
-        t_ly = QVBoxLayout(); t = QLabel("Expediente General"); t.setStyleSheet("font-size: 24px; font-weight: bold; color: #0f172a; border: none;"); s = QLabel("Consulta de documentos"); s.setStyleSheet("color: #64748b; border: none;")
+        icon_h = styled(QLabel("📂"), "HeaderIcon"); icon_h.setFixedSize(45, 45); icon_h.setAlignment(Qt.AlignCenter)
+        t_ly = QVBoxLayout(); t = styled(QLabel("Expediente General"), "PageTitle"); s = styled(QLabel("Consulta de documentos"), "PageSubtitle")
         t_ly.addWidget(t); t_ly.addWidget(s)
-        h_ly.addWidget(icon_h); h_ly.addLayout(t_ly); h_ly.addStretch(); ly.addLayout(h_ly); ly.addWidget(self.create_line())
+        btn_check = styled(QPushButton("🩺 Revisar archivos"), "RefreshButton"); btn_check.setCursor(Qt.PointingHandCursor)
+        btn_check.clicked.connect(self.open_integrity)
+        h_ly.addWidget(icon_h); h_ly.addLayout(t_ly); h_ly.addStretch(); h_ly.addWidget(btn_check); ly.addLayout(h_ly); ly.addWidget(self.create_line())
 
         # --- TARJETA DE FILTROS (RENOVADA) ---
-        f_card = QFrame(); f_card.setStyleSheet("QFrame { background: white; border-radius: 12px; border: 1px solid #e2e8f0; } QLabel { color: #64748b; font-weight: bold; border: none; }")
+        f_card = styled(QFrame(), "ExpedienteFilters")
         card_ly = QVBoxLayout(f_card); card_ly.setContentsMargins(15, 15, 15, 15); card_ly.setSpacing(10)
         
         # FILA 1: Búsqueda por Texto
         row1 = QHBoxLayout()
-        self.search_input = QLineEdit()
+        self.search_input = styled(QLineEdit(), "ExpedienteSearch")
         self.search_input.setPlaceholderText("🔍 Buscar alumno por nombre o matrícula...")
-        self.search_input.setStyleSheet("font-size: 14px; padding: 6px;")
         self.search_input.textChanged.connect(self.apply_filter) # Búsqueda en tiempo real
         row1.addWidget(self.search_input)
+
+        # Búsqueda dentro de los PDFs (índice de texto, ver text_index.py)
+        self.text_search = styled(QLineEdit(), "ExpedienteSearch")
+        self.text_search.setPlaceholderText("📄 Buscar dentro de los documentos (ej. ajedrez noviembre)...")
+        self.text_timer = QTimer(self); self.text_timer.setSingleShot(True); self.text_timer.setInterval(TEXT_SEARCH_DELAY)
+        self.text_timer.timeout.connect(self.apply_filter)
+        self.text_search.textChanged.connect(lambda _: self.text_timer.start())
+        row1.addWidget(self.text_search)
         
         # FILA 2: Filtros Desplegables
         row2 = QHBoxLayout()
         self.f_sem = QComboBox(); self.f_sem.addItems(["Todos los Semestres"] + [str(i) for i in range(1,10)])
         
-        # Poblar Carreras dinámicamente
+        # Poblar Carreras dinámicamente (ver load_careers)
         self.f_career = QComboBox()
         self.f_career.addItem("Todas las Carreras")
-        careers = sorted(list(set(s.get('career', '') for s in self.engine.students if s.get('career'))))
-        self.f_career.addItems(careers)
         
         self.f_cyc = QComboBox(); self.f_cyc.addItems(["Todos los Ciclos", "2024-1", "2024-2", "2025-1", "2025-2", "2026-1"])
         
-        btn_refresh = QPushButton("🔄 Actualizar")
+        btn_refresh = styled(QPushButton("🔄 Actualizar"), "RefreshButton")
         btn_refresh.setCursor(Qt.PointingHandCursor)
-        btn_refresh.setStyleSheet("background-color: #3b82f6; color: white;")
         btn_refresh.clicked.connect(self.apply_filter)
         
         row2.addWidget(QLabel("Semestre:")); row2.addWidget(self.f_sem)
@@ -249,17 +452,93 @@ class ExpedientePage(QWidget):
         
         card_ly.addLayout(row1)
         card_ly.addLayout(row2)
+        self.lbl_index = styled(QLabel(""), "IndexStatus")
+        card_ly.addWidget(self.lbl_index)
         ly.addWidget(f_card)
 
         # Tabla
-        self.stack = QStackedWidget(); self.stack.setStyleSheet("background: transparent;")
-        self.table = QTableWidget(0, 6); self.table.setHorizontalHeaderLabels(["MATRÍCULA", "NOMBRE", "CARRERA", "SEM", "CICLO", "ACCIONES"])
+        self.stack = styled(QStackedWidget(), "ExpedienteResults")
+        self.table = styled(QTableWidget(0, 6), "ExpedienteTable"); self.table.setHorizontalHeaderLabels(["MATRÍCULA", "NOMBRE", "CARRERA", "SEM", "CICLO", "ACCIONES"])
         self.table.verticalHeader().setVisible(False); self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch); self.table.setSelectionBehavior(QAbstractItemView.SelectRows); self.table.setShowGrid(False); self.table.setFocusPolicy(Qt.NoFocus); self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.cellDoubleClicked.connect(self.open_student_profile)
-        self.table.setStyleSheet("QTableWidget { background: white; border-radius: 10px; border: none; } QHeaderView::section { background-color: #f8fafc; color: #0f172a; padding: 12px; font-weight: bold; border-bottom: 2px solid #e2e8f0; border: none;} QTableWidget::item { padding: 10px; border-bottom: 1px solid #f1f5f9; } QTableWidget::item:selected { background-color: #eff6ff; color: #1e40af; }")
+        # Scroll infinito + orden por encabezado (CICLO y ACCIONES no ordenan)
+        self.pager = TablePager(self.table, self.fill_row, {
+            0: "matricula", 1: "nombre", 2: "carrera", 3: "semestre"
+        }, self.apply_filter)
         
-        self.empty = QWidget(); el = QVBoxLayout(self.empty); el.setAlignment(Qt.AlignCenter); el.addWidget(QLabel("No se encontraron resultados.", styleSheet="color: #94a3b8; font-weight: bold; border: none;"))
-        self.stack.addWidget(self.table); self.stack.addWidget(self.empty); ly.addWidget(self.stack)
+        self.empty = QWidget(); el = QVBoxLayout(self.empty); el.setAlignment(Qt.AlignCenter); el.addWidget(styled(QLabel("No se encontraron resultados."), "EmptyMessage"))
+        self.stack.addWidget(self.table); self.stack.addWidget(self.empty)
+
+        # Resultados de la búsqueda en documentos: doble clic abre el expediente en ese PDF
+        self.hits_table = styled(QTableWidget(0, 5), "ExpedienteTable")
+        self.hits_table.setHorizontalHeaderLabels(["MATRÍCULA", "NOMBRE", "ACTIVIDAD", "FECHA", "COINCIDENCIA"])
+        self.hits_table.verticalHeader().setVisible(False); self.hits_table.setShowGrid(False)
+        self.hits_table.setEditTriggers(QAbstractItemView.NoEditTriggers); self.hits_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.hits_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.hits_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        self.hits_table.cellDoubleClicked.connect(self.open_hit)
+        self.hits = []
+        self.stack.addWidget(self.hits_table)
+        ly.addWidget(self.stack)
+
+    def refresh(self):
+        """Recarga las carreras (los datos pueden llegar después de construir la página) y filtra"""
+        self.load_careers()
+        self.apply_filter()
+        self.start_indexing()
+
+    # --- ÍNDICE DE TEXTO ---
+    def start_indexing(self):
+        """Pone al día el índice de texto en segundo plano (solo lee lo nuevo)"""
+        if self.indexer is not None or not self.engine.loaded: return
+        self.indexer = TextIndexer(text_index.targets(self.engine.students), self)
+        self.indexer.progress.connect(self.on_index_progress)
+        self.indexer.done.connect(self.on_indexed)
+        self.indexer.start()
+
+    def on_index_progress(self, done, total):
+        self.lbl_index.setText(f"Indexando documentos para la búsqueda... {done}/{total}")
+
+    def on_indexed(self, report):
+        self.indexer.wait(); self.indexer.deleteLater(); self.indexer = None
+        if "error" in report:
+            self.lbl_index.setText(f"Búsqueda en documentos no disponible: {report['error']}"); return
+        text = f"Búsqueda en documentos: {report['documentos']} documentos indexados"
+        if report["errores"]: text += f" · {report['errores']} no se pudieron leer"
+        self.lbl_index.setText(text)
+        if report["nuevos"] and self.text_search.text().strip(): self.apply_filter()
+
+    def search_documents(self, query, match):
+        """Filas de text_index.hits de los alumnos que pasan los filtros"""
+        try:
+            if self.text_conn is None: self.text_conn = text_index.connect()
+            found = text_index.search(self.text_conn, query)
+        except Exception as e:
+            self.lbl_index.setText(f"Búsqueda en documentos no disponible: {e}"); return []
+        return [h for h in text_index.hits(self.text_conn, self.engine.students, found) if match(h["_alumno"])]
+
+    def show_hits(self, hits):
+        self.hits = hits
+        self.hits_table.setRowCount(len(hits))
+        for r, h in enumerate(hits):
+            for c, key in enumerate(("matricula", "alumno", "taller", "fecha", "fragmento")):
+                item = QTableWidgetItem(h[key]); item.setToolTip(h["ruta"] if c == 2 else h[key])
+                self.hits_table.setItem(r, c, item)
+
+    def open_hit(self, r, c):
+        hit = self.hits[r]
+        dlg = self.dialog_for(hit["_alumno"])
+        row = next((x for x in dlg.doc_rows if x["path"] == hit["ruta"]), None)
+        if row is not None: dlg.preview_pdf(row["button"], hit["ruta"])
+        dlg.exec()
+
+    def load_careers(self):
+        current = self.f_career.currentText()
+        careers = sorted(list(set(s.get('career', '') for s in self.engine.students if s.get('career'))))
+        self.f_career.clear()
+        self.f_career.addItem("Todas las Carreras")
+        self.f_career.addItems(careers)
+        self.f_career.setCurrentIndex(max(self.f_career.findText(current), 0))
 
     def apply_filter(self):
         # 1. Obtener valores de los controles
@@ -268,43 +547,64 @@ class ExpedientePage(QWidget):
         car_f = self.f_career.currentText()
         cyc_f = self.f_cyc.currentText()
         
-        self.table.setRowCount(0); found = 0
-        st = self.engine.students if hasattr(self.engine, 'students') else []
-        
-        for s in st:
+        def match(s, text=True):
             # Regla Base: Solo mostrar si tiene documentos (Si quieres ver a todos, borra esta línea)
-            if not any(w.get('pdf_path') for w in s.get('workshops', [])): continue
+            if not any(w.get('pdf_path') for w in s.get('workshops', [])): return False
 
             # 2. Filtro por Texto (Nombre o Matrícula)
-            full_name = f"{s.get('nombres','')} {s.get('apellidoPaterno','')} {s.get('apellidoMaterno','')}".lower()
-            mat = str(s.get('matricula', '')).lower()
-            
-            if search_txt and (search_txt not in mat and search_txt not in full_name):
-                continue
+            if text and search_txt:
+                full_name = f"{s.get('nombres','')} {s.get('apellidoPaterno','')} {s.get('apellidoMaterno','')}".lower()
+                mat = str(s.get('matricula', '')).lower()
+                if search_txt not in mat and search_txt not in full_name: return False
 
             # 3. Filtros Desplegables
-            s_sem = str(s.get('semestre', '1'))
-            s_car = str(s.get('career', ''))
-            s_cyc = str(s.get('schoolCycle', ''))
-            
-            if sem_f != "Todos los Semestres" and s_sem != sem_f: continue
-            if car_f != "Todas las Carreras" and s_car != car_f: continue
-            if cyc_f != "Todos los Ciclos" and s_cyc != cyc_f: continue
-            
-            # 4. Insertar Fila
-            found += 1; r = self.table.rowCount(); self.table.insertRow(r)
-            self.table.setItem(r, 0, QTableWidgetItem(s.get('matricula')))
-            self.table.setItem(r, 1, QTableWidgetItem(full_name.upper()))
-            self.table.setItem(r, 2, QTableWidgetItem(s.get('career')))
-            self.table.setItem(r, 3, QTableWidgetItem(str(s.get('semestre'))))
-            self.table.setItem(r, 4, QTableWidgetItem(s.get('schoolCycle')))
-            
-            btn = QPushButton("👁️ Ver"); btn.setCursor(Qt.PointingHandCursor); btn.setStyleSheet("background: #f1f5f9; border: 1px solid #cbd5e1; padding: 5px;")
-            btn.clicked.connect(lambda _, x=s: self.open_dialog(x))
-            w = QWidget(); l = QHBoxLayout(w); l.setContentsMargins(0,0,0,0); l.setAlignment(Qt.AlignCenter); l.addWidget(btn); self.table.setCellWidget(r, 5, w)
-            self.table.item(r, 0).setData(Qt.UserRole, s)
-            
-        self.stack.setCurrentIndex(0 if found > 0 else 1)
+            if sem_f != "Todos los Semestres" and str(s.get('semestre', '1')) != sem_f: return False
+            if car_f != "Todas las Carreras" and str(s.get('career', '')) != car_f: return False
+            if cyc_f != "Todos los Ciclos" and str(s.get('schoolCycle', '')) != cyc_f: return False
+            return True
+
+        # Búsqueda dentro de los documentos: los filtros desplegables siguen aplicando
+        query = self.text_search.text().strip()
+        if query:
+            hits = self.search_documents(query, match)
+            self.show_hits(hits)
+            self.stack.setCurrentIndex(2 if hits else 1)
+            return
+
+        # 4. El motor filtra y ordena; las filas (y sus botones) se crean por páginas
+        rows = self.engine.query(match, self.pager.sort, self.pager.descending)
+        self.pager.reset(rows)
+        self.stack.setCurrentIndex(0 if rows else 1)
+
+        # Al elegir una carrera o un ciclo se preparan sus miniaturas en segundo plano
+        if car_f != "Todas las Carreras" or cyc_f != "Todos los Ciclos":
+            thumbnail_service().prewarm(rows)
+
+    def fill_row(self, r, s):
+        full_name = f"{s.get('nombres','')} {s.get('apellidoPaterno','')} {s.get('apellidoMaterno','')}"
+        self.table.setItem(r, 0, QTableWidgetItem(s.get('matricula')))
+        self.table.setItem(r, 1, QTableWidgetItem(full_name.upper()))
+        self.table.setItem(r, 2, QTableWidgetItem(s.get('career')))
+        self.table.setItem(r, 3, QTableWidgetItem(str(s.get('semestre'))))
+        self.table.setItem(r, 4, QTableWidgetItem(s.get('schoolCycle')))
+        
+        btn = styled(QPushButton("👁️ Ver"), "RowButton"); btn.setCursor(Qt.PointingHandCursor)
+        btn.clicked.connect(lambda _, x=s: self.open_dialog(x))
+        w = QWidget(); l = QHBoxLayout(w); l.setContentsMargins(0,0,0,0); l.setAlignment(Qt.AlignCenter); l.addWidget(btn); self.table.setCellWidget(r, 5, w)
+        self.table.item(r, 0).setData(Qt.UserRole, s)
 
     def open_student_profile(self, r, c): self.open_dialog(self.table.item(r, 0).data(Qt.UserRole))
-    def open_dialog(self, s): d = StudentDetailDialog(s, self.engine, self); d.exec(); self.apply_filter()
\ No newline at end of file
+
+    def dialog_for(self, s):
+        """Diálogo único de la página, ya ligado al alumno (se crea la primera vez)"""
+        if self.detail_dialog is None: self.detail_dialog = StudentDetailDialog(self.engine, self)
+        self.detail_dialog.bind(s)
+        return self.detail_dialog
+
+    def open_dialog(self, s): self.dialog_for(s).exec(); self.apply_filter()
+
+    def open_integrity(self):
+        dlg = IntegrityDialog(self.engine, self)
+        dlg.exec()
+        dlg.deleteLater()
+        self.apply_filter()
\ No newline at end of file
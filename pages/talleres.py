@@ -1,30 +1,296 @@
 import sys
 import os
-import shutil
 import webbrowser
 from datetime import datetime
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
     QListWidget, QListWidgetItem, QFrame, QFileDialog, QMessageBox, 
     QTableWidget, QHeaderView, QTableWidgetItem, QAbstractItemView,
-    QComboBox, QProgressBar, QRadioButton, QButtonGroup, QStackedWidget
+    QComboBox, QProgressBar, QRadioButton, QButtonGroup, QStackedWidget,
+    QDialog, QCheckBox
 )
-from PySide6.QtCore import Qt, QUrl, QSize
+from PySide6.QtCore import Qt, QUrl, QSize, QTimer, QFileSystemWatcher
 from PySide6.QtGui import QColor, QBrush, QIcon, QFont
+import evidence_ingest
+import evidence_match
+import evidence_store
+from styles import styled, set_style_prop
+from workers import EvidenceIngest, EvidenceScan
+
+# Visor progresivo (baja resolución primero, cancelable); ver components.py
+from components import ProgressivePdfView
+
+CATEGORIES = ["Cultural", "Deportivo", "Académico", "Otro"]
+
+
+# --- CARGA MASIVA DE EVIDENCIAS ---
+# Columnas de la tabla de propuestas
+COL_CHECK, COL_FILE, COL_MAT, COL_NAME, COL_MATCH = range(5)
+
+# Carpeta vigilada: se espera a que el tamaño de un PDF nuevo no cambie (se está copiando)
+WATCH_SETTLE_MS = 1500
+
+
+class BulkEvidenceDialog(QDialog):
+    """Carpeta de PDFs escaneados -> alumno propuesto por archivo (evidence_match.py).
+    Las filas marcadas se procesan en paralelo (evidence_ingest.py) y se guardan en una
+    sola escritura de la base."""
+    def __init__(self, engine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.setWindowTitle("Carga masiva de evidencias")
+        self.setObjectName("BulkEvidenceDialog")
+        self.resize(980, 620)
+
+        self.folder = ""
+        self.seen = set()     # rutas ya agregadas a la tabla
+        self.sizes = {}       # ruta -> tamaño en la última revisión (carpeta vigilada)
+        self.pending = {}     # ruta -> matrícula, al aprobar
+        self.results = {}     # ruta -> resultado de evidence_ingest
+        self.scan = EvidenceScan(self); self.scan.found.connect(self.on_found)
+        self.ingest = EvidenceIngest(self); self.ingest.done.connect(self.on_ingested)
+        self.watcher = QFileSystemWatcher(self)
+        self.settle = QTimer(self); self.settle.setSingleShot(True); self.settle.setInterval(WATCH_SETTLE_MS)
+        self.settle.timeout.connect(self.rescan)
+        self.watcher.directoryChanged.connect(lambda _: self.settle.start())
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(25, 25, 25, 25); layout.setSpacing(10)
+        layout.addWidget(styled(QLabel("📥 Carga masiva de evidencias"), "DialogTitle"))
+        layout.addWidget(styled(QLabel("Se busca la matrícula o el nombre del alumno en el nombre de cada archivo y en su texto.\n"
+                                       "Las coincidencias seguras quedan marcadas; corrige la matrícula de las demás."), "DialogSubtitle"))
+
+        row = QHBoxLayout()
+        self.lbl_folder = QLabel("Sin carpeta")
+        btn_folder = styled(QPushButton("📂 Elegir carpeta"), "DialogCancel"); btn_folder.clicked.connect(self.choose_folder)
+        self.chk_watch = QCheckBox("Vigilar la carpeta (agregar los PDFs nuevos)")
+        self.chk_watch.toggled.connect(self.set_watch)
+        row.addWidget(self.lbl_folder, stretch=1); row.addWidget(self.chk_watch); row.addWidget(btn_folder)
+        layout.addLayout(row)
+
+        # Actividad: la misma para todo el lote
+        row = QHBoxLayout()
+        self.txt_name = QLineEdit(); self.txt_name.setPlaceholderText("Nombre del Taller / Actividad...")
+        self.combo_value = QComboBox(); self.combo_value.addItems(["Crédito Completo (1.0)", "Constancia / Participación (0.5)"])
+        self.combo_cat = styled(QComboBox(), "CategoryCombo"); self.combo_cat.addItems(CATEGORIES)
+        row.addWidget(self.txt_name, stretch=1); row.addWidget(self.combo_value); row.addWidget(self.combo_cat)
+        layout.addLayout(row)
+
+        self.table = styled(QTableWidget(0, 5), "BulkTable")
+        self.table.setHorizontalHeaderLabels(["", "Archivo", "Matrícula", "Alumno", "Coincidencia"])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(COL_CHECK, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(COL_FILE, QHeaderView.Stretch)
+        header.setSectionResizeMode(COL_NAME, QHeaderView.Stretch)
+        self.table.itemChanged.connect(self.on_item_changed)
+        layout.addWidget(self.table)
+
+        self.lbl_status = styled(QLabel(""), "BulkStatus")
+        layout.addWidget(self.lbl_status)
+
+        row = QHBoxLayout()
+        self.chk_move = QCheckBox(f"Mover los archivos registrados a la subcarpeta {evidence_match.DONE_DIR}")
+        self.chk_move.setChecked(True)
+        self.btn_close = styled(QPushButton("Cerrar"), "DialogCancel"); self.btn_close.clicked.connect(self.reject)
+        self.btn_approve = styled(QPushButton("✅ Registrar marcadas"), "DialogConfirm"); self.btn_approve.clicked.connect(self.approve)
+        row.addWidget(self.chk_move, stretch=1); row.addWidget(self.btn_close); row.addWidget(self.btn_approve)
+        layout.addLayout(row)
+        self.update_status()
+
+    # --- CARPETA ---
+    def choose_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Carpeta con evidencias escaneadas", self.folder)
+        if folder: self.open_folder(folder)
+
+    def open_folder(self, folder):
+        if self.pending: return
+        if self.folder in self.watcher.directories(): self.watcher.removePath(self.folder)
+        self.folder = folder
+        self.seen.clear(); self.sizes.clear()
+        self.table.setRowCount(0)
+        self.lbl_folder.setText(f"📁 {folder}")
+        self.set_watch(self.chk_watch.isChecked())
+        self.rescan(wait=False)
+
+    def set_watch(self, on):
+        if not self.folder: return
+        if on and self.folder not in self.watcher.directories(): self.watcher.addPath(self.folder)
+        elif not on and self.folder in self.watcher.directories(): self.watcher.removePath(self.folder)
+
+    def rescan(self, wait=True):
+        """Agrega a la tabla los PDFs nuevos de la carpeta y los manda a leer"""
+        new, copying = [], False
+        for path in evidence_match.pending_files(self.folder):
+            if path in self.seen: continue
+            try: size = os.path.getsize(path)
+            except OSError: continue
+            if wait and self.sizes.get(path) != size:
+                self.sizes[path] = size; copying = True; continue
+            new.append(path)
+        if copying: self.settle.start()
+        if not new: return
+        self.table.blockSignals(True)
+        for path in new:
+            self.seen.add(path)
+            r = self.table.rowCount(); self.table.insertRow(r)
+            check = QTableWidgetItem(); check.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled); check.setCheckState(Qt.Unchecked)
+            name = QTableWidgetItem(os.path.basename(path)); name.setData(Qt.UserRole, path)
+            self.table.setItem(r, COL_CHECK, check)
+            self.table.setItem(r, COL_FILE, name)
+            self.table.setItem(r, COL_MAT, QTableWidgetItem(""))
+            self.table.setItem(r, COL_NAME, QTableWidgetItem(""))
+            self.table.setItem(r, COL_MATCH, QTableWidgetItem("⏳ Leyendo..."))
+            for c in (COL_FILE, COL_NAME, COL_MATCH): self.table.item(r, c).setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
+        self.table.blockSignals(False)
+        self.scan.add(new)
+        self.update_status()
+
+    def row_of(self, path):
+        for r in range(self.table.rowCount()):
+            if self.table.item(r, COL_FILE).data(Qt.UserRole) == path: return r
+        return -1
+
+    # --- PROPUESTAS ---
+    def set_student(self, r, student, reason, sure):
+        self.table.blockSignals(True)
+        self.table.item(r, COL_MAT).setText(str(student.get('matricula', '')) if student else self.table.item(r, COL_MAT).text())
+        self.table.item(r, COL_NAME).setText(
+            f"{student.get('nombres', '')} {student.get('apellidoPaterno', '')} {student.get('apellidoMaterno', '')}".strip() if student else "")
+        self.table.item(r, COL_MATCH).setText(("✅ " if sure else "⚠️ ") + reason)
+        self.table.item(r, COL_CHECK).setCheckState(Qt.Checked if sure and student else Qt.Unchecked)
+        self.table.blockSignals(False)
+
+    def on_found(self, found):
+        r = self.row_of(found["ruta"])
+        if r < 0: return
+        m = evidence_match.match(found, self.engine.indexes())
+        reason = m["motivo"]
+        if not m["alumno"] and m["candidatos"]:
+            reason += ": " + ", ".join(str(s.get('matricula')) for s in m["candidatos"][:4])
+        self.set_student(r, m["alumno"], reason, m["seguro"])
+        self.update_status()
+
+    def on_item_changed(self, item):
+        r = item.row()
+        if item.column() == COL_MAT:
+            # Corrección manual de la matrícula
+            student = self.engine.indexes()[0].get(item.text().strip().upper())
+            self.set_student(r, student, "Asignado a mano" if student else "La matrícula no existe", bool(student))
+        elif item.column() == COL_CHECK and item.checkState() == Qt.Checked:
+            if not self.engine.indexes()[0].get(self.table.item(r, COL_MAT).text().strip().upper()):
+                self.table.blockSignals(True); item.setCheckState(Qt.Unchecked); self.table.blockSignals(False)
+        self.update_status()
+
+    def checked(self):
+        """[(ruta, matrícula)] de las filas marcadas"""
+        out = []
+        for r in range(self.table.rowCount()):
+            if self.table.item(r, COL_CHECK).checkState() == Qt.Checked:
+                out.append((self.table.item(r, COL_FILE).data(Qt.UserRole), self.table.item(r, COL_MAT).text().strip().upper()))
+        return out
+
+    def update_status(self):
+        if self.pending:
+            self.lbl_status.setText(f"Procesando evidencias... {len(self.results)}/{len(self.pending)}")
+            return
+        total = self.table.rowCount()
+        reading = sum(1 for r in range(total) if self.table.item(r, COL_MATCH).text().startswith("⏳"))
+        marked = len(self.checked())
+        self.lbl_status.setText(f"{total} archivos | leyendo: {reading} | marcados: {marked}" if total else "Elige una carpeta con PDFs.")
+        self.btn_approve.setText(f"✅ Registrar marcadas ({marked})")
+        self.btn_approve.setEnabled(marked > 0)
+
+    # --- APROBAR Y GUARDAR ---
+    def approve(self):
+        name = self.txt_name.text().strip().upper()
+        if not name:
+            QMessageBox.warning(self, "Nombre Requerido", "Escribe el nombre de la actividad del lote.")
+            return
+        picks = self.checked()
+        if not picks or self.pending: return
+        self.pending = dict(picks); self.results = {}
+        self.set_busy(True)
+        for path, _ in picks: self.table.item(self.row_of(path), COL_MATCH).setText("⏳ Procesando...")
+        self.update_status()
+        self.ingest.add(list(self.pending))
+
+    def set_busy(self, busy):
+        for w in (self.btn_approve, self.btn_close, self.txt_name, self.combo_value, self.combo_cat, self.chk_move):
+            w.setEnabled(not busy)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers if busy else QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
+
+    def on_ingested(self, result):
+        path = result["origen"]
+        if path not in self.pending: return
+        self.results[path] = result
+        r = self.row_of(path)
+        if r >= 0:
+            self.table.item(r, COL_MATCH).setText(
+                f"📄 {evidence_ingest.describe(result['meta'])}" if result["ok"] else f"❌ {result['error']}")
+        self.update_status()
+        if len(self.results) == len(self.pending): self.commit()
+
+    def commit(self):
+        """Agrega todas las entradas y guarda la base una sola vez"""
+        by_mat = self.engine.indexes()[0]
+        used = evidence_store.usage(self.engine.students)
+        base = {"name": self.txt_name.text().strip().upper(), "category": self.combo_cat.currentText(),
+                "value": 1.0 if self.combo_value.currentIndex() == 0 else 0.5,
+                "date": datetime.now().strftime("%Y-%m-%d"), "status": "Acreditado"}
+        added, skipped = [], {}
+        for path, mat in self.pending.items():
+            result, student = self.results[path], by_mat.get(mat)
+            if not result["ok"] or student is None:
+                skipped[path] = result["error"] or "sin alumno"; continue
+            digests = {result["sha256"], result["sha256_original"]}
+            users = [u for d in digests for u in used.get(d, ())]
+            if users:
+                others = ", ".join(sorted({str(s.get('matricula')) for s, _ in users}))
+                skipped[path] = f"ya es evidencia de {others}"; continue
+            entry = dict(base, pdf_path=result["ruta"], sha256=result["sha256"], sha256_original=result["sha256_original"],
+                         **{k: result["meta"][k] for k in evidence_ingest.META_KEYS})
+            student.setdefault('workshops', []).append(entry)
+            for d in digests: used.setdefault(d, []).append((student, entry))
+            added.append(path)
+
+        try:
+            if added: self.engine.save()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error al guardar: {e}")
+            added = []
+
+        moved_errors = 0
+        if self.chk_move.isChecked():
+            for path in added:
+                try: evidence_match.move_done(path)
+                except OSError: moved_errors += 1
+        for path in added:
+            r = self.row_of(path)
+            if r >= 0: self.table.removeRow(r)
+        self.table.blockSignals(True)
+        for path, reason in skipped.items():
+            r = self.row_of(path)
+            if r < 0: continue
+            self.table.item(r, COL_CHECK).setCheckState(Qt.Unchecked)
+            self.table.item(r, COL_MATCH).setText(f"⚠️ {reason}")
+        self.table.blockSignals(False)
+
+        self.pending = {}; self.results = {}
+        self.set_busy(False)
+        self.update_status()
+        text = f"Actividades registradas: {len(added)}"
+        lines = [f"• {os.path.basename(path)}: {reason}" for path, reason in skipped.items()]
+        if skipped: text += f"\n\nNo registradas ({len(skipped)}):\n" + "\n".join(lines[:15])
+        if len(skipped) > 15: text += f"\n• ... y {len(skipped) - 15} más"
+        if moved_errors: text += f"\n\n{moved_errors} archivos no se pudieron mover a {evidence_match.DONE_DIR}."
+        (QMessageBox.warning if skipped else QMessageBox.information)(self, "Carga masiva", text)
+
+    def reject(self):
+        if self.pending: return  # procesando: se cierra al terminar
+        super().reject()
 
-# --- IMPORTAMOS MÓDULOS PDF ---
-try:
-    from PySide6.QtPdf import QPdfDocument
-    from PySide6.QtPdfWidgets import QPdfView
-except ImportError:
-    class QPdfDocument(QWidget): 
-        def load(self, p): pass
-        def close(self): pass
-    class QPdfView(QWidget): 
-        class ZoomMode: FitToWidth = 0
-        def setDocument(self, d): pass
-        def setPageMode(self, m): pass
-        def setZoomMode(self, m): pass
 
 class TalleresPage(QWidget):
     def __init__(self, engine):
@@ -32,22 +298,14 @@ class TalleresPage(QWidget):
         self.engine = engine
         self.current_student = None
         self.temp_pdf_path = None
+        self.ingest = None          # EvidenceIngest (se crea al primer uso)
+        self.bulk = None            # BulkEvidenceDialog abierto
+        self.pending_credit = None  # (alumno, crédito) que se guarda al terminar de procesar la evidencia
         
-        # Estilos modernos
-        self.setStyleSheet("""
-            QWidget { background-color: #f8fafc; font-family: 'Segoe UI'; font-size: 14px; }
-            QFrame#Panel { background: white; border-radius: 12px; border: 1px solid #e2e8f0; }
-            QLineEdit { background: #f1f5f9; border: 1px solid #cbd5e1; padding: 10px; border-radius: 8px; }
-            QLineEdit:focus { border: 2px solid #3b82f6; background: white; }
-            QListWidget { border: none; background: transparent; }
-            QListWidget::item { padding: 12px; border-bottom: 1px solid #f1f5f9; color: #334155; margin-bottom: 4px; border-radius: 6px;}
-            QListWidget::item:selected { background: #eff6ff; color: #1e40af; border-left: 4px solid #3b82f6; }
-            QListWidget::item:hover { background: #f8fafc; }
-            QRadioButton { spacing: 8px; color: #475569; }
-        """)
+        # Estilos modernos (ver #TalleresPage en styles.py)
+        self.setObjectName("TalleresPage")
         
         self.setup_ui()
-        self.refresh_student_list()
 
     def setup_ui(self):
         main_ly = QVBoxLayout(self)
@@ -55,10 +313,12 @@ class TalleresPage(QWidget):
         
         # HEADER
         header = QHBoxLayout()
-        title = QLabel("Gestión de Créditos Complementarios")
-        title.setStyleSheet("font-size: 24px; font-weight: 800; color: #1e293b;")
+        title = styled(QLabel("Gestión de Créditos Complementarios"), "PageTitle")
         header.addWidget(title)
         header.addStretch()
+        btn_bulk = styled(QPushButton("📥 Carga masiva"), "BulkButton"); btn_bulk.setCursor(Qt.PointingHandCursor)
+        btn_bulk.clicked.connect(self.open_bulk)
+        header.addWidget(btn_bulk)
         main_ly.addLayout(header)
         main_ly.addSpacing(15)
 
@@ -88,25 +348,23 @@ class TalleresPage(QWidget):
         # Vista Vacía
         self.empty_view = QFrame(); self.empty_view.setObjectName("Panel")
         ev_ly = QVBoxLayout(self.empty_view); ev_ly.setAlignment(Qt.AlignCenter)
-        lbl_inst = QLabel("Selecciona un alumno\npara gestionar sus créditos")
+        lbl_inst = styled(QLabel("Selecciona un alumno\npara gestionar sus créditos"), "TalleresHint")
         lbl_inst.setAlignment(Qt.AlignCenter)
-        lbl_inst.setStyleSheet("font-size: 18px; color: #94a3b8; font-weight: bold;")
         ev_ly.addWidget(lbl_inst)
         
         # Vista Formulario
         self.form_view = QFrame(); self.form_view.setObjectName("Panel"); self.form_view.setFixedWidth(380)
         c2_ly = QVBoxLayout(self.form_view); c2_ly.setContentsMargins(25, 25, 25, 25); c2_ly.setSpacing(15)
         
-        self.lbl_student_name = QLabel("Nombre"); self.lbl_student_name.setStyleSheet("font-size: 18px; font-weight: bold; color: #1e293b;")
-        self.lbl_student_mat = QLabel("Matrícula"); self.lbl_student_mat.setStyleSheet("color: #64748b;")
+        self.lbl_student_name = styled(QLabel("Nombre"), "StudentName")
+        self.lbl_student_mat = styled(QLabel("Matrícula"), "StudentMeta")
         c2_ly.addWidget(self.lbl_student_name); c2_ly.addWidget(self.lbl_student_mat)
         
         c2_ly.addWidget(QLabel("Progreso:"))
-        self.prog_bar = QProgressBar(); self.prog_bar.setRange(0, 50); self.prog_bar.setFixedHeight(20)
-        self.prog_bar.setStyleSheet("QProgressBar { border: none; background: #e2e8f0; border-radius: 10px; text-align: center; } QProgressBar::chunk { border-radius: 10px; }")
+        self.prog_bar = styled(QProgressBar(), "CreditBar"); self.prog_bar.setRange(0, 50); self.prog_bar.setFixedHeight(20)
         c2_ly.addWidget(self.prog_bar)
         
-        line = QFrame(); line.setFrameShape(QFrame.HLine); line.setStyleSheet("color:#e2e8f0;"); c2_ly.addWidget(line)
+        line = styled(QFrame(), "Separator"); line.setFrameShape(QFrame.HLine); c2_ly.addWidget(line)
         
         c2_ly.addWidget(QLabel("<b>Nueva Actividad:</b>"))
         self.txt_act_name = QLineEdit(); self.txt_act_name.setPlaceholderText("Nombre del Taller / Actividad...")
@@ -118,37 +376,30 @@ class TalleresPage(QWidget):
         bg = QButtonGroup(self); bg.addButton(self.rb_full); bg.addButton(self.rb_half)
         c2_ly.addWidget(self.rb_full); c2_ly.addWidget(self.rb_half)
         
-        self.combo_cat = QComboBox(); self.combo_cat.addItems(["Cultural", "Deportivo", "Académico", "Otro"]); self.combo_cat.setStyleSheet("background: white; padding: 5px;")
+        self.combo_cat = styled(QComboBox(), "CategoryCombo"); self.combo_cat.addItems(CATEGORIES)
         c2_ly.addWidget(self.combo_cat)
         
         c2_ly.addSpacing(10)
-        self.btn_upload = QPushButton("  📂 Seleccionar PDF  "); self.btn_upload.setCursor(Qt.PointingHandCursor)
-        self.btn_upload.setStyleSheet("QPushButton { background-color: #f1f5f9; color: #334155; border: 2px dashed #cbd5e1; border-radius: 10px; padding: 15px; font-weight: bold; } QPushButton:hover { background-color: #e2e8f0; border: 2px dashed #3b82f6; }")
+        self.btn_upload = styled(QPushButton("  📂 Seleccionar PDF  "), "UploadButton"); self.btn_upload.setCursor(Qt.PointingHandCursor)
         self.btn_upload.clicked.connect(self.select_pdf)
         c2_ly.addWidget(self.btn_upload)
         
         c2_ly.addStretch()
         c2_ly.addWidget(QLabel("<small>Historial:</small>"))
-        self.history_list = QListWidget(); self.history_list.setFixedHeight(100); self.history_list.setStyleSheet("background: #f8fafc; border: 1px solid #e2e8f0; font-size: 12px;")
+        self.history_list = styled(QListWidget(), "HistoryList"); self.history_list.setFixedHeight(100)
         c2_ly.addWidget(self.history_list)
         
         self.center_stack.addWidget(self.empty_view); self.center_stack.addWidget(self.form_view)
         h_layout.addWidget(self.center_stack)
 
         # --- COL 3: VISOR ---
-        col3 = QFrame(); col3.setObjectName("Panel"); col3.setStyleSheet("QFrame#Panel { background: #334155; border: none; }")
+        col3 = styled(QFrame(), "Panel", dark=True)
         c3_ly = QVBoxLayout(col3)
         
-        self.pdf_viewer = QPdfView()
-        self.pdf_document = QPdfDocument(self)
-        self.pdf_viewer.setDocument(self.pdf_document)
-        self.pdf_viewer.setPageMode(QPdfView.PageMode.MultiPage)
-        self.pdf_viewer.setZoomMode(QPdfView.ZoomMode.FitToWidth)
-        self.pdf_viewer.setStyleSheet("border: none; background: #475569;")
+        self.pdf_viewer = styled(ProgressivePdfView(), "TalleresViewer")
         c3_ly.addWidget(self.pdf_viewer)
         
-        self.btn_save = QPushButton("✅ GUARDAR Y SUMAR"); self.btn_save.setVisible(False); self.btn_save.setCursor(Qt.PointingHandCursor)
-        self.btn_save.setStyleSheet("QPushButton { background: #10b981; color: white; padding: 15px; border-radius: 8px; font-weight: bold; font-size: 16px; border: none; } QPushButton:hover { background: #059669; }")
+        self.btn_save = styled(QPushButton("✅ GUARDAR Y SUMAR"), "SaveCreditButton"); self.btn_save.setVisible(False); self.btn_save.setCursor(Qt.PointingHandCursor)
         self.btn_save.clicked.connect(self.save_credit)
         c3_ly.addWidget(self.btn_save)
         
@@ -157,6 +408,16 @@ class TalleresPage(QWidget):
 
     # --- LÓGICA CORREGIDA ---
 
+    def open_bulk(self):
+        self.bulk = BulkEvidenceDialog(self.engine, self)
+        self.bulk.exec()
+        self.bulk = None
+        # Los alumnos que llegaron a 5 créditos salen de la lista
+        self.refresh_student_list()
+        if self.current_student is not None:
+            self.current_student = self.engine.find(self.current_student.get('matricula')) or self.current_student
+            self.update_progress_visuals()
+
     def refresh_student_list(self):
         """Muestra alumnos que tengan menos de 5.0 créditos"""
         search = self.search_input.text().lower().strip()
@@ -199,13 +460,12 @@ class TalleresPage(QWidget):
             self.student_list.addItem(item)
 
     def load_student_details(self, item):
-        # Limpiar para evitar errores de memoria
-        if self.pdf_document: self.pdf_document.close()
+        # Cancelar el render pendiente del alumno anterior (no bloquea)
+        self.pdf_viewer.clear()
         self.current_student = None
         self.btn_save.setVisible(False)
         self.txt_act_name.clear()
         self.history_list.clear()
-        QApplication.processEvents() 
         
         # Cargar nuevo
         self.current_student = item.data(Qt.UserRole)
@@ -228,8 +488,7 @@ class TalleresPage(QWidget):
                 self.history_list.addItem(f"✅ {w.get('name')} ({val})")
         
         self.prog_bar.setValue(int(total * 10))
-        color = "#ef4444" if total < 3.0 else "#f59e0b"
-        self.prog_bar.setStyleSheet(f"QProgressBar {{ border: none; background: #e2e8f0; border-radius: 10px; text-align: center; color: black; font-weight: bold; }} QProgressBar::chunk {{ background-color: {color}; border-radius: 10px; }}")
+        set_style_prop(self.prog_bar, "level", "low" if total < 3.0 else "mid")
         self.prog_bar.setFormat(f"{total} / 5.0 Créditos")
 
     def select_pdf(self):
@@ -242,68 +501,89 @@ class TalleresPage(QWidget):
         if path:
             self.temp_pdf_path = path
             
-            # Cerrar anterior antes de abrir nuevo
-            self.pdf_document.close()
-            try:
-                self.pdf_document.load(path)
-                self.btn_save.setVisible(True)
-                self.btn_save.setText(f"GUARDAR: {name.upper()}")
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"No se pudo cargar el visor.\n{e}")
+            # Se muestra en segundo plano: primero en baja resolución y luego nítido
+            self.pdf_viewer.load(path)
+            self.btn_save.setVisible(True)
+            self.btn_save.setText(f"GUARDAR: {name.upper()}")
 
     def save_credit(self):
-        if not self.current_student or not self.temp_pdf_path: return
-        
+        if not self.current_student or not self.temp_pdf_path or self.pending_credit is not None: return
+
+        # Liberar PDF antes de copiar
+        self.pdf_viewer.clear()
+
+        # 1. Revisar, optimizar y guardar en el almacén (evidence_ingest.py) en otro proceso
+        val = 1.0 if self.rb_full.isChecked() else 0.5
+        student = self.engine.find(self.current_student.get('matricula')) or self.current_student
+        self.pending_credit = (student, {
+            "name": self.txt_act_name.text().strip().upper(),
+            "category": self.combo_cat.currentText(),
+            "value": val,
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "status": "Acreditado",
+        })
+        if self.ingest is None:
+            self.ingest = EvidenceIngest(self)
+            self.ingest.done.connect(self.on_ingest_done)
+        self.btn_save.setEnabled(False)
+        self.btn_save.setText("⏳ Revisando y optimizando evidencia...")
+        self.ingest.add([self.temp_pdf_path])
+
+    def on_ingest_done(self, result):
+        if self.pending_credit is None: return
+        student, new_credit = self.pending_credit
+        self.pending_credit = None
+        self.btn_save.setEnabled(True)
+        self.btn_save.setText(f"GUARDAR: {new_credit['name']}")
+        if not result["ok"]:
+            QMessageBox.critical(self, "Evidencia rechazada", f"No se guardó la evidencia:\n{result['error']}")
+            return
+
+        # 2. El mismo archivo ya es evidencia (de otro alumno o de este mismo)
+        users = evidence_store.used_by(self.engine.students, result["sha256"], result["sha256_original"])
+        if users:
+            lines = "\n".join(f"• {s.get('matricula')} {s.get('nombres', '')} {s.get('apellidoPaterno', '')}"
+                              f" — {w.get('name')} ({w.get('date', '')})" for s, w in users[:10])
+            other = any(s is not student for s, _ in users)
+            ask = QMessageBox.warning(
+                self, "⚠️ Evidencia repetida",
+                ("Este mismo archivo ya es evidencia de OTRO alumno:" if other
+                 else "Este archivo ya está registrado para este alumno:") + f"\n\n{lines}\n\n¿Guardar de todos modos?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if ask != QMessageBox.Yes: return
+
         try:
-            # 1. Copiar archivo
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            ev_dir = os.path.join(base_dir, "Evidencias_Creditos")
-            if not os.path.exists(ev_dir): os.makedirs(ev_dir)
-            
-            mat = self.current_student['matricula']
-            ts = datetime.now().strftime('%Y%m%d%H%M%S')
-            dest_path = os.path.join(ev_dir, f"{mat}_{ts}.pdf")
-            
-            # Liberar PDF antes de copiar
-            self.pdf_document.close()
-            QApplication.processEvents()
-            
-            shutil.copy(self.temp_pdf_path, dest_path)
-            
-            # 2. Guardar datos
-            val = 1.0 if self.rb_full.isChecked() else 0.5
-            new_credit = {
-                "name": self.txt_act_name.text().strip().upper(),
-                "category": self.combo_cat.currentText(),
-                "value": val,
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "status": "Acreditado",
-                "pdf_path": dest_path
-            }
-            
-            if 'workshops' not in self.current_student: 
-                self.current_student['workshops'] = []
-                
-            self.current_student['workshops'].append(new_credit)
+            # 3. Guardar datos
+            new_credit["pdf_path"] = result["ruta"]
+            new_credit["sha256"] = result["sha256"]
+            new_credit["sha256_original"] = result["sha256_original"]
+            new_credit.update({k: result["meta"][k] for k in evidence_ingest.META_KEYS})
+            student.setdefault('workshops', []).append(new_credit)
             self.engine.save()
-            
-            # 3. VERIFICAR META DE 5 CRÉDITOS
-            new_total = sum(float(w.get('value', 1.0)) for w in self.current_student['workshops'] if w.get('status') == 'Acreditado')
-            
-            if new_total >= 5.0:
-                QMessageBox.information(self, "¡META ALCANZADA! 🎓", 
-                    f"El alumno {self.current_student['nombres']} completó los 5.0 créditos.\n\n"
-                    "Desaparecerá de esta lista y ya está disponible en el módulo de CONSTANCIAS.")
-                
-                # Regresar a inicio y recargar lista (el alumno desaparecerá)
-                self.center_stack.setCurrentIndex(0)
-                self.current_student = None
-                self.refresh_student_list()
-            else:
-                QMessageBox.information(self, "Guardado", "Actividad registrada correctamente.")
-                self.txt_act_name.clear()
-                self.btn_save.setVisible(False)
-                self.update_progress_visuals()
-            
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al guardar: {e}")
\ No newline at end of file
+            QMessageBox.critical(self, "Error", f"Error al guardar: {e}")
+            return
+
+        # Se cambió de alumno mientras se copiaba: solo se actualiza la lista
+        if self.current_student is None or self.current_student.get('matricula') != student.get('matricula'):
+            self.refresh_student_list(); return
+        self.current_student = student
+
+        # 4. VERIFICAR META DE 5 CRÉDITOS
+        new_total = sum(float(w.get('value', 1.0)) for w in self.current_student['workshops'] if w.get('status') == 'Acreditado')
+
+        if new_total >= 5.0:
+            QMessageBox.information(self, "¡META ALCANZADA! 🎓",
+                f"El alumno {self.current_student['nombres']} completó los 5.0 créditos.\n\n"
+                "Desaparecerá de esta lista y ya está disponible en el módulo de CONSTANCIAS.")
+
+            # Regresar a inicio y recargar lista (el alumno desaparecerá)
+            self.center_stack.setCurrentIndex(0)
+            self.current_student = None
+            self.refresh_student_list()
+        else:
+            QMessageBox.information(self, "Guardado", "Actividad registrada correctamente.\n\n"
+                                    f"Evidencia: {evidence_ingest.describe(result['meta'])}")
+            self.txt_act_name.clear()
+            self.btn_save.setVisible(False)
+            self.update_progress_visuals()
@@ -0,0 +1,158 @@
+# pdf_cache.py
+# Caché LRU compartida de PDFs abiertos (QPdfDocument) y páginas renderizadas.
+# La usan el visor de Talleres (solo páginas), el diálogo de Expediente y los
+# visores de copia_seguridad.py: abrir otra vez un documento reciente no vuelve a leerlo
+# ni a parsearlo. Todo se usa desde el hilo de la GUI.
+#
+# Presupuesto de memoria: un documento cuenta como su tamaño en disco (pdfium
+# lo mantiene en memoria) y una página como los bytes de su QImage. Cuando se
+# pasa de MEMORY_BUDGET se libera lo usado hace más tiempo, salvo los
+# documentos que algún visor está mostrando en ese momento.
+import os
+from collections import OrderedDict
+
+from PySide6.QtCore import QSize
+
+MEMORY_BUDGET = 256 * 1024 * 1024
+
+_docs = OrderedDict()    # ruta -> (firma, QPdfDocument, costo)
+_pages = OrderedDict()   # (ruta, firma, página, ancho) -> QImage
+_shown = {}              # id(visor) -> ruta que está mostrando
+_used = 0
+_empty = None
+
+
+def _qpdf():
+    """QtPdf se importa al primer uso (es pesado para el arranque); None si no está"""
+    try:
+        from PySide6.QtPdf import QPdfDocument
+    except ImportError:
+        return None
+    return QPdfDocument
+
+
+def _signature(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _trim(keep=None):
+    """Libera documentos y páginas (LRU) hasta quedar dentro del presupuesto"""
+    global _used
+    pinned = set(_shown.values()) | {keep}
+    while _used > MEMORY_BUDGET and _pages:
+        _, img = _pages.popitem(last=False)
+        _used -= img.sizeInBytes()
+    for path in list(_docs):
+        if _used <= MEMORY_BUDGET: break
+        if path in pinned: continue
+        _drop_doc(path)
+
+
+def _drop_doc(path):
+    global _used
+    entry = _docs.pop(path, None)
+    if entry is None: return
+    _, doc, cost = entry
+    _used -= cost
+    doc.close()
+    doc.deleteLater()
+
+
+def document(path):
+    """QPdfDocument ya cargado (de la caché si el archivo no cambió); None si no se pudo abrir"""
+    global _used
+    QPdfDocument = _qpdf()
+    if QPdfDocument is None: return None
+    try:
+        sig = _signature(path)
+    except OSError:
+        return None
+    entry = _docs.get(path)
+    if entry is not None and entry[0] == sig:
+        _docs.move_to_end(path)
+        return entry[1]
+    if entry is not None: _drop_doc(path)
+
+    doc = QPdfDocument()
+    if doc.load(path) != QPdfDocument.Error.None_:
+        doc.deleteLater()
+        return None
+    _docs[path] = (sig, doc, sig[1])
+    _used += sig[1]
+    _trim(keep=path)
+    return doc
+
+
+def show(view, path):
+    """Pone el documento en un QPdfView (None lo deja vacío) y lo protege de la limpieza"""
+    global _empty
+    doc = document(path) if path else None
+    if doc is None: _shown.pop(id(view), None)
+    else: _shown[id(view)] = path
+    if doc is None and _qpdf() is not None:
+        # Qt no acepta setDocument(None): se usa un documento vacío compartido
+        if _empty is None: _empty = _qpdf()()
+        view.setDocument(_empty)
+    else:
+        view.setDocument(doc)
+    return doc
+
+
+def release(path):
+    """Cierra el documento (p. ej. antes de copiar o mover el archivo en Windows)"""
+    for key, shown in list(_shown.items()):
+        if shown == path: del _shown[key]
+    _drop_doc(path)
+    for key in [k for k in _pages if k[0] == path]:
+        _forget_page(key)
+
+
+def _forget_page(key):
+    global _used
+    img = _pages.pop(key, None)
+    if img is not None: _used -= img.sizeInBytes()
+
+
+def cached_page(path, page, width):
+    """Página ya renderizada a ese ancho (QImage) o None; no renderiza"""
+    try:
+        key = (path, _signature(path), page, width)
+    except OSError:
+        return None
+    img = _pages.get(key)
+    if img is not None: _pages.move_to_end(key)
+    return img
+
+
+def store_page(path, page, width, img):
+    """Guarda una página renderizada en otro lado (p. ej. el visor progresivo)"""
+    global _used
+    try:
+        key = (path, _signature(path), page, width)
+    except OSError:
+        return
+    _forget_page(key)
+    _pages[key] = img
+    _used += img.sizeInBytes()
+    _trim()
+
+
+def page_image(path, page=0, width=300):
+    """Página renderizada a cierto ancho (QImage), guardada en la misma caché"""
+    img = cached_page(path, page, width)
+    if img is not None: return img
+
+    doc = document(path)
+    if doc is None or page >= doc.pageCount(): return None
+    pt = doc.pagePointSize(page)
+    height = max(1, round(width * pt.height() / pt.width())) if pt.width() else width
+    img = doc.render(page, QSize(width, height))
+    if img.isNull(): return None
+    store_page(path, page, width, img)
+    return img
+
+
+def stats():
+    """Resumen para depurar / perfilar"""
+    return {"documentos": len(_docs), "paginas": len(_pages), "bytes": _used, "presupuesto": MEMORY_BUDGET}
@@ -0,0 +1,140 @@
+# photo_store.py
+# Almacén de fotos de alumnos.
+# Al subir una foto se copia a Fotos_Alumnos/ y se generan de una vez las
+# versiones circulares ya escaladas (AVATAR_SIZES). El expediente solo lee esas
+# miniaturas PNG de pocos KB, nunca decodifica la foto original de la cámara.
+# Caché en dos niveles: LRU en memoria (QPixmap) y LRU en disco (avatares/).
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+from datetime import datetime
+
+from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QImage, QImageReader, QPainter, QPainterPath, QPixmap
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PHOTOS_DIR = os.path.join(ROOT, "Fotos_Alumnos")
+AVATARS_DIR = os.path.join(PHOTOS_DIR, "avatares")
+
+# Tamaños pre-renderizados (px). 90 es el del expediente; 180 para pantallas HiDPI
+AVATAR_SIZES = (48, 90, 180)
+
+# Límites de las cachés
+MEMORY_ITEMS = 64
+DISK_BUDGET = 50 * 1024 * 1024
+
+_memory = OrderedDict()  # (llave, tamaño) -> QPixmap
+
+
+def _key(path):
+    """Identifica una foto por ruta + fecha + tamaño (si cambia el archivo, cambia la llave)"""
+    st = os.stat(path)
+    raw = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _variant_path(key, size):
+    return os.path.join(AVATARS_DIR, f"{key}_{size}.png")
+
+
+def _read_scaled(path, size):
+    """Decodifica la foto ya reducida (JPEG se decodifica directo a escala, sin la imagen completa)"""
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    full = reader.size()
+    if full.isValid() and min(full.width(), full.height()) > size:
+        reader.setScaledSize(full.scaled(QSize(size, size), Qt.KeepAspectRatioByExpanding))
+    img = reader.read()
+    return None if img.isNull() else img
+
+
+def _circle(src, size):
+    """Recorta al centro y pinta un círculo de size x size"""
+    scaled = src.scaled(QSize(size, size), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    x = (scaled.width() - size) // 2; y = (scaled.height() - size) // 2
+    cropped = scaled.copy(x, y, size, size)
+    out = QImage(size, size, QImage.Format_ARGB32_Premultiplied); out.fill(Qt.transparent)
+    painter = QPainter(out); painter.setRenderHint(QPainter.Antialiasing)
+    clip = QPainterPath(); clip.addEllipse(0, 0, size, size); painter.setClipPath(clip)
+    painter.drawImage(0, 0, cropped); painter.end()
+    return out
+
+
+def _render_variants(path, key, sizes):
+    """Genera los avatares pedidos con una sola decodificación (al tamaño mayor)"""
+    src = _read_scaled(path, max(sizes))
+    if src is None: return {}
+    os.makedirs(AVATARS_DIR, exist_ok=True)
+    images = {}
+    for size in sizes:
+        img = _circle(src, size)
+        img.save(_variant_path(key, size), "PNG")
+        images[size] = img
+    _trim_disk()
+    return images
+
+
+def _trim_disk():
+    """Borra los avatares usados hace más tiempo si la carpeta pasa de DISK_BUDGET"""
+    try:
+        entries = [e for e in os.scandir(AVATARS_DIR) if e.is_file()]
+    except FileNotFoundError:
+        return
+    total = sum(e.stat().st_size for e in entries)
+    if total <= DISK_BUDGET: return
+    for e in sorted(entries, key=lambda e: e.stat().st_mtime):
+        try:
+            size = e.stat().st_size
+            os.remove(e.path)
+            total -= size
+        except OSError:
+            continue
+        if total <= DISK_BUDGET: break
+
+
+def _remember(mem_key, pixmap):
+    _memory[mem_key] = pixmap
+    _memory.move_to_end(mem_key)
+    while len(_memory) > MEMORY_ITEMS:
+        _memory.popitem(last=False)
+
+
+def ingest(matricula, src_path):
+    """Copia la foto al almacén, pre-renderiza los avatares y devuelve la ruta guardada"""
+    os.makedirs(PHOTOS_DIR, exist_ok=True)
+    ext = os.path.splitext(src_path)[1].lower() or ".jpg"
+    ts = datetime.now().strftime('%Y%m%d%H%M%S')
+    dest = os.path.join(PHOTOS_DIR, f"{matricula}_{ts}{ext}")
+    shutil.copy(src_path, dest)
+    _render_variants(dest, _key(dest), AVATAR_SIZES)
+    return dest
+
+
+def avatar(path, size=90):
+    """QPixmap circular de la foto (memoria -> disco -> render una sola vez); None si no hay foto"""
+    if not path or not os.path.exists(path): return None
+    try:
+        key = _key(path)
+    except OSError:
+        return None
+    mem_key = (key, size)
+    pixmap = _memory.get(mem_key)
+    if pixmap is not None:
+        _memory.move_to_end(mem_key)
+        return pixmap
+
+    variant = _variant_path(key, size)
+    img = QImage(variant) if os.path.exists(variant) else QImage()
+    if not img.isNull():
+        try: os.utime(variant)  # marca de uso para el LRU en disco
+        except OSError: pass
+    else:
+        # Fotos viejas (fuera del almacén) o tamaños nuevos: se generan una vez
+        sizes = sorted(set(AVATAR_SIZES) | {size})
+        img = _render_variants(path, key, sizes).get(size)
+        if img is None: return None
+
+    pixmap = QPixmap.fromImage(img)
+    _remember(mem_key, pixmap)
+    return pixmap
@@ -0,0 +1,120 @@
+# profiler.py
+# Modo de perfilado (python main.py --profile).
+# Registra tramos de tiempo (imports, construcción de páginas, navegación,
+# base de datos, generación de PDF) y al salir los guarda en formato
+# Chrome trace (abrir en chrome://tracing o ui.perfetto.dev) e imprime un resumen.
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+_NULL_SPAN = nullcontext()
+
+
+class _TimedLoader:
+    """Envuelve el loader de un módulo para medir cuánto tarda su import"""
+    def __init__(self, loader, name, profiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler.span(self._name, "import"):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class _ImportTimer:
+    """Buscador en sys.meta_path que delega en los demás y cronometra cada import"""
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'): continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None: break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, name, self.profiler)
+        return spec
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def enable(self, trace_imports=True):
+        self.enabled = True
+        self._t0 = time.perf_counter()
+        if trace_imports:
+            sys.meta_path.insert(0, _ImportTimer(self))
+
+    def span(self, name, cat="app"):
+        """Context manager que mide un tramo; no cuesta nada si el perfilado está apagado"""
+        if not self.enabled: return _NULL_SPAN
+        return self._span(name, cat)
+
+    @contextmanager
+    def _span(self, name, cat):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            event = {
+                "name": name, "cat": cat, "ph": "X", "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "ts": (start - self._t0) * 1e6, "dur": (end - start) * 1e6
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def write_trace(self, path):
+        threads = {e["tid"] for e in self.events}
+        names = {t.ident: t.name for t in threading.enumerate()}
+        meta = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+             "args": {"name": names.get(tid, f"hilo {tid}")}}
+            for tid in threads
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": meta + self.events, "displayTimeUnit": "ms"}, f)
+
+    def summary(self, limit=40):
+        """Tabla de tramos agrupados por nombre, ordenada por tiempo total"""
+        groups = {}
+        for e in self.events:
+            g = groups.setdefault((e["cat"], e["name"]), [])
+            g.append(e["dur"] / 1000)
+        rows = sorted(groups.items(), key=lambda kv: sum(kv[1]), reverse=True)[:limit]
+
+        lines = [f"{'CATEGORÍA':<12} {'TRAMO':<44} {'N':>5} {'TOTAL ms':>10} {'PROM ms':>9} {'MÁX ms':>9}"]
+        lines.append("-" * len(lines[0]))
+        for (cat, name), durs in rows:
+            lines.append(f"{cat:<12} {name[:44]:<44} {len(durs):>5} {sum(durs):>10.1f} {sum(durs) / len(durs):>9.1f} {max(durs):>9.1f}")
+        return "\n".join(lines)
+
+    def finish(self):
+        """Guarda el trace y muestra el resumen (se conecta a aboutToQuit)"""
+        if not self.enabled: return
+        path = os.path.abspath(f"perfil_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        self.write_trace(path)
+        print(self.summary())
+        print(f"\nTrace guardado en: {path}")
+
+
+# Instancia compartida por toda la aplicación
+profiler = Profiler()
@@ -0,0 +1,372 @@
+# snapshots.py
+# Copias de seguridad incrementales de la base y de los documentos.
+# Cada instantánea es un manifiesto (instantaneas/<fecha>.json) con la lista de bloques
+# de cada archivo; los bloques se guardan una sola vez, comprimidos y con el nombre de
+# su SHA-256 (bloques/3f/3fa2...). Una instantánea nueva solo escribe lo que cambió:
+#   - los archivos con el mismo tamaño y fecha que en la anterior ni siquiera se leen
+#   - los que cambiaron se cortan en bloques por contenido (los cortes caen en saltos de
+#     línea elegidos por el hash de los bytes anteriores), así agregar un alumno a
+#     database.json solo produce uno o dos bloques nuevos y no vuelve a guardar todo el
+#     archivo (benchmarks/snapshots.py lo mide)
+# El manifiesto se escribe al final: una copia interrumpida no deja instantáneas a medias.
+#   snapshot()          nueva instantánea de SOURCES
+#   restore()           todo a como estaba (antes hace una instantánea de lo actual)
+#   restore_student()   un alumno y sus archivos, sin tocar a los demás
+#   verify()            que cada bloque exista y coincida con su hash
+#   python snapshots.py [--nota TEXTO]            nueva instantánea
+#   python snapshots.py --lista | --verificar
+#   python snapshots.py --restaurar [--fecha AAAA-MM-DD] [--alumno MATRÍCULA]   (con la app cerrada)
+# Este módulo no importa Qt.
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import constancia_store
+import evidence_store
+from config import DB_PATH
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BACKUP_DIR = os.path.join(ROOT, "Copias_Seguridad")
+
+# Lo que se respalda (rutas relativas a ROOT). Las miniaturas y avatares se regeneran solos
+SOURCES = (DB_PATH, os.path.relpath(evidence_store.STORE_DIR, ROOT),
+           os.path.relpath(constancia_store.OUT_DIR, ROOT), "Fotos_Alumnos")
+SKIP_DIRS = {".tmp", "avatares", "Miniaturas", "__pycache__"}
+
+# Tamaño de los bloques: se busca corte a partir de MIN_CHUNK (chico, para que los cortes
+# vuelvan a coincidir justo después de un cambio), se apunta a TARGET_CHUNK en promedio
+# y se corta sí o sí en MAX_CHUNK
+MIN_CHUNK = 2 * 1024
+TARGET_CHUNK = 64 * 1024
+MAX_CHUNK = 1024 * 1024
+# Bytes antes del salto de línea que deciden si es corte
+WINDOW = 256
+
+# Hilos para leer, comprimir y escribir bloques (zlib y hashlib sueltan el GIL)
+THREADS = 8
+
+_RAW, _ZLIB = b"r", b"z"
+
+# Dos hilos con el mismo bloque (evidencias repetidas): solo uno lo escribe
+_claim_lock = threading.Lock()
+
+
+class SnapshotError(Exception):
+    """Instantánea inexistente, base ilegible o bloque dañado"""
+
+
+# --- BLOQUES ---
+def chunks(data):
+    """Corta data en bloques por contenido (los mismos bytes dan los mismos cortes).
+    Un salto de línea es corte con probabilidad (bytes desde el salto anterior) / TARGET_CHUNK,
+    según el crc32 de los WINDOW bytes anteriores: el promedio no depende del largo de las líneas."""
+    out, start, n = [], 0, len(data)
+    while start < n:
+        end = min(start + MAX_CHUNK, n)
+        pos = start + MIN_CHUNK
+        prev = data.rfind(b"\n", max(0, pos - MAX_CHUNK), pos)
+        while pos < end:
+            nl = data.find(b"\n", pos, end)
+            if nl < 0: break
+            gap = nl - max(prev, nl - TARGET_CHUNK)
+            if zlib.crc32(data[max(0, nl - WINDOW):nl]) * TARGET_CHUNK < gap << 32:
+                end = nl + 1; break
+            prev, pos = nl, nl + 1
+        out.append(data[start:end]); start = end
+    return out
+
+
+def _chunk_path(dest, digest):
+    return os.path.join(dest, "bloques", digest[:2], digest)
+
+
+def _put_chunk(dest, block, claimed):
+    """Guarda el bloque si no existe; devuelve (hash, bytes escritos)"""
+    digest = hashlib.sha256(block).hexdigest()
+    path = _chunk_path(dest, digest)
+    with _claim_lock:
+        if digest in claimed or os.path.exists(path): return digest, 0
+        claimed.add(digest)
+    packed = zlib.compress(block, 6)
+    payload = _ZLIB + packed if len(packed) < len(block) else _RAW + block  # los PDF ya vienen comprimidos
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, 'wb') as f: f.write(payload)
+    os.replace(tmp, path)
+    return digest, len(payload)
+
+
+def _get_chunk(dest, digest):
+    try:
+        with open(_chunk_path(dest, digest), 'rb') as f: payload = f.read()
+    except OSError:
+        raise SnapshotError(f"Falta el bloque {digest[:12]}")
+    try:
+        block = zlib.decompress(payload[1:]) if payload[:1] == _ZLIB else payload[1:]
+    except zlib.error:
+        raise SnapshotError(f"El bloque {digest[:12]} está dañado")
+    if hashlib.sha256(block).hexdigest() != digest:
+        raise SnapshotError(f"El bloque {digest[:12]} está dañado")
+    return block
+
+
+# --- INSTANTÁNEAS ---
+def _walk(root=ROOT):
+    """Rutas relativas de los archivos de SOURCES"""
+    for src in SOURCES:
+        full = os.path.join(root, src)
+        if os.path.isfile(full):
+            yield src.replace(os.sep, "/")
+            continue
+        for folder, dirs, files in os.walk(full):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for name in files:
+                if name.endswith(".tmp"): continue
+                yield os.path.relpath(os.path.join(folder, name), root).replace(os.sep, "/")
+
+
+def _read_db(path):
+    """database.json completo (la app lo reescribe en el lugar: si está a medias se reintenta)"""
+    for attempt in range(3):
+        with open(path, 'rb') as f: data = f.read()
+        try:
+            json.loads(data)
+            return data
+        except ValueError:
+            time.sleep(0.5)
+    raise SnapshotError("database.json no es JSON válido (¿se está guardando?)")
+
+
+def list_snapshots(dest=BACKUP_DIR):
+    """Nombres de las instantáneas, de la más vieja a la más nueva"""
+    try: names = os.listdir(os.path.join(dest, "instantaneas"))
+    except OSError: return []
+    return sorted(n[:-5] for n in names if n.endswith(".json"))
+
+
+def load(name, dest=BACKUP_DIR):
+    try:
+        with open(os.path.join(dest, "instantaneas", f"{name}.json"), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        raise SnapshotError(f"No existe la instantánea {name}")
+
+
+def pick(date=None, dest=BACKUP_DIR):
+    """La última instantánea (o la última de ese día o antes: 'AAAA-MM-DD')"""
+    names = list_snapshots(dest)
+    if date: names = [n for n in names if n[:10] <= date]
+    if not names: raise SnapshotError("No hay instantáneas" + (f" del {date} o antes" if date else ""))
+    return names[-1]
+
+
+def snapshot(note="", dest=BACKUP_DIR, root=ROOT, progress=None):
+    """Nueva instantánea; devuelve su manifiesto. progress(hechos, total)"""
+    names = list_snapshots(dest)
+    previous = load(names[-1], dest)["archivos"] if names else {}
+    paths = sorted(set(_walk(root)))
+    claimed = set()
+
+    def store(rel):
+        full = os.path.join(root, rel)
+        try: st = os.stat(full)
+        except OSError: return rel, None, 0, 0
+        old = previous.get(rel)
+        if old and old["size"] == st.st_size and old["mtime"] == st.st_mtime_ns:
+            return rel, old, 0, 0
+        try:
+            if rel == DB_PATH.replace(os.sep, "/"): data = _read_db(full)
+            else:
+                with open(full, 'rb') as f: data = f.read()
+        except OSError:
+            return rel, None, 0, 0
+        blocks, new_bytes, new_blocks = [], 0, 0
+        for block in chunks(data):
+            digest, size = _put_chunk(dest, block, claimed)
+            blocks.append(digest)
+            new_bytes += size; new_blocks += bool(size)
+        return rel, {"size": len(data), "mtime": st.st_mtime_ns, "sha256": hashlib.sha256(data).hexdigest(),
+                     "bloques": blocks}, new_bytes, new_blocks
+
+    files, written = {}, [0, 0]  # bytes, bloques nuevos
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        for i, (rel, entry, new_bytes, new_blocks) in enumerate(pool.map(store, paths)):
+            if entry: files[rel] = entry
+            written[0] += new_bytes; written[1] += new_blocks
+            if progress: progress(i + 1, len(paths))
+
+    name = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    while name in names: name += "b"
+    manifest = {"version": 1, "nombre": name, "nota": note, "archivos": files,
+                "tamano": sum(f["size"] for f in files.values()),
+                "bytes_nuevos": written[0], "bloques_nuevos": written[1]}
+    folder = os.path.join(dest, "instantaneas")
+    os.makedirs(folder, exist_ok=True)
+    tmp = os.path.join(folder, f"{name}.json.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f: json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(folder, f"{name}.json"))
+    return manifest
+
+
+def read_file(manifest, rel, dest=BACKUP_DIR):
+    """Bytes de un archivo tal como quedó en la instantánea"""
+    entry = manifest["archivos"][rel]
+    data = b"".join(_get_chunk(dest, d) for d in entry["bloques"])
+    if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+        raise SnapshotError(f"{rel} no coincide con la instantánea")
+    return data
+
+
+def _write(manifest, rel, dest, root):
+    """Restaura un archivo si falta o es distinto; True si lo escribió"""
+    entry, full = manifest["archivos"][rel], os.path.join(root, rel)
+    try:
+        if os.path.getsize(full) == entry["size"] and evidence_store.file_sha256(full) == entry["sha256"]:
+            return False
+    except OSError:
+        pass
+    data = read_file(manifest, rel, dest)
+    os.makedirs(os.path.dirname(full) or ".", exist_ok=True)
+    tmp = f"{full}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, 'wb') as f: f.write(data)
+    os.replace(tmp, full)
+    return True
+
+
+def restore(name, dest=BACKUP_DIR, root=ROOT, progress=None):
+    """Deja la base y los documentos como en la instantánea. Antes guarda lo actual en otra
+    instantánea (se puede deshacer). Los archivos nuevos que no estaban se dejan."""
+    manifest = load(name, dest)
+    before = snapshot(f"antes de restaurar {name}", dest, root)
+    rels = list(manifest["archivos"])
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        changed = 0
+        for i, wrote in enumerate(pool.map(lambda rel: _write(manifest, rel, dest, root), rels)):
+            changed += wrote
+            if progress: progress(i + 1, len(rels))
+    return {"restaurados": changed, "archivos": len(rels), "respaldo_previo": before["nombre"]}
+
+
+def _relative(path, root):
+    rel = os.path.relpath(os.path.abspath(path), root)
+    return None if rel.startswith("..") else rel.replace(os.sep, "/")
+
+
+def restore_student(name, matricula, students, dest=BACKUP_DIR, root=ROOT):
+    """Pone en students el registro del alumno tal como estaba y restaura sus archivos.
+    Quien llama guarda la base (engine.set_students + engine.save)."""
+    manifest = load(name, dest)
+    db = json.loads(read_file(manifest, DB_PATH.replace(os.sep, "/"), dest))
+    mat = str(matricula).strip()
+    old = next((s for s in db if str(s.get('matricula')) == mat), None)
+    if old is None: raise SnapshotError(f"La matrícula {mat} no está en la instantánea {name}")
+    i = next((i for i, s in enumerate(students) if str(s.get('matricula')) == mat), None)
+    if i is None: students.append(old)
+    else: students[i] = old
+
+    paths = {p: _relative(p, root) for p in [old.get('photo_path')] + [w.get('pdf_path') for w in old.get('workshops', [])] if p}
+    changed = sum(_write(manifest, rel, dest, root) for rel in set(paths.values()) if rel in manifest["archivos"])
+    # Fuera de la carpeta de la app (o no respaldado): no se puede restaurar
+    missing = sorted(p for p, rel in paths.items() if rel not in manifest["archivos"])
+    return {"alumno": old, "nuevo": i is None, "restaurados": changed, "faltantes": missing}
+
+
+def verify(names=None, dest=BACKUP_DIR, progress=None):
+    """Revisa los bloques de las instantáneas; {instantánea: [archivos dañados]}"""
+    names = names or list_snapshots(dest)
+    manifests = [load(n, dest) for n in names]
+    digests = sorted({d for m in manifests for f in m["archivos"].values() for d in f["bloques"]})
+
+    def check(digest):
+        try: _get_chunk(dest, digest); return None
+        except SnapshotError: return digest
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        bad = set()
+        for i, digest in enumerate(pool.map(check, digests)):
+            if digest: bad.add(digest)
+            if progress and (i % 100 == 0 or i + 1 == len(digests)): progress(i + 1, len(digests))
+    report = {}
+    for m in manifests:
+        report[m["nombre"]] = sorted(rel for rel, f in m["archivos"].items() if bad.intersection(f["bloques"]))
+    return report, len(digests)
+
+
+def disk_usage(dest=BACKUP_DIR):
+    total = 0
+    for folder, _, files in os.walk(os.path.join(dest, "bloques")):
+        for name in files: total += os.path.getsize(os.path.join(folder, name))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copias de seguridad incrementales de la base y los documentos")
+    parser.add_argument("--nota", default="", help="texto que se guarda con la instantánea")
+    parser.add_argument("--lista", action="store_true", help="mostrar las instantáneas")
+    parser.add_argument("--verificar", action="store_true", help="revisar que todos los bloques estén bien")
+    parser.add_argument("--restaurar", action="store_true", help="restaurar la última (o la de --fecha)")
+    parser.add_argument("--fecha", metavar="AAAA-MM-DD", help="usar la última instantánea de ese día o antes")
+    parser.add_argument("--instantanea", metavar="NOMBRE", help="usar esta instantánea (ver --lista)")
+    parser.add_argument("--alumno", metavar="MATRÍCULA", help="restaurar solo este alumno y sus archivos")
+    parser.add_argument("--destino", metavar="CARPETA", help="dónde están las copias (otra unidad, por ejemplo)")
+    args = parser.parse_args()
+
+    dest = os.path.abspath(args.destino) if args.destino else BACKUP_DIR
+    os.chdir(ROOT)  # DB_PATH es relativo a la carpeta de la app
+    show = lambda done, total: print(f"\r[{done}/{total}]", end="", flush=True)
+    mb = lambda n: f"{n / 1024 / 1024:.1f} MB"
+    try:
+        if args.lista:
+            for name in list_snapshots(dest):
+                m = load(name, dest)
+                print(f"  {name}  {len(m['archivos'])} archivos  {mb(m['tamano'])}  nuevo: {mb(m['bytes_nuevos'])}"
+                      + (f"  ({m['nota']})" if m["nota"] else ""))
+            print(f"Bloques en disco: {mb(disk_usage(dest))}")
+            return 0
+
+        if args.verificar:
+            report, n = verify(None, dest, show)
+            damaged = {k: v for k, v in report.items() if v}
+            print(f"\nBloques revisados: {n} | instantáneas con daños: {len(damaged)} de {len(report)}")
+            for name, rels in damaged.items():
+                print(f"  {name}: " + ", ".join(rels[:10]) + (" ..." if len(rels) > 10 else ""))
+            return 1 if damaged else 0
+
+        if args.restaurar:
+            name = args.instantanea or pick(args.fecha, dest)
+            if args.alumno:
+                from database import StudentEngine
+                engine = StudentEngine()
+                r = restore_student(name, args.alumno, engine.students, dest)
+                engine.set_students(engine.students)
+                engine.save()
+                print(f"Alumno {args.alumno} {'agregado' if r['nuevo'] else 'restaurado'} desde {name}"
+                      f" | archivos restaurados: {r['restaurados']}")
+                for rel in r["faltantes"]: print(f"  no está en la copia: {rel}")
+            else:
+                r = restore(name, dest, progress=show)
+                print(f"\nRestaurado {name}: {r['restaurados']} de {r['archivos']} archivos"
+                      f" | lo anterior quedó en {r['respaldo_previo']}")
+            return 0
+
+        t0 = time.perf_counter()
+        m = snapshot(args.nota, dest, progress=show)
+        print(f"\nInstantánea {m['nombre']}: {len(m['archivos'])} archivos, {mb(m['tamano'])}"
+              f" | nuevo: {mb(m['bytes_nuevos'])} en {m['bloques_nuevos']} bloques"
+              f" | {time.perf_counter() - t0:.1f} s")
+        return 0
+    except SnapshotError as e:
+        print(f"\nError: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
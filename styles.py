@@ -1,51 +1,402 @@
-STYLES = """
-QMainWindow {
-    background-color: #f8fafc;
-}
-
-/* Menú Lateral */
-#Sidebar {
-    background-color: #0f172a;
-    border: none;
-}
-
-#NavButton {
-    color: #94a3b8;
-    text-align: left;
-    padding: 12px;
-    border: none;
-    font-size: 13px;
-    border-radius: 8px;
-    margin: 2px 10px;
-}
-
-#NavButton:hover {
-    background-color: #1e293b;
-    color: white;
-}
-
-#NavButton:checked {
-    background-color: #3b82f6;
-    color: white;
-}
-
-/* Tarjetas y Contenedores */
-QFrame {
-    border-radius: 12px;
-}
-
-/* Tablas */
-QTableWidget {
-    background-color: white;
-    border: 1px solid #e2e8f0;
-    gridline-color: #f1f5f9;
-}
-
-QHeaderView::section {
-    background-color: #f8fafc;
-    padding: 8px;
-    border: none;
-    font-weight: bold;
-    color: #64748b;
-}
-"""
\ No newline at end of file
+# styles.py
+# Hoja de estilos ÚNICA de la aplicación.
+# Se arma una sola vez al importar el módulo y se aplica con apply_styles(app).
+# Los widgets ya no llaman setStyleSheet: solo declaran su objectName (y, si
+# cambian de aspecto, una propiedad dinámica), así Qt interpreta el CSS una
+# vez en lugar de hacerlo por cada botón o fila que se crea.
+#
+# ORDEN: antes cada widget tenía su propia hoja, y la hoja propia siempre
+# ganaba a la de sus contenedores. Para conservar ese comportamiento cada
+# sección va de afuera hacia adentro (contenedores primero, widgets finales
+# después) y las reglas de widgets finales usan "Tipo#Nombre".
+
+# --- BASE (antes GLOBAL_STYLES en main.py) ---
+BASE = """
+    /* Fondo General */
+    QMainWindow { background-color: #f1f5f9; }
+
+    /* Fuentes Generales */
+    QWidget { font-family: 'Segoe UI', sans-serif; font-size: 14px; color: #1e293b; }
+
+    /* --- ARREGLO PARA FILTROS (QComboBox) --- */
+    QComboBox {
+        background-color: #ffffff;
+        border: 1px solid #cbd5e1;
+        border-radius: 6px;
+        padding: 5px 10px;
+        color: #1e293b; /* Texto oscuro siempre */
+        min-width: 100px;
+    }
+    QComboBox::drop-down {
+        subcontrol-origin: padding;
+        subcontrol-position: top right;
+        width: 20px;
+        border-left: none;
+    }
+    /* La lista desplegable */
+    QComboBox QAbstractItemView {
+        background-color: #ffffff;
+        color: #1e293b;
+        selection-background-color: #eff6ff;
+        selection-color: #1e40af;
+        border: 1px solid #cbd5e1;
+    }
+
+    /* --- ARREGLO PARA VENTANAS EMERGENTES (QDialog y QMessageBox) --- */
+    QDialog, QMessageBox {
+        background-color: #ffffff; /* Fondo blanco */
+    }
+    QMessageBox QLabel {
+        color: #1e293b; /* Texto oscuro */
+    }
+
+    /* --- ARREGLO PARA CAMPOS DE TEXTO (QLineEdit) --- */
+    QLineEdit {
+        background-color: #ffffff;
+        border: 1px solid #cbd5e1;
+        border-radius: 6px;
+        padding: 6px;
+        color: #1e293b;
+    }
+    QLineEdit:focus {
+        border: 1px solid #3b82f6;
+    }
+
+    /* --- BOTONES --- */
+    QPushButton {
+        border-radius: 6px;
+        padding: 6px 12px;
+    }
+"""
+
+# --- VENTANA PRINCIPAL (menú lateral y contenedor de páginas) ---
+MAIN_WINDOW = """
+    #Sidebar, #Sidebar QWidget { background-color: #0f172a; border: none; }
+    QLabel#LogoText { color: white; font-weight: bold; font-size: 30px; }
+
+    QPushButton#NavButton {
+        background: none;
+        color: #94a3b8;
+        text-align: left;
+        padding-left: 20px;
+        border: none;
+        font-family: 'Segoe UI', sans-serif;
+        font-size: 14px;
+        border-left: 3px solid transparent;
+    }
+    QPushButton#NavButton:hover { background-color: #1e293b; color: white; }
+    QPushButton#NavButton:checked { background-color: #3b82f6; color: white; font-weight: bold; border-left: 3px solid white; }
+
+    QLabel#LoadLabel { color: #94a3b8; font-size: 11px; padding: 0 20px; }
+    QProgressBar#LoadBar { background: #1e293b; border: none; border-radius: 3px; margin: 0 20px; }
+    QProgressBar#LoadBar::chunk { background: #3b82f6; border-radius: 3px; }
+
+    /* Fondo base para evitar fantasmas visuales */
+    QStackedWidget#PageStack, #PageStack QWidget { background-color: #f1f5f9; }
+"""
+
+# --- DASHBOARD ---
+DASHBOARD = """
+    QFrame#ChartCard, #ChartCard QWidget { background: white; border-radius: 16px; border: 1px solid #f1f5f9; }
+    #ChartCard QLabel { border: none; background: transparent; }
+    QChartView#ChartView, #ChartView QWidget { background: transparent; }
+
+    /* Tarjetas de estadística (components.StatCard) */
+    QFrame#Card { background-color: white; border-radius: 16px; border: 1px solid #f1f5f9; }
+    QLabel#CardTitle { color: #64748b; font-size: 13px; font-weight: 600; font-family: 'Segoe UI'; border: none; background: transparent; }
+    QLabel#CardValue { color: #0f172a; font-size: 28px; font-weight: 800; font-family: 'Segoe UI'; border: none; background: transparent; }
+    QLabel#CardSubtitle { color: #94a3b8; font-size: 11px; font-family: 'Segoe UI'; border: none; background: transparent; }
+    QLabel#CardIcon { border-radius: 10px; font-size: 20px; border: none; }
+    QLabel#CardIcon[accent="purple"] { background-color: #f3e8ff; color: #7e22ce; }
+    QLabel#CardIcon[accent="blue"] { background-color: #dbeafe; color: #2563eb; }
+    QLabel#CardIcon[accent="orange"] { background-color: #ffedd5; color: #c2410c; }
+    QLabel#CardIcon[accent="gray"] { background-color: #f1f5f9; color: #64748b; }
+"""
+
+# --- REGISTRO ---
+REGISTRO = """
+    QScrollArea#FormScroll, #FormScroll QWidget { border: none; background: transparent; }
+
+    QFrame#FormCard, #FormCard QFrame { background: white; border-radius: 12px; border: 1px solid #e2e8f0; }
+    #FormCard QLabel { border: none; background: transparent; color: #1e293b; font-weight: 600; font-family: 'Segoe UI'; }
+    #FormCard QLineEdit, #FormCard QComboBox {
+        background: #f8fafc;
+        border: 1px solid #e2e8f0;
+        padding: 10px;
+        border-radius: 6px;
+        color: #334155;
+        font-family: 'Segoe UI';
+    }
+    #FormCard QLineEdit:focus, #FormCard QComboBox:focus { border: 1px solid #3b82f6; background: white; }
+    #FormCard QRadioButton { color: #334155; font-family: 'Segoe UI'; spacing: 8px; }
+    /* Arreglo para desplegables */
+    #FormCard QComboBox QAbstractItemView {
+        background-color: white; color: #334155; selection-background-color: #3b82f6; selection-color: white; border: 1px solid #e2e8f0;
+    }
+
+    QFrame#FormDivider { background-color: #e2e8f0; max-height: 1px; border: none; margin-top: 5px; margin-bottom: 20px; }
+
+    QPushButton#RegistroSave { background-color: #1e3a8a; color: white; padding: 12px 25px; border-radius: 8px; font-weight: bold; font-family: 'Segoe UI'; border: none; }
+    QPushButton#RegistroSave:hover { background-color: #172554; }
+    QPushButton#RegistroClear { background-color: white; border: 1px solid #cbd5e1; padding: 12px 25px; border-radius: 8px; color: #475569; font-family: 'Segoe UI'; font-weight: 600; }
+    QPushButton#RegistroClear:hover { background-color: #f1f5f9; }
+"""
+
+# --- ALUMNOS ---
+ALUMNOS = """
+    QWidget#AlumnosPage, #AlumnosPage QWidget { background-color: #f1f5f9; }
+
+    QFrame#AlumnosFilters, #AlumnosFilters QFrame { background: white; border-radius: 12px; border: 1px solid #e2e8f0; }
+    #AlumnosFilters QLineEdit, #AlumnosFilters QComboBox {
+        background: #f8fafc;
+        border: 1px solid #e2e8f0;
+        padding: 8px;
+        border-radius: 6px;
+        color: #1e293b;
+        font-family: 'Segoe UI';
+    }
+    #AlumnosFilters QLineEdit:focus, #AlumnosFilters QComboBox:focus { border: 1px solid #3b82f6; background: white; }
+    #AlumnosFilters QComboBox QAbstractItemView {
+        background-color: white;
+        color: #1e293b;
+        selection-background-color: #3b82f6;
+        selection-color: white;
+    }
+    QLabel#CountLabel { color: #64748b; font-size: 12px; border: none; margin-top: 5px; background: transparent; }
+
+    QStackedWidget#AlumnosResults, #AlumnosResults QWidget { background: transparent; }
+    QTableWidget#AlumnosTable { background: white; border-radius: 10px; border: none; font-family: 'Segoe UI'; }
+    #AlumnosTable QHeaderView::section {
+        background-color: #f8fafc;
+        color: #0f172a;
+        padding: 12px;
+        font-weight: bold;
+        border-bottom: 2px solid #e2e8f0;
+        border-top: none; border-left: none; border-right: none;
+    }
+    QTableWidget#AlumnosTable::item { padding: 8px; border-bottom: 1px solid #f1f5f9; color: #334155; }
+    QTableWidget#AlumnosTable::item:selected { background-color: #eff6ff; color: #1e40af; }
+    QLabel#EmptyIcon { font-size: 40px; color: #cbd5e1; border: none; background: transparent; }
+
+    #AlumnosPage QLabel#PageSubtitle { font-size: 13px; font-family: 'Segoe UI'; }
+"""
+
+# --- TALLERES ---
+TALLERES = """
+    QWidget#TalleresPage, #TalleresPage QWidget { background-color: #f8fafc; font-family: 'Segoe UI'; font-size: 14px; }
+    #TalleresPage QFrame#Panel { background: white; border-radius: 12px; border: 1px solid #e2e8f0; }
+    #TalleresPage QFrame#Panel[dark="true"] { background: #334155; border: none; }
+    #TalleresPage QLineEdit { background: #f1f5f9; border: 1px solid #cbd5e1; padding: 10px; border-radius: 8px; }
+    #TalleresPage QLineEdit:focus { border: 2px solid #3b82f6; background: white; }
+    #TalleresPage QListWidget { border: none; background: transparent; }
+    #TalleresPage QListWidget::item { padding: 12px; border-bottom: 1px solid #f1f5f9; color: #334155; margin-bottom: 4px; border-radius: 6px;}
+    #TalleresPage QListWidget::item:selected { background: #eff6ff; color: #1e40af; border-left: 4px solid #3b82f6; }
+    #TalleresPage QListWidget::item:hover { background: #f8fafc; }
+    #TalleresPage QRadioButton { spacing: 8px; color: #475569; }
+
+    QLabel#TalleresHint { font-size: 18px; color: #94a3b8; font-weight: bold; }
+    QLabel#StudentName { font-size: 18px; font-weight: bold; color: #1e293b; }
+    QLabel#StudentMeta { color: #64748b; }
+
+    QProgressBar#CreditBar { border: none; background: #e2e8f0; border-radius: 10px; text-align: center; }
+    QProgressBar#CreditBar::chunk { border-radius: 10px; }
+    QProgressBar#CreditBar[level="low"], QProgressBar#CreditBar[level="mid"] { color: black; font-weight: bold; }
+    QProgressBar#CreditBar[level="low"]::chunk { background-color: #ef4444; }
+    QProgressBar#CreditBar[level="mid"]::chunk { background-color: #f59e0b; }
+
+    QComboBox#CategoryCombo { background: white; padding: 5px; }
+    QPushButton#UploadButton { background-color: #f1f5f9; color: #334155; border: 2px dashed #cbd5e1; border-radius: 10px; padding: 15px; font-weight: bold; }
+    QPushButton#UploadButton:hover { background-color: #e2e8f0; border: 2px dashed #3b82f6; }
+    QListWidget#HistoryList, #HistoryList QWidget { background: #f8fafc; border: 1px solid #e2e8f0; font-size: 12px; }
+
+    QScrollArea#TalleresViewer, #TalleresViewer QWidget { border: none; background: #475569; }
+    QPushButton#SaveCreditButton { background: #10b981; color: white; padding: 15px; border-radius: 8px; font-weight: bold; font-size: 16px; border: none; }
+    QPushButton#SaveCreditButton:hover { background: #059669; }
+
+    #TalleresPage QLabel#PageTitle { font-weight: 800; color: #1e293b; border: none; }
+    QPushButton#BulkButton {
+        background: white; color: #065f46; border: 1px solid #6ee7b7;
+        padding: 10px 16px; border-radius: 8px; font-weight: bold;
+    }
+    QPushButton#BulkButton:hover { background: #ecfdf5; }
+
+    /* Carga masiva de evidencias */
+    QDialog#BulkEvidenceDialog { background-color: white; }
+    #BulkEvidenceDialog QLabel { color: #1e293b; font-family: 'Segoe UI'; }
+    #BulkEvidenceDialog QLineEdit { background: #f8fafc; border: 1px solid #cbd5e1; border-radius: 6px; padding: 8px; }
+    #BulkEvidenceDialog QPushButton { padding: 8px 16px; border-radius: 6px; font-weight: bold; }
+    #BulkEvidenceDialog QPushButton#DialogConfirm:disabled { background: #94a3b8; }
+    QTableWidget#BulkTable { border: 1px solid #e2e8f0; gridline-color: #f1f5f9; font-size: 13px; }
+    QLabel#BulkStatus { color: #64748b; }
+
+    /* Revisión de archivos (Expediente) */
+    QDialog#IntegrityDialog { background-color: white; }
+    #IntegrityDialog QLabel { color: #1e293b; font-family: 'Segoe UI'; }
+    #IntegrityDialog QPushButton { padding: 8px 16px; border-radius: 6px; font-weight: bold; }
+    #IntegrityDialog QPushButton#DialogConfirm:disabled { background: #94a3b8; }
+    QLabel#IntegritySummary { font-weight: bold; color: #334155; }
+    QTableWidget#IntegrityTable { border: 1px solid #e2e8f0; gridline-color: #f1f5f9; font-size: 13px; }
+"""
+
+# --- CONSTANCIAS ---
+CONSTANCIAS = """
+    QWidget#ConstanciaPage, #ConstanciaPage QWidget { background-color: #f1f5f9; font-family: 'Segoe UI'; }
+
+    /* Paneles */
+    #ConstanciaPage QFrame#Panel { background: white; border-radius: 12px; border: 1px solid #e2e8f0; }
+
+    /* Lista */
+    #ConstanciaPage QListWidget { border: none; background: transparent; }
+    #ConstanciaPage QListWidget::item {
+        background: white;
+        margin-bottom: 8px;
+        padding: 15px;
+        border-radius: 8px;
+        border: 1px solid #e2e8f0;
+        color: #334155;
+    }
+    #ConstanciaPage QListWidget::item:selected {
+        background: #eff6ff;
+        border: 1px solid #3b82f6;
+        color: #1e40af;
+    }
+    #ConstanciaPage QListWidget::item:hover { border: 1px solid #94a3b8; }
+
+    /* Inputs */
+    #ConstanciaPage QLineEdit { background: white; border: 1px solid #cbd5e1; padding: 10px; border-radius: 8px; font-size: 14px; }
+
+    QLabel#ConstanciaIcon { font-size: 32px; }
+    QLabel#ListEmpty { color: #94a3b8; margin-top: 20px; font-weight: bold; }
+    QLabel#SelectHint { font-size: 20px; color: #cbd5e1; font-weight: bold; }
+    QLabel#BigIcon { font-size: 80px; }
+    QLabel#CertName { font-size: 24px; font-weight: 800; color: #1e293b; }
+    QLabel#CertCareer { font-size: 16px; color: #64748b; font-weight: bold; }
+    QLabel#CertStatus { color: #16a34a; font-weight: bold; background: #dcfce7; padding: 5px 10px; border-radius: 15px; }
+    QPushButton#GenerateButton {
+        background-color: #16a34a; color: white;
+        padding: 20px; border-radius: 12px;
+        font-size: 16px; font-weight: 900; border: none;
+    }
+    QPushButton#GenerateButton:hover { background-color: #15803d; }
+    QPushButton#BatchButton {
+        background: white; color: #16a34a; border: 1px solid #16a34a;
+        padding: 10px; border-radius: 8px; font-weight: bold;
+    }
+    QPushButton#BatchButton:hover { background: #dcfce7; }
+    QPushButton#ResumeButton {
+        background: #fef3c7; color: #92400e; border: 1px solid #f59e0b;
+        padding: 10px; border-radius: 8px; font-weight: bold;
+    }
+    QPushButton#ResumeButton:hover { background: #fde68a; }
+    QPushButton#PrintButton {
+        background: white; color: #1e3a8a; border: 1px solid #93c5fd;
+        padding: 10px; border-radius: 8px; font-weight: bold;
+    }
+    QPushButton#PrintButton:hover { background: #eff6ff; }
+    QPushButton#PrintButton:disabled { color: #94a3b8; border-color: #cbd5e1; }
+    #ConstanciaPage QListWidget#JobsList::item { padding: 6px 10px; margin-bottom: 4px; }
+    QPushButton#JobCancel {
+        background: white; color: #64748b; border: 1px solid #cbd5e1;
+        padding: 6px 12px; border-radius: 6px;
+    }
+    QPushButton#JobCancel:hover { color: #dc2626; border-color: #dc2626; }
+
+    #ConstanciaPage QLabel#PageTitle { font-size: 26px; font-weight: 800; color: #1e293b; border: none; }
+
+    /* Diálogo de verificación de datos */
+    QDialog#VerificarDialog { background-color: white; }
+    #VerificarDialog QLabel { color: #1e293b; font-size: 14px; font-family: 'Segoe UI'; }
+    #VerificarDialog QLineEdit {
+        background-color: #f8fafc; border: 1px solid #cbd5e1;
+        border-radius: 6px; padding: 10px; font-size: 14px;
+        color: #0f172a; font-weight: bold;
+    }
+    #VerificarDialog QLineEdit:focus { border: 2px solid #3b82f6; background-color: white; }
+    #VerificarDialog QPushButton { padding: 10px 20px; border-radius: 6px; font-weight: bold; font-size: 14px; }
+    QLabel#DialogTitle { font-size: 20px; font-weight: 800; color: #0f172a; }
+    QLabel#DialogSubtitle { color: #64748b; margin-bottom: 15px; }
+    QPushButton#DialogCancel { background: white; border: 1px solid #cbd5e1; color: #64748b; }
+    QPushButton#DialogConfirm { background: #2563eb; color: white; border: none; }
+    #VerificarDialog QFrame#Separator { margin: 10px 0; }
+"""
+
+# --- EXPEDIENTE ---
+EXPEDIENTE = """
+    QWidget#ExpedientePage, #ExpedientePage QWidget { background-color: #f1f5f9; }
+
+    QFrame#ExpedienteFilters, #ExpedienteFilters QFrame { background: white; border-radius: 12px; border: 1px solid #e2e8f0; }
+    #ExpedienteFilters QLabel { color: #64748b; font-weight: bold; border: none; }
+    QLineEdit#ExpedienteSearch { font-size: 14px; padding: 6px; }
+    QLabel#IndexStatus { color: #64748b; font-size: 12px; border: none; background: transparent; }
+    QPushButton#RefreshButton { background-color: #3b82f6; color: white; }
+
+    QStackedWidget#ExpedienteResults, #ExpedienteResults QWidget { background: transparent; }
+    QTableWidget#ExpedienteTable { background: white; border-radius: 10px; border: none; }
+    #ExpedienteTable QHeaderView::section { background-color: #f8fafc; color: #0f172a; padding: 12px; font-weight: bold; border-bottom: 2px solid #e2e8f0; border: none;}
+    QTableWidget#ExpedienteTable::item { padding: 10px; border-bottom: 1px solid #f1f5f9; }
+    QTableWidget#ExpedienteTable::item:selected { background-color: #eff6ff; color: #1e40af; }
+    QPushButton#RowButton { background: #f1f5f9; border: 1px solid #cbd5e1; padding: 5px; }
+
+    /* Diálogo de expediente del alumno */
+    QDialog#StudentDetailDialog { background-color: #ffffff; }
+    QWidget#DetailLeft, #DetailLeft QWidget { background-color: white; border-right: 1px solid #e2e8f0; }
+    QLabel#DetailName { font-weight: bold; font-size: 14px; border: none; }
+    QLabel#DetailMeta { color: #64748b; font-size: 12px; border: none; }
+    QLabel#Avatar { border: none; background: transparent; }
+    QLabel#Avatar[empty="true"] { background-color: #f1f5f9; border-radius: 45px; border: 2px solid #e2e8f0; font-size: 40px; color: #cbd5e1; }
+    QPushButton#PhotoButton { background: #f1f5f9; color: #334155; border: 1px solid #cbd5e1; }
+    QScrollArea#DocsScroll, #DocsScroll QWidget { border: none; background: transparent; }
+    QWidget#DocsContent, #DocsContent QWidget { background: white; }
+    QPushButton#DocButton { background-color: #f8fafc; border: 1px solid #e2e8f0; text-align: left; padding: 10px; color: #1e293b; }
+    QPushButton#DocButton:checked { background-color: #eff6ff; border: 1px solid #3b82f6; }
+    QPushButton#DocButton:hover { background-color: #e2e8f0; }
+    QLabel#DocTitle { font-weight: bold; border:none; background:transparent; }
+    QLabel#DocStatus { font-size: 11px; border:none; background:transparent; }
+    QLabel#DocStatus[state="ok"] { color: #10b981; }
+    QLabel#DocStatus[state="pending"] { color: #f59e0b; }
+    QLabel#DocThumb { background: white; border: 1px solid #e2e8f0; border-radius: 4px; font-size: 20px; color: #cbd5e1; }
+    QPushButton#CloseButton { background: #cbd5e1; color: #334155; }
+    QWidget#DetailRight, #DetailRight QWidget { background-color: #475569; }
+    QPdfView#DetailViewer, #DetailViewer QWidget { border: none; }
+    QLabel#ViewerHint { color: white; font-size: 16px; font-weight: bold; }
+"""
+
+# --- COMUNES ---
+# Van al final: sustituyen hojas que antes eran propias de cada widget
+COMMON = """
+    QLabel#PageTitle { font-size: 24px; font-weight: bold; color: #0f172a; border: none; font-family: 'Segoe UI'; }
+    QLabel#PageSubtitle { color: #64748b; border: none; }
+    QLabel#HeaderIcon { background-color: white; border-radius: 8px; font-size: 20px; border: 1px solid #e2e8f0; }
+    QFrame#Divider { background-color: #e2e8f0; max-height: 1px; border: none; margin: 10px 0; }
+    QFrame#Separator { color: #e2e8f0; }
+    QLabel#EmptyMessage { color: #94a3b8; font-weight: bold; border: none; font-family: 'Segoe UI'; background: transparent; }
+
+    #RegistroPage QLabel#PageTitle { font-size: 26px; }
+    #RegistroPage QLabel#PageSubtitle { font-size: 14px; font-family: 'Segoe UI'; margin-bottom: 10px; }
+"""
+
+# Hoja completa, armada una sola vez
+APP_STYLESHEET = "\n".join([
+    BASE, MAIN_WINDOW, DASHBOARD, REGISTRO, ALUMNOS,
+    TALLERES, CONSTANCIAS, EXPEDIENTE, COMMON
+])
+
+
+def apply_styles(app):
+    """Aplica la hoja global a la aplicación (una sola vez, al arrancar)"""
+    app.setStyleSheet(APP_STYLESHEET)
+
+
+def styled(widget, name, **props):
+    """Asigna el objectName (y propiedades dinámicas) que usa la hoja global"""
+    widget.setObjectName(name)
+    for key, value in props.items():
+        widget.setProperty(key, value)
+    return widget
+
+
+def set_style_prop(widget, key, value):
+    """Cambia una propiedad dinámica y vuelve a pulir solo ese widget"""
+    widget.setProperty(key, value)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
@@ -0,0 +1,85 @@
+# template_cache.py
+# Caché de plantillas DOCX ya parseadas (docxtpl).
+# DocxTemplate(ruta) vuelve a abrir el zip y a parsear todas sus partes en cada
+# constancia. Aquí la plantilla se parsea una vez por proceso y cada constancia
+# recibe un clon (deepcopy del árbol XML, sin tocar el disco). También se
+# guardan el XML ya limpiado por docxtpl y las plantillas jinja compiladas, que
+# son iguales para todos los alumnos.
+# Si cambia el mtime o el tamaño del .docx la entrada se descarta sola.
+# Importa docxtpl: cargar este módulo solo al generar (no al arrancar la app).
+import copy
+import os
+import threading
+
+from docx import Document
+from docxtpl import DocxTemplate
+from jinja2 import Environment
+
+_cache = {}  # ruta -> (firma, _Parsed)
+_lock = threading.Lock()
+
+
+class _CompiledEnvironment(Environment):
+    """Entorno jinja que compila cada fuente una sola vez"""
+
+    def __init__(self):
+        super().__init__()
+        self._compiled = {}
+
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is not None or template_class is not None:
+            return super().from_string(source, globals, template_class)
+        tpl = self._compiled.get(source)
+        if tpl is None:
+            tpl = self._compiled[source] = super().from_string(source)
+        return tpl
+
+
+class _Parsed:
+    """Lo que se comparte entre clones: el documento original, XML limpio y jinja"""
+
+    def __init__(self, path):
+        self.path = path
+        self.docx = Document(path)
+        self.patched = {}
+        self.env = _CompiledEnvironment()
+
+
+class CachedTemplate(DocxTemplate):
+    """DocxTemplate que arranca de un clon del documento ya parseado"""
+
+    def __init__(self, parsed):
+        super().__init__(parsed.path)
+        self._parsed = parsed
+        self.docx = copy.deepcopy(parsed.docx)
+
+    def patch_xml(self, src_xml):
+        out = self._parsed.patched.get(src_xml)
+        if out is None:
+            out = self._parsed.patched[src_xml] = super().patch_xml(src_xml)
+        return out
+
+    def render(self, context, jinja_env=None, autoescape=False):
+        if jinja_env is None and not autoescape: jinja_env = self._parsed.env
+        super().render(context, jinja_env, autoescape)
+
+
+def _signature(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def load(path):
+    """Plantilla lista para render(ctx) / save(); parsea el archivo solo si cambió"""
+    sig = _signature(path)
+    with _lock:
+        entry = _cache.get(path)
+        if entry is None or entry[0] != sig:
+            entry = _cache[path] = (sig, _Parsed(path))
+    return CachedTemplate(entry[1])
+
+
+def clear():
+    """Olvida todas las plantillas (p. ej. para medir sin caché)"""
+    with _lock:
+        _cache.clear()
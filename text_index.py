@@ -0,0 +1,218 @@
+# text_index.py
+# Índice de texto completo de las evidencias y constancias (todo pdf_path del historial;
+# las constancias generadas quedan en el historial como CONSTANCIA FINAL OFICIAL).
+# El texto se extrae con PyMuPDF en un pool de procesos (extract) y se guarda en un índice
+# invertido en SQLite (INDEX_PATH): palabra -> documentos. Cada documento se identifica por
+# el SHA-256 de su contenido: la misma evidencia subida dos veces se lee una sola vez, y
+# update() solo procesa lo nuevo o lo que cambió de tamaño o fecha.
+#   search()  documentos con todas las palabras (sin acentos; la última vale como prefijo)
+#   hits()    liga cada documento encontrado con el alumno y el taller
+#   python text_index.py [--actualizar] [palabras a buscar...]
+# Este módulo no importa Qt.
+import argparse
+import os
+import re
+import sqlite3
+import sys
+from concurrent.futures import CancelledError, as_completed
+
+import evidence_store
+from database import fold_words
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(ROOT, "indice_texto.sqlite")
+
+# Páginas que se leen por documento y texto que se guarda para mostrar fragmentos
+MAX_PAGES = 30
+MAX_TEXT = 20000
+
+# Cada cuántos documentos se confirma la transacción (lo ya leído no se pierde si se cierra)
+COMMIT_EVERY = 50
+
+# Palabras que no sirven para buscar (salen en todas las constancias)
+STOPWORDS = {"DE", "LA", "EL", "EN", "LOS", "LAS", "DEL", "POR", "CON", "QUE", "SE", "AL",
+             "UN", "UNA", "PARA", "SU", "LO", "ES", "Y", "A", "O"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (sha TEXT PRIMARY KEY, pages INTEGER, text TEXT);
+CREATE TABLE IF NOT EXISTS postings (term TEXT, sha TEXT, PRIMARY KEY (term, sha)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, sha TEXT);
+CREATE INDEX IF NOT EXISTS files_sha ON files (sha);
+"""
+
+
+def connect(path=INDEX_PATH):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")  # se puede buscar mientras se indexa
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def normalize(text):
+    """Texto sin acentos, en mayúsculas y con un solo espacio entre palabras"""
+    return " ".join(fold_words(text))
+
+
+def terms(text):
+    return {w for w in fold_words(text) if len(w) > 1 and w not in STOPWORDS}
+
+
+def targets(students):
+    """{ruta: sha256 conocido o None} de todas las evidencias y constancias del historial"""
+    out = {}
+    for s in students:
+        for w in s.get('workshops', []):
+            path = w.get('pdf_path')
+            if path and path.lower().endswith(".pdf"):
+                out[path] = out.get(path) or evidence_store.entry_digest(w)
+    return out
+
+
+def extract(path, sha=None):
+    """Texto de un PDF (y su SHA-256 si no se conoce). Corre en un proceso hijo."""
+    result = {"ruta": path, "sha256": sha, "pages": 0, "text": "", "error": ""}
+    try:
+        if not sha: result["sha256"] = evidence_store.file_sha256(path)
+        import fitz
+        with fitz.open(path) as doc:
+            result["pages"] = doc.page_count
+            result["text"] = " ".join(doc[i].get_text() for i in range(min(MAX_PAGES, doc.page_count)))
+    except Exception as e:
+        result["error"] = str(e) or type(e).__name__
+    return result
+
+
+def _indexed(conn, sha):
+    return conn.execute("SELECT 1 FROM docs WHERE sha = ?", (sha,)).fetchone() is not None
+
+
+def _add_doc(conn, r):
+    if _indexed(conn, r["sha256"]): return
+    conn.execute("INSERT INTO docs VALUES (?, ?, ?)", (r["sha256"], r["pages"], normalize(r["text"])[:MAX_TEXT]))
+    conn.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?)", ((t, r["sha256"]) for t in terms(r["text"])))
+
+
+def update(conn, paths, submit, progress=None, cancelled=None):
+    """Indexa lo nuevo de paths ({ruta: sha256 o None}). submit(fn, *args) -> Future de un
+    pool de procesos. progress(hechos, total); cancelled() -> True para parar."""
+    known = {p: (size, mtime, sha) for p, size, mtime, sha in conn.execute("SELECT path, size, mtime, sha FROM files")}
+    todo, present = [], set()
+    for path, sha in paths.items():
+        try: st = os.stat(path)
+        except (OSError, ValueError): continue
+        present.add(path)
+        old = known.get(path)
+        if old and old[0] == st.st_size and old[1] == st.st_mtime_ns: sha = old[2]
+        if sha and _indexed(conn, sha):
+            if not old or old[2] != sha or old[:2] != (st.st_size, st.st_mtime_ns):
+                conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (path, st.st_size, st.st_mtime_ns, sha))
+            continue
+        todo.append((path, sha, st))
+
+    report = {"nuevos": 0, "errores": 0, "pendientes": len(todo), "documentos": 0, "interrumpido": False}
+    futures = {submit(extract, path, sha): st for path, sha, st in todo}
+    for i, future in enumerate(as_completed(futures)):
+        try: r = future.result()
+        except (CancelledError, RuntimeError):
+            report["interrumpido"] = True; break
+        st = futures[future]
+        if r["error"] or not r["sha256"]:
+            report["errores"] += 1
+        else:
+            _add_doc(conn, r)
+            conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (r["ruta"], st.st_size, st.st_mtime_ns, r["sha256"]))
+            report["nuevos"] += 1
+        if (i + 1) % COMMIT_EVERY == 0: conn.commit()
+        if progress: progress(i + 1, len(todo))
+        if cancelled and cancelled():
+            for f in futures: f.cancel()
+            report["interrumpido"] = True; break
+
+    if not report["interrumpido"]:
+        # Lo que ya no está en el historial (o ya no existe) sale del índice
+        gone = [(p,) for p in known if p not in present]
+        conn.executemany("DELETE FROM files WHERE path = ?", gone)
+        conn.execute("DELETE FROM postings WHERE sha NOT IN (SELECT sha FROM files)")
+        conn.execute("DELETE FROM docs WHERE sha NOT IN (SELECT sha FROM files)")
+    conn.commit()
+    report["documentos"] = conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+    return report
+
+
+def search(conn, query, limit=200):
+    """[(sha, fragmento)] de los documentos con todas las palabras de query"""
+    words = [w for w in fold_words(query) if len(w) > 1 and w not in STOPWORDS]
+    if not words: return []
+    parts, args = [], []
+    for w in words[:-1]:
+        parts.append("SELECT sha FROM postings WHERE term = ?"); args.append(w)
+    # La última palabra puede estar a medio escribir: "AJED" encuentra AJEDREZ
+    parts.append("SELECT sha FROM postings WHERE term >= ? AND term < ?"); args += [words[-1], words[-1] + "\uffff"]
+    sql = f"SELECT sha, text FROM docs WHERE sha IN ({' INTERSECT '.join(parts)}) LIMIT ?"
+    return [(sha, snippet(text, words)) for sha, text in conn.execute(sql, args + [limit])]
+
+
+def snippet(text, words, width=70):
+    """Fragmento del texto alrededor de la primera palabra buscada"""
+    pos = -1
+    for w in words:
+        m = re.search(rf"\b{re.escape(w)}", text)
+        if m: pos = m.start(); break
+    if pos < 0: return text[:2 * width]
+    start = max(0, pos - width)
+    return ("..." if start else "") + text[start:pos + width] + ("..." if pos + width < len(text) else "")
+
+
+def hits(conn, students, found):
+    """Una fila por (alumno, taller) de cada documento encontrado, lo más reciente primero"""
+    if not found: return []
+    fragments = dict(found)
+    paths = {}
+    marks = ",".join("?" * len(fragments))
+    for path, sha in conn.execute(f"SELECT path, sha FROM files WHERE sha IN ({marks})", list(fragments)):
+        paths[path] = sha
+    rows = []
+    for s in students:
+        for w in s.get('workshops', []):
+            sha = paths.get(w.get('pdf_path'))
+            if sha is None: continue
+            rows.append({"matricula": str(s.get('matricula', '')),
+                         "alumno": f"{s.get('nombres', '')} {s.get('apellidoPaterno', '')} {s.get('apellidoMaterno', '')}".strip(),
+                         "taller": w.get('name', ''), "fecha": w.get('date', ''), "ruta": w['pdf_path'],
+                         "fragmento": fragments[sha], "_alumno": s, "_entrada": w})
+    rows.sort(key=lambda r: r["fecha"], reverse=True)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Índice de texto de evidencias y constancias")
+    parser.add_argument("palabras", nargs="*", help="buscar estas palabras")
+    parser.add_argument("--actualizar", action="store_true", help="indexar lo nuevo antes de buscar")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # DB_PATH es relativo a la carpeta de la app
+    from database import StudentEngine
+    engine = StudentEngine()
+    conn = connect()
+    if args.actualizar or not args.palabras:
+        import multiprocessing
+        import time
+        from concurrent.futures import ProcessPoolExecutor
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count(),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            report = update(conn, targets(engine.students), pool.submit,
+                            lambda done, total: print(f"\r[{done}/{total}]", end="", flush=True))
+        print(f"\nNuevos: {report['nuevos']} | errores: {report['errores']} | documentos en el índice:"
+              f" {report['documentos']} | {time.perf_counter() - t0:.1f} s")
+    if args.palabras:
+        rows = hits(conn, engine.students, search(conn, " ".join(args.palabras)))
+        print(f"Resultados: {len(rows)}")
+        for r in rows[:50]:
+            print(f"  {r['matricula']}  {r['alumno']}  {r['taller']}  {r['fecha']}\n      {r['fragmento']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
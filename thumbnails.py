@@ -0,0 +1,60 @@
+# thumbnails.py
+# Miniaturas de la primera página de los PDFs (evidencias y constancias) y
+# render de páginas para el visor progresivo (components.ProgressivePdfView).
+# Estas funciones corren en los procesos hijos de workers.process_pool(),
+# por eso este módulo no importa Qt: solo PyMuPDF (fitz) y la biblioteca estándar.
+# Las miniaturas se guardan en Miniaturas/ con el hash del contenido como nombre,
+# así dos copias del mismo escaneo comparten miniatura y renombrar no la invalida.
+import os
+
+import file_status
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+THUMBS_DIR = os.path.join(ROOT, "Miniaturas")
+
+# Ancho en px del PNG (se muestra a la mitad para verse nítido en HiDPI)
+THUMB_WIDTH = 96
+
+
+def thumb_path(digest, width=THUMB_WIDTH):
+    """Ruta en disco de la miniatura (subcarpeta por los 2 primeros caracteres del hash)"""
+    return os.path.join(THUMBS_DIR, digest[:2], f"{digest}_{width}.png")
+
+
+def render_first_page(path, width=THUMB_WIDTH):
+    """Devuelve la ruta del PNG de la primera página; lo genera si no existe. None si no se puede"""
+    try:
+        import fitz
+    except ImportError:
+        return None
+    try:
+        out = thumb_path(file_status.content_hash(path), width)
+    except OSError:
+        return None
+    if os.path.exists(out): return out
+
+    with fitz.open(path) as doc:
+        if doc.page_count == 0: return None
+        page = doc[0]
+        zoom = width / page.rect.width
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    # Se escribe a un temporal y se renombra: otro proceso nunca ve un PNG a medias
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    tmp = f"{out[:-4]}.{os.getpid()}.tmp.png"
+    pix.save(tmp)
+    os.replace(tmp, out)
+    return out
+
+
+def render_page(path, page, width):
+    """Página a 'width' px de ancho: (total_páginas, ancho, alto, stride, bytes RGB).
+    Si la página no existe devuelve (total_páginas, 0, 0, 0, b'').
+    El PDF se abre y se cierra en cada página: el proceso no lo deja bloqueado (Windows)
+    cuando el visor cambia de archivo o se guarda la evidencia."""
+    import fitz
+    with fitz.open(path) as doc:
+        if page >= doc.page_count: return doc.page_count, 0, 0, 0, b''
+        p = doc[page]
+        zoom = width / p.rect.width
+        pix = p.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        return doc.page_count, pix.width, pix.height, pix.stride, pix.samples
@@ -0,0 +1,354 @@
+# workers.py
+# Tareas que corren fuera del hilo de la GUI. Se comunican solo por señales.
+import os
+
+from PySide6.QtCore import QCoreApplication, QObject, QRunnable, QThread, QThreadPool, Signal
+
+import batch_constancias
+import constancia_merge
+import evidence_ingest
+import evidence_match
+import file_integrity
+import file_status
+import text_index
+import thumbnails
+
+# Pool para revisar archivos (stat / abrir PDF); pocos hilos porque el cuello
+# de botella suele ser la unidad de red, no el CPU
+FILE_POOL = QThreadPool()
+FILE_POOL.setMaxThreadCount(4)
+
+
+class DatabaseLoader(QThread):
+    """Carga database.json en segundo plano e informa el avance"""
+    progress = Signal(int, int, int)  # bytes leídos, bytes totales, registros
+    loaded = Signal(list)
+
+    def __init__(self, engine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+
+    def run(self):
+        students = self.engine.load(self.progress.emit)
+        file_status.load_scan()  # estado de la última revisión de integridad
+        self.loaded.emit(students)
+
+
+class IntegrityScanner(QThread):
+    """Revisión de integridad (file_integrity.scan) en segundo plano.
+    Recibe solo las rutas: los registros de alumnos no se tocan fuera de la GUI."""
+    progress = Signal(str, int, int)  # etapa, hechos, total
+    done = Signal(object)             # índice guardado (o {"error": ...})
+
+    def __init__(self, paths, roots=(), parent=None):
+        super().__init__(parent)
+        self.paths = paths
+        self.roots = list(roots)
+
+    def run(self):
+        try: index = file_integrity.scan(self.paths, self.roots, self.progress.emit,
+                                         cancelled=self.isInterruptionRequested)
+        except Exception as e: index = {"error": str(e) or type(e).__name__}
+        if index is None: index = {"error": "Revisión cancelada"}
+        self.done.emit(index)
+
+
+class TextIndexer(QThread):
+    """Actualiza el índice de texto (text_index.update) en segundo plano; el texto de
+    cada PDF se extrae en el pool de procesos "indice_texto"."""
+    progress = Signal(int, int)  # documentos leídos, por leer
+    done = Signal(dict)          # resumen de text_index.update (o {"error": ...})
+
+    def __init__(self, paths, parent=None):
+        super().__init__(parent)
+        self.paths = paths
+        self.pool = process_pool("indice_texto")  # se crea aquí, en el hilo de la GUI
+        app = QCoreApplication.instance()
+        if app is not None: app.aboutToQuit.connect(self.stop)
+
+    def stop(self):
+        self.requestInterruption()
+        self.wait()
+
+    def run(self):
+        try:
+            conn = text_index.connect()
+            try: report = text_index.update(conn, self.paths, self.pool.submit, self.progress.emit,
+                                            self.isInterruptionRequested)
+            finally: conn.close()
+        except Exception as e:
+            report = {"error": str(e) or type(e).__name__}
+        self.done.emit(report)
+
+
+class FileStatusSignals(QObject):
+    done = Signal(int, str, dict)  # índice de la fila, ruta, info de file_status
+
+
+class FileStatusTask(QRunnable):
+    """Revisa un archivo con file_status.check y avisa por señal"""
+    def __init__(self, row, path):
+        super().__init__()
+        self.row = row
+        self.path = path
+        self.signals = FileStatusSignals()
+
+    def run(self):
+        self.signals.done.emit(self.row, self.path, file_status.check(self.path))
+
+
+_process_pools = {}
+
+
+def process_pool(name="general", workers=None):
+    """Pool de procesos con nombre (PyMuPDF); se crea al primer uso y se apaga al salir.
+    El visor usa su propio pool para no quedar detrás de miles de miniaturas."""
+    pool = _process_pools.get(name)
+    if pool is None:
+        # Se importan aquí: multiprocessing no hace falta para abrir la ventana
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # spawn: no hacer fork de un proceso con Qt y varios hilos
+        pool = ProcessPoolExecutor(max_workers=workers or min(4, os.cpu_count() or 1),
+                                   mp_context=multiprocessing.get_context("spawn"))
+        if not _process_pools:
+            app = QCoreApplication.instance()
+            if app is not None: app.aboutToQuit.connect(shutdown_process_pools)
+        _process_pools[name] = pool
+    return pool
+
+
+def shutdown_process_pools():
+    for pool in _process_pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _process_pools.clear()
+
+
+class ThumbnailService(QObject):
+    """Miniaturas de primera página en un pool de procesos (PyMuPDF, ver thumbnails.py).
+    request() no bloquea; cuando el PNG está listo se emite ready(ruta_pdf, ruta_png).
+    Los PDFs que no existen o no se pudieron leer no se vuelven a enviar mientras no
+    cambien (según file_status.cached: no se va al disco en cada filtro)."""
+    ready = Signal(str, str)
+    _result = Signal(str, str, object)  # interno: del hilo del executor al hilo de la GUI
+
+    def __init__(self):
+        super().__init__()
+        self._done = {}      # ruta del PDF -> ruta del PNG
+        self._pending = set()
+        self._failed = {}    # ruta del PDF -> (mtime, tamaño) al fallar, o None si no existía
+        self._result.connect(self._on_result)
+
+    def cached(self, path):
+        """PNG ya generado en esta sesión (o None)"""
+        return self._done.get(path)
+
+    def request(self, path):
+        if not path or path in self._pending or path in self._done: return
+        info = file_status.cached(path)
+        if info is not None and not info["exists"] and file_status.is_fresh(info): return
+        if path in self._failed:
+            # Se reintenta solo si el archivo cambió desde que falló
+            now = (info["mtime"], info["size"]) if info and info["exists"] else None
+            if info is None or now == self._failed[path]: return
+            del self._failed[path]
+        try:
+            future = process_pool().submit(thumbnails.render_first_page, path)
+        except RuntimeError:
+            return  # pool apagado (la app está cerrando)
+        self._pending.add(path)
+        future.add_done_callback(lambda f, p=path: self._result.emit(p, *self._png(f, p)))
+
+    @staticmethod
+    def _png(future, path):
+        """(PNG, None) o ('', llave del archivo que falló); corre en el hilo del executor"""
+        try:
+            png = future.result()
+            if png: return png, None
+        except Exception:
+            pass  # PDF dañado / cancelado: se queda sin miniatura
+        try:
+            st = os.stat(path)
+            return "", (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return "", None
+
+    def _on_result(self, path, png, key):
+        self._pending.discard(path)
+        if not png:
+            self._failed[path] = key; return
+        self._done[path] = png
+        self.ready.emit(path, png)
+
+    def prewarm(self, students):
+        """Encola las miniaturas de todos los documentos de esos alumnos (p. ej. una carrera)"""
+        for s in students:
+            for w in s.get('workshops', []):
+                self.request(w.get('pdf_path'))
+
+
+_thumbnail_service = None
+
+
+def thumbnail_service():
+    """Servicio compartido; se crea la primera vez que se pide"""
+    global _thumbnail_service
+    if _thumbnail_service is None:
+        _thumbnail_service = ThumbnailService()
+    return _thumbnail_service
+
+
+# Error que llevan los resultados de constancias canceladas
+CANCELLED = "Cancelada"
+
+
+class ConstanciaBatch(QObject):
+    """Genera constancias en el pool de procesos (ver batch_constancias.py) sin bloquear la GUI.
+    Se pueden agregar trabajos mientras otros corren (add) y cancelar uno o todos.
+      stage(id, etapa)                     'generando' o 'word' (camino DOCX, de uno en uno)
+      progress(hechas, total, resultado)   por cada constancia terminada, con error o cancelada
+      finished(resultados)                 cuando ya no queda nada pendiente
+    Los estados quedan en la cola persistente (job_queue.py); registrar en la base y
+    guardar le toca a quien lo usa."""
+    stage = Signal(str, str)
+    progress = Signal(int, int, dict)
+    finished = Signal(list)
+    _result = Signal(dict, dict)  # interno: (trabajo, resultado) del hilo del executor a la GUI
+
+    def __init__(self, queue, workers=None, parent=None):
+        super().__init__(parent)
+        self.queue = queue
+        self.workers = workers
+        self.jobs = []
+        self.results = []
+        self._futures = {}    # id -> future en curso
+        self._cancelled = set()
+        self._result.connect(self._on_result)
+
+    def add(self, jobs):
+        if not jobs: return
+        self.jobs += jobs
+        self.queue.mark_many([j["id"] for j in jobs], "renderizando")
+        pool = process_pool("constancias", self.workers)
+        for job in jobs: self._submit(job, "nativo", pool)
+
+    def pending(self):
+        return len(self.jobs) - len(self.results)
+
+    def running_ids(self):
+        done = {r["id"] for r in self.results}
+        return {j["id"] for j in self.jobs} - done
+
+    def cancel(self, job_id=None):
+        """Cancela uno (o todos). Lo que ya se está generando termina, pero no se registra"""
+        ids = [job_id] if job_id else list(self._futures)
+        self._cancelled.update(ids)
+        for i in ids:
+            future = self._futures.get(i)
+            if future is not None: future.cancel()
+
+    def _submit(self, job, engine, pool):
+        try:
+            future = pool.submit(batch_constancias.render_job, job, engine)
+        except RuntimeError:
+            self._result.emit(job, self._failed(job, "El pool está cerrado")); return
+        self._futures[job["id"]] = future
+        self.stage.emit(job["id"], "generando" if engine == "nativo" else "word")
+        future.add_done_callback(lambda f, j=job: self._result.emit(j, self._outcome(f, j)))
+
+    @staticmethod
+    def _failed(job, error):
+        return {"id": job["id"], "matricula": job["matricula"], "nombre": job["ctx"]["NOMBRE_ESTUDIANTE"],
+                "carrera": job["ctx"]["CARRERA"], "pdf": job["pdf"], "motor": "", "error": error, "ms": 0.0}
+
+    def _outcome(self, future, job):
+        if future.cancelled(): return self._failed(job, CANCELLED)
+        try: return future.result()
+        except Exception as e: return self._failed(job, str(e) or type(e).__name__)
+
+    def _on_result(self, job, result):
+        self._futures.pop(job["id"], None)
+        if job["id"] in self._cancelled and result["error"] != CANCELLED:
+            # Terminó después de cancelarla: el PDF no se usa
+            if not result["error"] and result["motor"] != batch_constancias.REUSED and os.path.exists(result["pdf"]):
+                try: os.remove(result["pdf"])
+                except OSError: pass
+            result = self._failed(job, CANCELLED)
+        elif result.get("pendiente"):
+            # Word no admite conversiones en paralelo: el camino DOCX va de uno en uno
+            self._submit(job, "docx", process_pool("constancias_docx", 1)); return
+
+        if result["error"] == CANCELLED: self.queue.mark(job["id"], "cancelado")
+        else: self.queue.finish(result)
+        self.results.append(result)
+        done = len(self.results)  # progress puede procesar eventos (QProgressDialog) y llegar otro resultado
+        self.progress.emit(done, len(self.jobs), result)
+        if done == len(self.jobs): self.finished.emit(self.results)
+
+
+class ConstanciaMerge(QObject):
+    """Une constancias en un PDF para imprimir (constancia_merge.py) en un proceso aparte.
+    done(resumen) al terminar; si falla, el resumen trae 'error'."""
+    done = Signal(dict)
+
+    def start(self, items, out_path=None, title=None):
+        try:
+            future = process_pool("constancias_impresion", 1).submit(constancia_merge.merge, items, out_path, title)
+        except RuntimeError:
+            self.done.emit(self._failed("El pool está cerrado")); return
+        future.add_done_callback(lambda f: self.done.emit(self._outcome(f)))
+
+    @staticmethod
+    def _failed(error):
+        return {"ruta": "", "documentos": 0, "paginas": 0, "omitidos": [], "segundos": 0.0, "error": error}
+
+    @classmethod
+    def _outcome(cls, future):
+        try: return future.result()
+        except Exception as e: return cls._failed(str(e) or type(e).__name__)
+
+
+class EvidenceIngest(QObject):
+    """Revisa, optimiza y guarda evidencias (evidence_ingest.py) en un pool de procesos:
+    muchos archivos a la vez usan varios núcleos. done(resultado) por cada archivo."""
+    done = Signal(dict)
+
+    def add(self, paths):
+        pool = process_pool("evidencias")
+        for path in paths:
+            try:
+                future = pool.submit(evidence_ingest.ingest, path)
+            except RuntimeError:
+                # Quien espera el resultado (pending_credit, carga masiva) no debe quedar colgado
+                self.done.emit(evidence_ingest.failed(path, "El pool está cerrado")); continue
+            future.add_done_callback(lambda f, path=path: self.done.emit(self._outcome(f, path)))
+
+    @staticmethod
+    def _outcome(future, path):
+        try: return future.result()
+        except Exception as e: return evidence_ingest.failed(path, str(e) or type(e).__name__)
+
+
+class EvidenceScan(QObject):
+    """Lee nombre de archivo y texto de evidencias (evidence_match.extract) en el pool de
+    procesos para la carga masiva. found(resultado) por cada archivo."""
+    found = Signal(dict)
+
+    def add(self, paths):
+        pool = process_pool("evidencias")
+        for path in paths:
+            try:
+                future = pool.submit(evidence_match.extract, path)
+            except RuntimeError:
+                # La fila no debe quedar en "Leyendo..." para siempre
+                self.found.emit(self._failed(path, "El pool está cerrado")); continue
+            future.add_done_callback(lambda f, path=path: self.found.emit(self._outcome(f, path)))
+
+    @staticmethod
+    def _failed(path, error):
+        return {"ruta": path, "palabras": [], "frase": "", "texto": False, "error": error}
+
+    @classmethod
+    def _outcome(cls, future, path):
+        try: return future.result()
+        except Exception as e: return cls._failed(path, str(e) or type(e).__name__)